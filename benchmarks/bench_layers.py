@@ -0,0 +1,390 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark suite of the layers of the client stack
+
+Every layer is timed separately for every resource type, against the mock
+responses of the unit tests and synthetic responses of the given sizes:
+
+    build   rendering the enumerate and pull payloads (requests/s)
+    parse   parsing the response pages with ElementTree.fromstring
+    merge   Client.enumerate merging the pages, served by a fake transport
+    lookup  utils.find_xml and the property lookups of all the instances
+    decode  utils.find_xml and utils.decode_item of all the instances, the
+            single pass replacing the lookups
+    map     the _parse_* methods mapping the instances to objects
+
+Rates are instances per second unless noted. Peak memory is the one of the
+Python objects measured with tracemalloc on Python 3, it doesn't include the
+trees allocated by libxml2. Results are saved as baselines and compared, the
+exit status being 1 when any layer regressed beyond the threshold:
+
+    python benchmarks/bench_layers.py --save benchmarks/baselines/master.json
+    python benchmarks/bench_layers.py --compare \\
+        benchmarks/baselines/master.json [--threshold 0.15]
+"""
+
+import argparse
+import json
+import platform
+import re
+import sys
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from lxml import etree as ElementTree
+
+from wsmanclient import capture, retry, utils, wsman
+from wsmanclient.dracclient.resources import bios as drac_bios
+from wsmanclient.dracclient.resources import inventory as drac_inventory
+from wsmanclient.dracclient.resources import job as drac_job
+from wsmanclient.dracclient.resources import nic as drac_nic
+from wsmanclient.dracclient.resources import raid as drac_raid
+from wsmanclient.testing import data
+from wsmanclient.testing import synthetic
+from wsmanclient.thinkserverclient.resources import bios as ts_bios
+from wsmanclient.thinkserverclient.resources import inventory as ts_inventory
+from wsmanclient.thinkserverclient.resources import nic as ts_nic
+
+ENDPOINT = {'host': '1.2.3.4', 'username': 'admin', 'password': 's3cr3t'}
+LAYERS = ['build', 'parse', 'merge', 'lookup', 'decode', 'map']
+
+
+class Resource(object):
+    """Resource type benchmarked"""
+
+    def __init__(self, name, mapper=None, wsinst=False):
+        """Creates resource object
+
+        :param name: name of the class in synthetic.CLASSES
+        :param mapper: callable returning the method mapping an instance to
+                       an object
+        :param wsinst: whether the properties are looked up with
+                       utils.get_wsman_wsinst_resource_attr, like the
+                       ThinkServer client does
+        """
+        self.resource_class = synthetic.CLASSES[name]
+        self.name = name
+        self.mapper = mapper
+        self.wsinst = wsinst
+
+    def find_instances(self, doc):
+        if self.wsinst:
+            return list(doc.find('.//s:Body/wsen:EnumerateResponse/'
+                                 'wsman:Items', wsman.NS_MAP))
+
+        return utils.find_xml(doc, self.name, self.resource_class.namespace,
+                              find_all=True)
+
+    def decode(self, instance, attr_names):
+        return utils.decode_item(instance, self.resource_class.namespace,
+                                 attr_names)
+
+    def lookup(self, instance, attr_name):
+        if self.wsinst:
+            return utils.get_wsman_wsinst_resource_attr(
+                instance, self.resource_class.namespace, attr_name)
+
+        return utils.get_wsman_resource_attr(
+            instance, self.resource_class.namespace, attr_name,
+            nullable=True)
+
+
+RESOURCES = [
+    Resource('DCIM_LifecycleJob',
+             lambda: drac_job.JobManagement(None)._parse_drac_job),
+    Resource('DCIM_BIOSEnumeration',
+             lambda: drac_bios.BIOSEnumerableAttribute.parse),
+    Resource('DCIM_BIOSString', lambda: drac_bios.BIOSStringAttribute.parse),
+    Resource('DCIM_BIOSInteger',
+             lambda: drac_bios.BIOSIntegerAttribute.parse),
+    Resource('DCIM_PhysicalDiskView',
+             lambda: drac_raid.RAIDManagement(None)._parse_drac_physical_disk),
+    Resource('DCIM_VirtualDiskView',
+             lambda: drac_raid.RAIDManagement(None)._parse_drac_virtual_disk),
+    Resource('DCIM_ControllerView',
+             lambda: drac_raid.RAIDManagement(
+                 None)._parse_drac_raid_controller),
+    Resource('DCIM_CPUView',
+             lambda: drac_inventory.InventoryManagement(None)._parse_cpus),
+    Resource('DCIM_MemoryView',
+             lambda: drac_inventory.InventoryManagement(None)._parse_memory),
+    Resource('DCIM_PowerSupplyView',
+             lambda: drac_bios.PowerManagement(None)._parse_psus),
+    Resource('DCIM_NICView',
+             lambda: drac_nic.NICManagement(None)._parse_drac_nic_interfaces),
+    Resource('DCIM_NICEnumeration',
+             lambda: drac_nic.NICEnumerableAttribute.parse),
+    Resource('DCIM_NICString', lambda: drac_nic.NICStringAttribute.parse),
+    Resource('DCIM_NICInteger', lambda: drac_nic.NICIntegerAttribute.parse),
+    Resource('CIM_HostComputerSystem', wsinst=True),
+    Resource('CIM_Processor',
+             lambda: ts_inventory.InventoryManagement(None)._parse_cpus,
+             wsinst=True),
+    Resource('CIM_PhysicalMemory',
+             lambda: ts_inventory.InventoryManagement(None)._parse_memory,
+             wsinst=True),
+    Resource('CIM_PowerSupply',
+             lambda: ts_bios.PowerManagement(None)._parse_psus,
+             wsinst=True),
+    Resource('CIM_EthernetPort',
+             lambda: ts_nic.NICManagement(None)._parse_nic_interfaces,
+             wsinst=True),
+]
+
+
+class _PagesTransport(object):
+    """Transport serving the pages of an enumeration in turn"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self._next = 0
+
+    def post(self, client, payload, data, timeout):
+        if isinstance(payload, wsman._EnumeratePayload):
+            self._next = 0
+
+        content = self.pages[self._next]
+        self._next += 1
+        return capture._CapturedResponse(200, 'OK', content)
+
+
+def _time(func, min_time):
+    """Returns the best time of a call in seconds"""
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time:
+            break
+
+        number *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed))
+
+    return min([elapsed] + timeit.repeat(func, repeat=2,
+                                         number=number)) / number
+
+
+def _peak_memory(func):
+    """Returns the peak of the memory allocated by a call in bytes"""
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _layers(resource, items, page_size):
+    """Returns the benchmarked calls of a resource by layer
+
+    :returns: a list of (layer, count, func) tuples, count being the number
+              of instances or requests processed by a call
+    """
+    resource_uri = resource.resource_class.resource_uri
+    pages = data.enumeration_responses(items, page_size)
+    endpoint = 'https://%(host)s:443/wsman' % ENDPOINT
+
+    payloads = [wsman._EnumeratePayload(endpoint, resource_uri,
+                                        max_elems=page_size)]
+    payloads.extend(wsman._PullPayload(endpoint, resource_uri,
+                                       'enum-context-uuid', page_size)
+                    for _ in pages[1:])
+
+    client = wsman.Client(transport=_PagesTransport(pages),
+                          retry_policy=retry.NO_RETRY, **ENDPOINT)
+    doc = client.enumerate(resource_uri, max_elems=page_size)
+    instances = resource.find_instances(doc)
+    attr_names = sorted(set(ElementTree.QName(prop).localname
+                            for instance in instances[:1]
+                            for prop in instance))
+
+    def build():
+        return [payload.build() for payload in payloads]
+
+    def parse():
+        return [ElementTree.fromstring(page) for page in pages]
+
+    def merge():
+        return client.enumerate(resource_uri, max_elems=page_size)
+
+    def lookup():
+        return [[resource.lookup(instance, attr_name)
+                 for attr_name in attr_names]
+                for instance in resource.find_instances(doc)]
+
+    def decode():
+        return [resource.decode(instance, attr_names)
+                for instance in resource.find_instances(doc)]
+
+    layers = [('build', len(payloads), build),
+              ('parse', len(items), parse),
+              ('merge', len(items), merge),
+              ('lookup', len(items), lookup),
+              ('decode', len(items), decode)]
+
+    if resource.mapper is not None:
+        mapper = resource.mapper()
+
+        def map_():
+            return [mapper(instance) for instance in instances]
+
+        layers.append(('map', len(items), map_))
+
+    return layers
+
+
+def run(sizes, page_size, layers, pattern, min_time):
+    """Runs the benchmarks
+
+    :param sizes: list of the data sizes, 'mocks' standing for the mock
+                  responses of the unit tests
+    :param page_size: number of instances per response page
+    :param layers: list of the layers benchmarked
+    :param pattern: regular expression matched against the benchmark names
+    :param min_time: minimum duration of a measurement in seconds
+    :returns: a dictionary of the results by benchmark name
+    """
+    mocks = data.DataSet().load_responses()
+    results = {}
+
+    for size in sizes:
+        for resource in RESOURCES:
+            if size == 'mocks':
+                items = mocks.get_items(resource.resource_class.resource_uri)
+                if not items:
+                    continue
+            else:
+                items = synthetic.generate(resource.name, int(size))
+
+            for (layer, count, func) in _layers(resource, items, page_size):
+                name = '%s/%s/%s' % (resource.name, layer, size)
+                if layer not in layers or not re.search(pattern, name):
+                    continue
+
+                try:
+                    func()
+                except Exception as exc:
+                    results[name] = {'error': '%s: %s' % (
+                        type(exc).__name__, exc)}
+                    continue
+
+                seconds = _time(func, min_time)
+                results[name] = {'count': count,
+                                 'rate': count / seconds,
+                                 'peak_memory': _peak_memory(func)}
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compares results with a baseline
+
+    :returns: a dictionary of the relative changes of rate and peak memory
+              by benchmark name, and the list of the names of the
+              benchmarks regressed beyond the threshold
+    """
+    changes = {}
+    regressions = []
+    for (name, result) in results.items():
+        previous = baseline.get(name)
+        if previous is None or 'error' in result or 'error' in previous:
+            continue
+
+        rate = result['rate'] / previous['rate'] - 1
+        memory = None
+        if result['peak_memory'] and previous['peak_memory']:
+            memory = (float(result['peak_memory']) /
+                      previous['peak_memory'] - 1)
+
+        changes[name] = (rate, memory)
+        if rate < -threshold or (memory is not None and memory > threshold):
+            regressions.append(name)
+
+    return changes, sorted(regressions)
+
+
+def _format_change(change):
+    return '' if change is None else '%+.1f%%' % (change * 100)
+
+
+def report(results, changes, regressions):
+    print('%-44s %8s %12s %10s %8s %8s' % ('benchmark', 'count', 'rate/s',
+                                           'peak KiB', 'rate', 'memory'))
+    for name in sorted(results):
+        result = results[name]
+        if 'error' in result:
+            print('%-44s %s' % (name, result['error']))
+            continue
+
+        rate, memory = changes.get(name, (None, None))
+        print('%-44s %8d %12.0f %10s %8s %8s%s' % (
+            name, result['count'], result['rate'],
+            '' if result['peak_memory'] is None
+            else '%.0f' % (result['peak_memory'] / 1024.0),
+            _format_change(rate), _format_change(memory),
+            '  REGRESSION' if name in regressions else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='mocks,100,1000',
+                        help='comma separated data sizes, "mocks" standing '
+                             'for the mock responses of the unit tests')
+    parser.add_argument('--page-size', type=int, default=100,
+                        help='number of instances per response page')
+    parser.add_argument('--layers', default=','.join(LAYERS),
+                        help='comma separated layers to benchmark')
+    parser.add_argument('--filter', default='',
+                        help='regular expression matched against the '
+                             'benchmark names')
+    parser.add_argument('--min-time', type=float, default=0.1,
+                        help='minimum duration of a measurement in seconds')
+    parser.add_argument('--save', metavar='PATH',
+                        help='save the results as baseline')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare the results with a baseline')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='relative change of rate or peak memory '
+                             'reported as regression')
+    args = parser.parse_args()
+
+    results = run(args.sizes.split(','), args.page_size,
+                  args.layers.split(','), args.filter, args.min_time)
+
+    changes, regressions = {}, []
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        changes, regressions = compare(results, baseline['results'],
+                                       args.threshold)
+
+    report(results, changes, regressions)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(),
+                       'results': results}, f, indent=2, sort_keys=True)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Memory benchmark of the model objects
+
+Compares the memory used by the models of wsmanclient.model and the rate
+they are created at with the ones of objects keeping their attributes in a
+per-instance dictionary, like the models did before.
+
+    python benchmarks/bench_models.py [--number N]
+
+The memory is measured with tracemalloc on Python 3 and estimated with
+sys.getsizeof on Python 2. The attribute values are shared by all the
+instances, so only the objects themselves are counted.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import sys
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from wsmanclient import model
+
+
+class LegacyResource(object):
+    """Model keeping its attributes in a per-instance dictionary"""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def __repr__(self):
+        return json.dumps(self.__dict__)
+
+
+MODELS = {
+    'PhysicalDisk': (model.PhysicalDisk, {
+        'id': 'Disk.Bay.1:Enclosure.Internal.0-1:RAID.Integrated.1-1',
+        'description': 'Disk 1 in Backplane 1 of Integrated RAID Controller 1',
+        'controller': 'RAID.Integrated.1-1',
+        'manufacturer': 'SEAGATE',
+        'model': 'ST600MM0006',
+        'media_type': 'hdd',
+        'interface_type': 'sas',
+        'size_mb': 571776,
+        'free_size_mb': 571776,
+        'serial_number': 'S0M3EY2Z',
+        'firmware_version': 'LS0A',
+        'state': 'ok',
+        'raid_state': 'ready'}),
+    'Memory': (model.Memory, {
+        'id': 'DIMM.Socket.A1',
+        'size': 16384,
+        'speed': 2133,
+        'manufacturer': 'Samsung',
+        'model': 'DDR4 DIMM',
+        'status': 'OK'}),
+    'Job': (model.Job, {
+        'id': 'JID_CLEARALL',
+        'name': 'CLEARALL',
+        'start_time': datetime.datetime(2016, 7, 11, 13, 50, 39),
+        'until_time': None,
+        'message': 'NA',
+        'state': 'Pending',
+        'percent_complete': '0'}),
+}
+
+
+def _memory(create, number):
+    """Returns the memory used by number objects in bytes per object"""
+    gc.collect()
+    if tracemalloc is None:
+        objects = [create() for _ in range(number)]
+        obj = objects[0]
+        size = sys.getsizeof(obj)
+        if hasattr(obj, '__dict__') and not hasattr(type(obj), '_fields'):
+            size += sys.getsizeof(obj.__dict__)
+        return size
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        objects = [create() for _ in range(number)]
+        used = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    # leave out the list holding the objects
+    return (used - sys.getsizeof(objects)) / float(len(objects))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=100000,
+                        help='number of objects created per measurement')
+    args = parser.parse_args()
+
+    print('%-14s %-8s %12s %12s' % ('model', 'kind', 'bytes/obj', 'objs/s'))
+    for name in sorted(MODELS):
+        cls, attrs = MODELS[name]
+        for kind, factory in [('legacy', LegacyResource), ('slotted', cls)]:
+            def create():
+                return factory(**attrs)
+
+            memory = _memory(create, args.number)
+            elapsed = min(timeit.repeat(create, repeat=3, number=args.number))
+            print('%-14s %-8s %12.0f %12.0f' % (name, kind, memory,
+                                                args.number / elapsed))
+
+
+if __name__ == '__main__':
+    main()
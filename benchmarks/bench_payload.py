@@ -0,0 +1,76 @@
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Micro-benchmark of WS-Man payload generation
+
+Compares rendering the cached payload templates with building and
+serializing an lxml tree for every request.
+
+    python benchmarks/bench_payload.py [--number N]
+"""
+
+import argparse
+import timeit
+
+from lxml import etree as ElementTree
+
+from wsmanclient import wsman
+
+ENDPOINT = 'https://1.2.3.4:443/wsman'
+RESOURCE_URI = ('http://schemas.dell.com/wbem/wscim/1/cim-schema/2/'
+                'DCIM_BIOSEnumeration')
+
+PAYLOADS = {
+    'enumerate': lambda: wsman._EnumeratePayload(ENDPOINT, RESOURCE_URI),
+    'pull': lambda: wsman._PullPayload(ENDPOINT, RESOURCE_URI,
+                                       'enum-context-uuid'),
+    'invoke': lambda: wsman._InvokePayload(
+        ENDPOINT, RESOURCE_URI, 'SetAttributes',
+        {'CreationClassName': 'DCIM_BIOSService',
+         'Name': 'DCIM:BIOSService',
+         'SystemCreationClassName': 'DCIM_ComputerSystem',
+         'SystemName': 'DCIM:ComputerSystem'},
+        {'Target': 'BIOS.Setup.1-1',
+         'AttributeName': ['ProcVirtualization', 'MemTest'],
+         'AttributeValue': ['Disabled', 'Enabled']}),
+}
+
+
+def build_tree(payload):
+    payload.message_id = 'uuid:1234'
+    return ElementTree.tostring(payload._build_tree())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--number', type=int, default=10000,
+                        help='number of payloads built per measurement')
+    args = parser.parse_args()
+
+    print('%-10s %12s %14s %8s' % ('payload', 'tree (us)', 'template (us)',
+                                   'speedup'))
+    for name, create in sorted(PAYLOADS.items()):
+        payload = create()
+        tree = min(timeit.repeat(lambda: build_tree(payload), repeat=3,
+                                 number=args.number))
+        template = min(timeit.repeat(payload.build, repeat=3,
+                                     number=args.number))
+
+        print('%-10s %12.2f %14.2f %7.1fx' % (
+            name, tree / args.number * 1e6, template / args.number * 1e6,
+            tree / template))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Base class for the asyncio clients
+
+The asyncio clients don't duplicate the parsing logic of the synchronous
+resource managers. Each call runs the synchronous client method against a
+replay transport: whenever the method needs a response which hasn't been
+received yet, the run is interrupted, the request is sent with the
+AsyncWSManClient and the method is run again from the start, now replaying
+the responses received so far. Requests are only ever sent once, so the
+number of round trips is the same as with the synchronous client.
+"""
+
+import logging
+
+from wsmanclient import exceptions, tracing
+from wsmanclient.aiowsman import AsyncWSManClient
+
+LOG = logging.getLogger(__name__)
+
+
+class _PendingRequest(BaseException):
+    """Raised by the replay transport on a request without response
+
+    Derives from BaseException so that the resource managers can't swallow
+    it by accident.
+    """
+
+    def __init__(self, operation, args, kwargs):
+        super(_PendingRequest, self).__init__(operation)
+        self.operation = operation
+        self.args_ = args
+        self.kwargs = kwargs
+
+
+class _ReplayClient(object):
+    """Synchronous stand-in for WSManClient replaying recorded responses"""
+
+    OPERATIONS = ('enumerate', 'pull', 'get', 'get_fragment', 'put_fragment',
+                  'invoke', 'release')
+
+    def __init__(self, client, recorded):
+        self._client = client
+        self._recorded = recorded
+        self._position = 0
+        # a copy, so that every run of the method sends the same requests
+        self.unsupported_projections = set(client.unsupported_projections)
+        self.unsupported_gets = set(client.unsupported_gets)
+        self.unsupported_fragments = set(client.unsupported_fragments)
+
+    def __getattr__(self, name):
+        if name in self.OPERATIONS:
+            return lambda *args, **kwargs: self._replay(name, args, kwargs)
+
+        return getattr(self._client, name)
+
+    def _replay(self, operation, args, kwargs):
+        if self._position == len(self._recorded):
+            raise _PendingRequest(operation, args, kwargs)
+
+        request, response, error = self._recorded[self._position]
+        if request != (operation, args, kwargs):
+            raise RuntimeError('Non-deterministic request sequence: expected '
+                               '%r, got %r' % (request,
+                                               (operation, args, kwargs)))
+        self._position += 1
+
+        if error is not None:
+            raise error
+
+        return response
+
+
+class AsyncBaseClient(object):
+    """Base class for the asyncio variants of the BaseClient subclasses"""
+
+    #: synchronous client class providing the parsing logic
+    _sync_client_cls = None
+
+    def __init__(self, host, username, password, port=443, path='/wsman',
+                 protocol='https', **kwargs):
+        """Creates client object
+
+        :param host: hostname or IP of the interface
+        :param username: username for accessing the interface
+        :param password: password for accessing the interface
+        :param port: port for accessing the interface
+        :param path: path for accessing the interface
+        :param protocol: protocol for accessing the interface
+        :param kwargs: additional arguments passed to the underlying
+                       AsyncWSManClient, eg. pool_maxsize or pool_idle_timeout
+        """
+        self.client = AsyncWSManClient(host, username, password, port, path,
+                                       protocol, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the connections held open to the interface"""
+        await self.client.close()
+
+    async def _run(self, method, *args, **kwargs):
+        recorded = []
+        while True:
+            replay = _ReplayClient(self.client, recorded)
+            sync_client = self._sync_client_cls.__new__(self._sync_client_cls)
+            sync_client._set_client(replay)
+            try:
+                # the method is run again for every response, which would
+                # open a span each time
+                with tracing.suppressed():
+                    result = getattr(sync_client, method)(*args, **kwargs)
+                self.client.unsupported_projections.update(
+                    replay.unsupported_projections)
+                self.client.unsupported_gets.update(replay.unsupported_gets)
+                self.client.unsupported_fragments.update(
+                    replay.unsupported_fragments)
+                return result
+            except _PendingRequest as pending:
+                operation = getattr(self.client, pending.operation)
+                try:
+                    response = await operation(*pending.args_,
+                                               **pending.kwargs)
+                except exceptions.BaseClientException as exc:
+                    response, error = None, exc
+                else:
+                    error = None
+
+                recorded.append(((pending.operation, pending.args_,
+                                  pending.kwargs), response, error))
+
+    async def get_power_state(self):
+        """Returns the current power state of the node"""
+        return await self._run('get_power_state')
+
+    async def set_power_state(self, target_state):
+        """Turns the server power on/off or do a reboot"""
+        return await self._run('set_power_state', target_state)
+
+    async def list_power_supply_units(self, fields=None, where=None):
+        """Returns the list of power supply units"""
+        return await self._run('list_power_supply_units', fields, where)
+
+    async def list_boot_modes(self, fields=None, where=None):
+        """Returns the list of boot modes"""
+        return await self._run('list_boot_modes', fields, where)
+
+    async def list_boot_devices(self):
+        """Returns the list of boot devices"""
+        return await self._run('list_boot_devices')
+
+    async def change_boot_device_order(self, boot_mode, boot_device_list):
+        """Changes the boot device sequence for a boot mode"""
+        return await self._run('change_boot_device_order', boot_mode,
+                               boot_device_list)
+
+    async def list_bios_settings(self):
+        """List the BIOS configuration settings"""
+        return await self._run('list_bios_settings')
+
+    async def set_bios_settings(self, settings):
+        """Sets the BIOS configuration"""
+        return await self._run('set_bios_settings', settings)
+
+    async def get_health_state(self):
+        """Returns the current health state of the node"""
+        return await self._run('get_health_state')
+
+    async def list_nic_interfaces(self, fields=None, where=None):
+        """Returns the list of NIC interfaces"""
+        return await self._run('list_nic_interfaces', fields, where)
+
+    async def list_nic_settings(self, interface):
+        """List the NIC configuration settings"""
+        return await self._run('list_nic_settings', interface)
+
+    async def set_nic_settings(self, interface, settings):
+        """Sets the NIC configuration"""
+        return await self._run('set_nic_settings', interface, settings)
+
+    async def list_jobs(self, only_unfinished=False, fields=None, where=None):
+        """Returns a list of jobs from the job queue"""
+        return await self._run('list_jobs', only_unfinished, fields, where)
+
+    async def get_job(self, job_id, fields=None):
+        """Returns a job from the job queue"""
+        return await self._run('get_job', job_id, fields)
+
+    async def create_config_job(
+            self, resource_uri, cim_creation_class_name, cim_name, target,
+            cim_system_creation_class_name='DCIM_ComputerSystem',
+            cim_system_name='DCIM:ComputerSystem', reboot=False):
+        """Creates a config job"""
+        return await self._run(
+            'create_config_job', resource_uri, cim_creation_class_name,
+            cim_name, target, cim_system_creation_class_name,
+            cim_system_name, reboot)
+
+    async def delete_pending_config(
+            self, resource_uri, cim_creation_class_name, cim_name, target,
+            cim_system_creation_class_name='DCIM_ComputerSystem',
+            cim_system_name='DCIM:ComputerSystem'):
+        """Cancels pending configuration"""
+        return await self._run(
+            'delete_pending_config', resource_uri, cim_creation_class_name,
+            cim_name, target, cim_system_creation_class_name,
+            cim_system_name)
+
+    async def commit_pending_bios_changes(self, reboot=False):
+        """Applies all pending changes on the BIOS"""
+        return await self._run('commit_pending_bios_changes', reboot)
+
+    async def abandon_pending_bios_changes(self):
+        """Deletes all pending changes on the BIOS"""
+        return await self._run('abandon_pending_bios_changes')
+
+    async def get_lifecycle_controller_version(self):
+        """Returns the Lifecycle controller version"""
+        return await self._run('get_lifecycle_controller_version')
+
+    async def list_raid_controllers(self, fields=None, where=None):
+        """Returns the list of RAID controllers"""
+        return await self._run('list_raid_controllers', fields, where)
+
+    async def list_virtual_disks(self, fields=None, where=None):
+        """Returns the list of RAID arrays"""
+        return await self._run('list_virtual_disks', fields, where)
+
+    async def list_physical_disks(self, fields=None, where=None):
+        """Returns the list of physical disks"""
+        return await self._run('list_physical_disks', fields, where)
+
+    async def convert_physical_disks(self, raid_controller, physical_disks,
+                                     raid_enable=True):
+        """Changes the operational mode of physical disks"""
+        return await self._run('convert_physical_disks', raid_controller,
+                               physical_disks, raid_enable)
+
+    async def create_virtual_disk(self, raid_controller, physical_disks,
+                                  raid_level, size_mb, disk_name=None,
+                                  span_length=None, span_depth=None):
+        """Creates a virtual disk"""
+        return await self._run('create_virtual_disk', raid_controller,
+                               physical_disks, raid_level, size_mb, disk_name,
+                               span_length, span_depth)
+
+    async def delete_virtual_disk(self, virtual_disk):
+        """Deletes a virtual disk"""
+        return await self._run('delete_virtual_disk', virtual_disk)
+
+    async def commit_pending_raid_changes(self, raid_controller, reboot=False):
+        """Applies all pending changes on a RAID controller"""
+        return await self._run('commit_pending_raid_changes', raid_controller,
+                               reboot)
+
+    async def abandon_pending_raid_changes(self, raid_controller):
+        """Deletes all pending changes on a RAID controller"""
+        return await self._run('abandon_pending_raid_changes', raid_controller)
+
+    async def list_cpus(self, fields=None, where=None):
+        """Returns the list of CPUs"""
+        return await self._run('list_cpus', fields, where)
+
+    async def list_memory(self, fields=None, where=None):
+        """Returns the list of memory modules"""
+        return await self._run('list_memory', fields, where)
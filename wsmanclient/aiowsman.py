@@ -0,0 +1,370 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+asyncio variant of the WSMan client
+
+Requires Python 3 and aiohttp, available through the 'asyncio' extra.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+from lxml import etree as ElementTree
+
+from wsmanclient import exceptions, wsman
+
+LOG = logging.getLogger(__name__)
+
+
+class AsyncClient(object):
+    """Simple asyncio client for talking over WSMan protocol.
+
+    Mirrors wsman.Client, with the operations being coroutines. A single
+    event loop can drive any number of clients concurrently.
+    """
+
+    def __init__(self, host, username, password, port=443, path='/wsman',
+                 protocol='https', pool_maxsize=wsman.DEFAULT_POOL_MAXSIZE,
+                 pool_idle_timeout=wsman.DEFAULT_POOL_IDLE_TIMEOUT,
+                 connect_timeout=wsman.DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=wsman.DEFAULT_READ_TIMEOUT):
+        """Creates client object
+
+        :param host: hostname or IP of the WS-Man endpoint
+        :param username: username for accessing the endpoint
+        :param password: password for accessing the endpoint
+        :param port: port for accessing the endpoint
+        :param path: path for accessing the endpoint
+        :param protocol: protocol for accessing the endpoint
+        :param pool_maxsize: maximum number of keep-alive connections kept
+                             open to the endpoint
+        :param pool_idle_timeout: number of seconds after which unused pooled
+                                  connections are dropped
+        :param connect_timeout: number of seconds to wait for establishing a
+                                connection to the endpoint
+        :param read_timeout: number of seconds to wait for the next bytes of
+                             the response
+        """
+        self.host = host
+        self.username = username
+        self.password = password
+        self.port = port
+        self.path = path
+        self.protocol = protocol
+        self.endpoint = ('%(protocol)s://%(host)s:%(port)s%(path)s' % {
+            'protocol': self.protocol,
+            'host': self.host,
+            'port': self.port,
+            'path': self.path})
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # resources whose projection queries were rejected by the endpoint,
+        # see schema.View.enumerate
+        self.unsupported_projections = set()
+        # resources whose instances can't be read with a Get, see
+        # schema.View.get
+        self.unsupported_gets = set()
+        # resources whose properties can't be read with a fragment transfer
+        self.unsupported_fragments = set()
+
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the pooled connections to the endpoint"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        # the session binds to the running event loop, so it can only be
+        # created from a coroutine
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.pool_maxsize,
+                keepalive_timeout=self.pool_idle_timeout,
+                # TODO(ifarkas): enable cert verification
+                ssl=False)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                auth=aiohttp.BasicAuth(self.username, self.password))
+
+        return self._session
+
+    async def _post(self, data):
+        """Posts the payload to the endpoint
+
+        :returns: a tuple of the status code, reason and body of the response
+        """
+        timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout,
+                                        sock_read=self.read_timeout)
+        async with self._get_session().post(self.endpoint, data=data,
+                                            timeout=timeout) as resp:
+            body = await resp.read()
+            return resp.status, resp.reason, body
+
+    async def _do_request(self, payload):
+        payload = payload.build()
+        LOG.debug('Sending request to %(endpoint)s: %(payload)s',
+                  {'endpoint': self.endpoint, 'payload': payload})
+        try:
+            status_code, reason, body = await self._post(payload)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # no traceback, eg. 'No route to host' is expected to happen
+            LOG.error('Request to %(endpoint)s failed: %(error)r',
+                      {'endpoint': self.endpoint, 'error': e})
+            raise exceptions.WSManRequestFailure()
+
+        LOG.debug('Received response from %(endpoint)s: %(payload)s',
+                  {'endpoint': self.endpoint, 'payload': body})
+        if not 200 <= status_code < 400:
+            fault_subcode = None
+            if status_code in wsman._FAULT_STATUS_CODES:
+                fault_subcode = wsman._fault_subcode(body)
+            raise exceptions.WSManInvalidResponse(
+                status_code=status_code,
+                reason=reason,
+                fault_subcode=fault_subcode)
+
+        return ElementTree.fromstring(body)
+
+    async def enumerate(self, resource_uri, optimization=True, max_elems=100,
+                        auto_pull=True, filter_query=None,
+                        filter_dialect='cql'):
+        """Executes enumerate operation over WSMan.
+
+        :param resource_uri: URI of resource to enumerate.
+        :param optimization: flag to enable enumeration optimization. If
+                             disabled, the enumeration returns only an
+                             enumeration context.
+        :param max_elems: maximum number of elements returned by the operation.
+        :param auto_pull: flag to enable automatic pull on the enumeration
+                          context, merging the items returned.
+        :param filter_query: filter query string, or query.Query object.
+        :param filter_dialect: filter dialect. Valid options are: 'cql' and
+                               'wql'.
+        :returns: an lxml.etree.Element object of the response received.
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = wsman._EnumeratePayload(self.endpoint, resource_uri,
+                                          optimization, max_elems,
+                                          filter_query, filter_dialect)
+
+        resp_xml = await self._do_request(payload)
+
+        if not auto_pull:
+            return resp_xml
+
+        full_resp_xml = resp_xml
+
+        context = wsman._enum_context(full_resp_xml)
+        while context is not None:
+            resp_xml = await self.pull(resource_uri, context, max_elems)
+            context = wsman._enum_context(resp_xml)
+
+            full_resp_xml = wsman._merge_enum_items(full_resp_xml, resp_xml)
+
+        # remove enumeration context because items are already merged
+        wsman._remove_enum_context(full_resp_xml)
+
+        return full_resp_xml
+
+    async def iter_enumerate(self, resource_uri, optimization=True,
+                             max_elems=100, filter_query=None,
+                             filter_dialect='cql'):
+        """Executes enumerate over WSMan, yielding items page by page.
+
+        Asynchronous generator variant of wsman.Client.iter_enumerate. If the
+        generator is closed before the end of the sequence, the enumeration
+        context is released.
+
+        :param resource_uri: URI of resource to enumerate.
+        :param optimization: flag to enable enumeration optimization.
+        :param max_elems: maximum number of elements returned by a single
+                          operation.
+        :param filter_query: filter query string, or query.Query object.
+        :param filter_dialect: filter dialect. Valid options are: 'cql' and
+                               'wql'.
+        :returns: an asynchronous generator of lxml.etree.Element objects, one
+                  for each item received.
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = wsman._EnumeratePayload(self.endpoint, resource_uri,
+                                          optimization, max_elems,
+                                          filter_query, filter_dialect)
+        resp_xml = await self._do_request(payload)
+
+        context = None
+        try:
+            while True:
+                context = wsman._enum_context(resp_xml)
+                if wsman._end_of_sequence(resp_xml):
+                    context = None
+
+                items_xml = wsman._enum_items(resp_xml)
+                resp_xml = None
+                if items_xml is not None:
+                    for item in items_xml:
+                        yield item
+                items_xml = None
+
+                if context is None:
+                    break
+
+                resp_xml = await self.pull(resource_uri, context, max_elems)
+        finally:
+            if context is not None:
+                try:
+                    await self.release(resource_uri, context)
+                except (exceptions.WSManRequestFailure,
+                        exceptions.WSManInvalidResponse):
+                    LOG.warning('Failed to release enumeration context '
+                                '%(context)s of %(resource_uri)s',
+                                {'context': context,
+                                 'resource_uri': resource_uri})
+
+    async def pull(self, resource_uri, context, max_elems=100):
+        """Executes pull operation over WSMan.
+
+        :param resource_uri: URI of resource to pull
+        :param context: enumeration context
+        :param max_elems: maximum number of elements returned by the operation
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = wsman._PullPayload(self.endpoint, resource_uri, context,
+                                     max_elems)
+        return await self._do_request(payload)
+
+    async def release(self, resource_uri, context):
+        """Executes release operation over WSMan.
+
+        :param resource_uri: URI of resource
+        :param context: enumeration context
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = wsman._ReleasePayload(self.endpoint, resource_uri, context)
+        return await self._do_request(payload)
+
+    async def get(self, resource_uri, selectors):
+        """Executes get operation over WSMan.
+
+        :param resource_uri: URI of the resource
+        :param selectors: dict of the selectors identifying the instance
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = wsman._GetPayload(self.endpoint, resource_uri, selectors)
+        return await self._do_request(payload)
+
+    async def get_fragment(self, resource_uri, selectors, fragment):
+        """Executes get operation over WSMan on a fragment of an instance.
+
+        :param resource_uri: URI of the resource
+        :param selectors: dict of the selectors identifying the instance
+        :param fragment: name of the property read, eg. 'EnabledState'
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = wsman._GetFragmentPayload(self.endpoint, resource_uri,
+                                            selectors, fragment)
+        return await self._do_request(payload)
+
+    async def put_fragment(self, resource_uri, selectors, fragment, value):
+        """Executes put operation over WSMan on a fragment of an instance.
+
+        :param resource_uri: URI of the resource
+        :param selectors: dict of the selectors identifying the instance
+        :param fragment: name of the property updated
+        :param value: new value of the property
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = wsman._PutFragmentPayload(self.endpoint, resource_uri,
+                                            selectors, fragment, value)
+        return await self._do_request(payload)
+
+    async def invoke(self, resource_uri, method, selectors, properties):
+        """Executes invoke operation over WSMan.
+
+        :param resource_uri: URI of resource to invoke
+        :param method: name of the method to invoke
+        :param selector: dict of selectors
+        :param properties: dict of properties
+        :returns: an lxml.etree.Element object of the response received.
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = wsman._InvokePayload(self.endpoint, resource_uri, method,
+                                       selectors, properties)
+        return await self._do_request(payload)
+
+
+class AsyncWSManClient(AsyncClient):
+    """Wrapper for AsyncClient with return value checking"""
+
+    async def invoke(self, resource_uri, method, selectors=None,
+                     properties=None, expected_return_value=None):
+        """Invokes a remote WS-Man method
+
+        :param resource_uri: URI of the resource
+        :param method: name of the method to invoke
+        :param selectors: dictionary of selectors
+        :param properties: dictionary of properties
+        :param expected_return_value: expected return value reported back by
+            the DRAC card. For return value codes check the profile
+            documentation of the resource used in the method call. If not set,
+            return value checking is skipped.
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        :raises: DRACOperationFailed on error reported back by the DRAC
+                 interface
+        :raises: DRACUnexpectedReturnValue on return value mismatch
+        """
+        if selectors is None:
+            selectors = {}
+
+        if properties is None:
+            properties = {}
+
+        resp = await super(AsyncWSManClient, self).invoke(
+            resource_uri, method, selectors, properties)
+        wsman._check_return_value(resp, resource_uri, expected_return_value)
+
+        return resp
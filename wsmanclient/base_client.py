@@ -18,6 +18,8 @@ Abstract Base Class for pywsman.Client
 import abc
 import logging
 
+from wsmanclient import tracing
+
 #  import wsmanclient.exceptions
 #  from wsmanclient import exceptions
 #  from wsmanclient.resources import bios
@@ -42,7 +44,7 @@ class BaseClient(object):
 
     @abc.abstractmethod
     def __init__(self, host, username, password, port=443, path='/wsman',
-                 protocol='https'):
+                 protocol='https', **kwargs):
         """Creates client object
 
         :param host: hostname or IP of the DRAC interface
@@ -51,9 +53,37 @@ class BaseClient(object):
         :param port: port for accessing the DRAC interface
         :param path: path for accessing the DRAC interface
         :param protocol: protocol for accessing the DRAC interface
+        :param kwargs: additional arguments passed to the underlying
+                       WSManClient, eg. pool_maxsize or pool_idle_timeout
         """
         return
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the connections held open to the interface"""
+        self.client.close()
+
+    def deadline(self, timeout):
+        """Bounds the time taken by the calls made within the block
+
+        All the requests sent by the calls, including every page pulled by
+        the enumerations, share the same deadline::
+
+            with client.deadline(60):
+                client.list_bios_settings()
+
+        :param timeout: number of seconds the block may take
+        :returns: a context manager
+        :raises: WSManDeadlineExceeded from the calls, when running out of
+                 time
+        """
+        return self.client.deadline(timeout)
+
     @abc.abstractmethod
     def get_power_state(self):
         """Returns the current power state of the node
@@ -83,9 +113,15 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_power_supply_units(self):
+    def list_power_supply_units(self, fields=None, where=None):
         """Returns the list of PSUs
 
+        :param fields: names of the fields of the PSU objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching PSU objects are returned.
         :returns: list of BootMode objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -95,9 +131,15 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_boot_modes(self):
+    def list_boot_modes(self, fields=None, where=None):
         """Returns the list of boot modes
 
+        :param fields: names of the fields of the BootMode objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching BootMode objects are returned.
         :returns: list of BootMode objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -182,9 +224,15 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_nic_interfaces(self):
+    def list_nic_interfaces(self, fields=None, where=None):
         """Returns the list of nic interfaces
 
+        :param fields: names of the fields of the NICInterface objects needed,
+                       only their properties being requested. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching NICInterface objects are returned.
         :returns: a list of NICinterfaces objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -231,11 +279,17 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_jobs(self, only_unfinished=False):
+    def list_jobs(self, only_unfinished=False, fields=None, where=None):
         """Returns a list of jobs from the job queue
 
         :param only_unfinished: indicates whether only unfinished jobs should
                                 be returned
+        :param fields: names of the fields of the Job objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('JobStatus') ==
+                      'Failed'. Only the matching Job objects are returned.
         :returns: a list of Job objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -245,10 +299,12 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def get_job(self, job_id):
+    def get_job(self, job_id, fields=None):
         """Returns a job from the job queue
 
         :param job_id: id of the job
+        :param fields: names of the fields of the Job objects needed, the
+                       other fields being None. Defaults to all the fields.
         :returns: a Job object on successful query, None otherwise
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -363,9 +419,16 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_raid_controllers(self):
+    def list_raid_controllers(self, fields=None, where=None):
         """Returns the list of RAID controllers
 
+        :param fields: names of the fields of the RAIDController objects
+                       needed, only their properties being requested. Defaults
+                       to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching RAIDController objects are
+                      returned.
         :returns: a list of RAIDController objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -375,9 +438,15 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_virtual_disks(self):
+    def list_virtual_disks(self, fields=None, where=None):
         """Returns the list of RAID arrays
 
+        :param fields: names of the fields of the VirtualDisk objects needed,
+                       only their properties being requested. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching VirtualDisk objects are returned.
         :returns: a list of VirtualDisk objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -387,9 +456,15 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_physical_disks(self):
+    def list_physical_disks(self, fields=None, where=None):
         """Returns the list of physical disks
 
+        :param fields: names of the fields of the PhysicalDisk objects needed,
+                       only their properties being requested. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching PhysicalDisk objects are returned.
         :returns: a list of PhysicalDisk objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -497,9 +572,15 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_cpus(self):
+    def list_cpus(self, fields=None, where=None):
         """Returns the list of CPUs
 
+        :param fields: names of the fields of the CPU objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching CPU objects are returned.
         :returns: a list of CPU objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -509,9 +590,15 @@ class BaseClient(object):
         return
 
     @abc.abstractmethod
-    def list_memory(self):
+    def list_memory(self, fields=None, where=None):
         """Returns a list of memory modules
 
+        :param fields: names of the fields of the Memory objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching Memory objects are returned.
         :returns: a list of Memory objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -520,3 +607,23 @@ class BaseClient(object):
         """
 
         return
+
+
+def traced(cls):
+    """Class decorator opening a span for the calls of the client methods
+
+    The methods of BaseClient implemented by the class are wrapped, see the
+    tracing module.
+    """
+    for name in _TRACED_METHODS:
+        method = cls.__dict__.get(name)
+        if method is not None:
+            setattr(cls, name, tracing.traced(method))
+
+    return cls
+
+
+_TRACED_METHODS = sorted(
+    name for (name, value) in vars(BaseClient).items()
+    if getattr(value, '__isabstractmethod__', False) and
+    not name.startswith('_'))
@@ -0,0 +1,246 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Recording and replaying WSMan exchanges
+
+A Recorder is passed as the transport of the clients talking to real BMCs,
+and stores every response received in a capture file. A Replayer serves the
+responses from the capture file later, without any network, eg. for
+profiling or regression testing the whole client stack::
+
+    with capture.Recorder('bmcs.capture') as recorder:
+        client = DRACClient('1.2.3.4', 'root', 'calvin', transport=recorder)
+        client.list_bios_settings()
+
+    with capture.Replayer('bmcs.capture') as replayer:
+        client = DRACClient('1.2.3.4', 'root', 'calvin', transport=replayer)
+        client.list_bios_settings()
+
+Requests are matched by host, action, resource URI, selectors, filter,
+enumeration context and fragment. Repeated requests are answered with the
+responses recorded for them in order, the last one being repeated once they
+run out.
+
+The capture file holds a record for every response, the key of the request
+and the status of the response followed by its body. Each record is flushed
+as soon as it's added, so that the capture of a recording which crashed can
+still be replayed, only a partially written last record being lost.
+
+The replayer memory-maps the file and only keeps an index of the records in
+memory, so that large captures can be replayed without loading the bodies.
+The index is built by scanning the records when opening the capture, taking
+memory and time in proportion to the number of responses recorded.
+"""
+
+import json
+import logging
+import mmap
+import struct
+import threading
+
+from wsmanclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+_MAGIC = b'WSMANCAP'
+_VERSION = 2
+# magic and version of the format, starting the capture file
+_HEADER = struct.Struct('>8sH')
+# lengths of the metadata and of the body, starting each record
+_RECORD = struct.Struct('>II')
+
+
+def _request_key(client, payload):
+    selectors = getattr(payload, 'selectors', None) or {}
+    key = [client.host, payload.action, payload.resource_uri,
+           sorted(selectors.items()), getattr(payload, 'filter_query', None),
+           getattr(payload, 'context', None)]
+    # only fragment transfers have it, leaving the other keys as they were
+    fragment = getattr(payload, 'fragment', None)
+    if fragment is not None:
+        key.append(fragment)
+
+    return json.dumps(key)
+
+
+class Recorder(object):
+    """Transport sending the requests and recording the responses"""
+
+    def __init__(self, path):
+        """Creates recorder object
+
+        :param path: path of the capture file, overwritten if it exists
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+        self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the capture file"""
+        with self._lock:
+            if self._file is None:
+                return
+
+            self._file.close()
+            self._file = None
+
+    def post(self, client, payload, data, timeout):
+        resp = client._get_session().post(client.endpoint, data=data,
+                                          stream=True, timeout=timeout)
+        try:
+            body = resp.content
+        finally:
+            resp.close()
+
+        self.add(_request_key(client, payload), resp.status_code,
+                 resp.reason, body)
+
+        return _CapturedResponse(resp.status_code, resp.reason, body)
+
+    def add(self, key, status_code, reason, body):
+        """Appends a response to the capture
+
+        :param key: key of the request, as returned by _request_key
+        :param status_code: HTTP status code of the response
+        :param reason: HTTP reason phrase of the response
+        :param body: body of the response as bytes
+        """
+        with self._lock:
+            if self._file is None:
+                raise ValueError('Capture %s is closed' % self.path)
+
+            metadata = json.dumps([key, status_code, reason]).encode('utf-8')
+            self._file.write(_RECORD.pack(len(metadata), len(body)) +
+                             metadata + body)
+            self._file.flush()
+
+
+class Replayer(object):
+    """Transport answering the requests from a capture"""
+
+    def __init__(self, path):
+        """Creates replayer object
+
+        :param path: path of a capture file written by a Recorder
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            self._file.close()
+            raise ValueError('%s is not a capture file' % path)
+
+        if (len(self._map) < _HEADER.size or
+                self._map[:len(_MAGIC)] != _MAGIC):
+            self.close()
+            raise ValueError('%s is not a capture file' % path)
+
+        version = _HEADER.unpack(self._map[:_HEADER.size])[1]
+        if version != _VERSION:
+            self.close()
+            raise ValueError('Unsupported version %s of capture file %s' %
+                             (version, path))
+
+        self._records = self._read_index()
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def _read_index(self):
+        """Returns the offsets and statuses of the responses by request key"""
+        records = {}
+        offset = _HEADER.size
+        end = len(self._map)
+        while offset + _RECORD.size <= end:
+            metadata_length, body_length = _RECORD.unpack(
+                self._map[offset:offset + _RECORD.size])
+            metadata_start = offset + _RECORD.size
+            body_start = metadata_start + metadata_length
+            if body_start + body_length > end:
+                break
+
+            key, status_code, reason = json.loads(
+                self._map[metadata_start:body_start].decode('utf-8'))
+            records.setdefault(key, []).append(
+                [body_start, body_length, status_code, reason])
+            offset = body_start + body_length
+
+        if offset < end:
+            # the recording stopped while writing the record
+            LOG.warning('Ignoring the incomplete last record of capture %s',
+                        self.path)
+
+        return records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the capture file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        self._file.close()
+
+    def __len__(self):
+        return sum(len(records) for records in self._records.values())
+
+    def post(self, client, payload, data, timeout):
+        key = _request_key(client, payload)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                raise exceptions.WSManCaptureMiss(
+                    action=payload.action, resource_uri=payload.resource_uri,
+                    host=client.host)
+
+            position = self._positions.get(key, 0)
+            self._positions[key] = min(position + 1, len(records) - 1)
+
+        offset, length, status_code, reason = records[position]
+        return _CapturedResponse(status_code, reason, self._map, offset,
+                                 length)
+
+
+class _CapturedResponse(object):
+    """Stand-in of a requests.Response serving a recorded body"""
+
+    def __init__(self, status_code, reason, content, offset=0, length=None):
+        self.status_code = status_code
+        self.reason = reason
+        self.ok = status_code < 400
+        self._content = content
+        self._start = offset
+        self._end = offset + (len(content) if length is None else length)
+
+    def iter_content(self, chunk_size=1):
+        # slices of the memory map are copied one chunk at a time
+        for start in range(self._start, self._end, chunk_size):
+            yield self._content[start:min(start + chunk_size, self._end)]
+
+    def close(self):
+        pass
@@ -0,0 +1,483 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Columnar tables of resources
+
+A Table keeps every attribute of the resources in a column instead of
+creating a model object per resource. Numeric attributes are stored in typed
+arrays, the other ones are dictionary-encoded: each distinct value is stored
+once and the rows hold the integer code of their value, so the FQDDs, states
+and models repeated across a fleet cost a few bytes per row. Filters and
+group-bys work on whole columns, testing conditions once per distinct value.
+The columns are NumPy arrays when NumPy is installed, arrays of the array
+module otherwise::
+
+    table = columnar.Table.from_fleet(drac_fleet.map('list_physical_disks'))
+    degraded = table.where(raid_state='degraded')
+    degraded.group_by('model').count()
+"""
+
+import array
+import collections
+import numbers
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from wsmanclient import utils
+
+# name of the column holding the node of the rows built from fleet results
+HOST_COLUMN = 'host'
+
+
+def _indexes(mask):
+    """Returns the indexes of the rows selected by a mask"""
+    if numpy is not None:
+        return numpy.flatnonzero(numpy.asarray(mask, dtype=bool))
+
+    return array.array('l', [index for index, selected in enumerate(mask)
+                             if selected])
+
+
+def _match(condition):
+    """Returns the function testing values against a condition
+
+    The condition is either a callable returning whether a value matches, a
+    set, frozenset, list or tuple of the values matching, or the single value
+    matching.
+    """
+    if callable(condition):
+        return condition
+    if isinstance(condition, (set, frozenset, list, tuple)):
+        return lambda value: value in condition
+    return lambda value: value == condition
+
+
+class Column(object):
+    """Dictionary-encoded column
+
+    :ivar codes: array of the codes of the rows
+    :ivar values: list of the distinct values, indexed by code
+    """
+
+    def __init__(self, codes, values):
+        self.codes = codes
+        self.values = values
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+    def tolist(self):
+        """Returns the values of the rows"""
+        values = self.values
+        return [values[code] for code in self.codes]
+
+    def take(self, indexes):
+        """Returns the column of the rows at the given indexes"""
+        if numpy is not None:
+            return Column(self.codes[indexes], self.values)
+
+        codes = self.codes
+        return Column(array.array('i', [codes[index] for index in indexes]),
+                      self.values)
+
+    def mask(self, condition):
+        """Returns the mask of the rows matching a condition"""
+        match = _match(condition)
+        selected = [code for code, value in enumerate(self.values)
+                    if match(value)]
+        if numpy is not None:
+            return numpy.isin(self.codes, selected)
+
+        selected = frozenset(selected)
+        return [code in selected for code in self.codes]
+
+    def group_codes(self):
+        """Returns the codes and the values of the groups of the rows"""
+        return self.codes, self.values
+
+
+class NumberColumn(object):
+    """Column of numbers stored in a typed array
+
+    :ivar data: array of the values of the rows
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def tolist(self):
+        """Returns the values of the rows"""
+        return self.data.tolist()
+
+    def take(self, indexes):
+        """Returns the column of the rows at the given indexes"""
+        if numpy is not None:
+            return NumberColumn(self.data[indexes])
+
+        data = self.data
+        return NumberColumn(array.array(data.typecode,
+                                        [data[index] for index in indexes]))
+
+    def mask(self, condition):
+        """Returns the mask of the rows matching a condition"""
+        if numpy is None:
+            match = _match(condition)
+            matches = {}
+            mask = []
+            for value in self.data:
+                try:
+                    mask.append(matches[value])
+                except KeyError:
+                    matches[value] = bool(match(value))
+                    mask.append(matches[value])
+            return mask
+
+        if callable(condition):
+            values, inverse = numpy.unique(self.data, return_inverse=True)
+            selected = numpy.array([bool(condition(value))
+                                    for value in values.tolist()],
+                                   dtype=bool)
+            return selected[inverse]
+        if isinstance(condition, (set, frozenset, list, tuple)):
+            return numpy.isin(self.data, list(condition))
+        return self.data == condition
+
+    def group_codes(self):
+        """Returns the codes and the values of the groups of the rows"""
+        if numpy is not None:
+            values, codes = numpy.unique(self.data, return_inverse=True)
+            return codes, values.tolist()
+
+        builder = _ColumnBuilder()
+        for value in self.data:
+            builder.append(value)
+        return builder.codes, builder.values
+
+
+class _ColumnBuilder(object):
+    """Builds a column by dictionary-encoding the values appended"""
+
+    def __init__(self):
+        self.codes = array.array('i')
+        self.values = []
+        self._index = {}
+
+    def append(self, value):
+        if isinstance(value, list):
+            value = tuple(value)
+
+        # True, 1 and 1.0 are equal keys, the type keeps them apart
+        key = (value.__class__, value)
+        try:
+            code = self._index[key]
+        except KeyError:
+            code = self._index[key] = len(self.values)
+            self.values.append(value)
+
+        self.codes.append(code)
+
+    def build(self):
+        """Returns the column of the values appended
+
+        Columns of numbers without any None are stored in typed arrays,
+        other ones stay dictionary-encoded.
+        """
+        typecode = self._get_typecode()
+        if typecode is not None:
+            values = self.values
+            data = [values[code] for code in self.codes]
+            if numpy is not None:
+                return NumberColumn(numpy.array(
+                    data, dtype=numpy.int64 if typecode == 'l'
+                    else numpy.float64))
+            try:
+                return NumberColumn(array.array(typecode, data))
+            except OverflowError:
+                pass
+
+        if numpy is not None:
+            return Column(numpy.array(self.codes, dtype=numpy.intc),
+                          self.values)
+        return Column(self.codes, self.values)
+
+    def _get_typecode(self):
+        if not self.values:
+            return None
+
+        typecode = 'l'
+        for value in self.values:
+            if (not isinstance(value, numbers.Real) or
+                    isinstance(value, bool)):
+                return None
+            if not isinstance(value, numbers.Integral):
+                typecode = 'd'
+
+        return typecode
+
+
+class Groups(object):
+    """Rows of a table grouped by the values of a column"""
+
+    def __init__(self, table, by):
+        self.table = table
+        self.by = by
+        self._codes, self._values = table[by].group_codes()
+
+    def count(self):
+        """Returns the number of rows of every group
+
+        :returns: a dictionary mapping the values of the column to the
+                  number of rows
+        """
+        if numpy is not None:
+            counts = numpy.bincount(self._codes,
+                                    minlength=len(self._values)).tolist()
+        else:
+            counts = [0] * len(self._values)
+            for code in self._codes:
+                counts[code] += 1
+
+        return dict((value, count)
+                    for value, count in zip(self._values, counts) if count)
+
+    def sum(self, name):
+        """Returns the sum of a column for every group
+
+        None values are left out of the sums.
+
+        :param name: name of the column summed
+        :returns: a dictionary mapping the values of the grouping column to
+                  the sums
+        """
+        column = self.table[name]
+        if numpy is not None and isinstance(column, NumberColumn):
+            sums = numpy.zeros(len(self._values), dtype=column.data.dtype)
+            numpy.add.at(sums, self._codes, column.data)
+            counts = numpy.bincount(self._codes, minlength=len(self._values))
+            return dict((value, total) for value, total, count
+                        in zip(self._values, sums.tolist(), counts.tolist())
+                        if count)
+
+        sums = {}
+        for code, value in zip(self._codes, column.tolist()):
+            group = self._values[code]
+            sums.setdefault(group, 0)
+            if value is not None:
+                sums[group] += value
+
+        return sums
+
+    def __iter__(self):
+        """Yields the value of the column and the table of every group"""
+        for code, value in enumerate(self._values):
+            if numpy is not None:
+                mask = self._codes == code
+            else:
+                mask = [row_code == code for row_code in self._codes]
+
+            indexes = _indexes(mask)
+            if len(indexes):
+                yield value, self.table.take(indexes)
+
+
+class Table(object):
+    """Table of resources stored by column"""
+
+    def __init__(self, columns):
+        """Creates table object
+
+        :param columns: ordered dictionary mapping the names of the columns
+                        to Column or NumberColumn objects of the same length
+        """
+        self.columns = collections.OrderedDict(columns)
+        lengths = set(len(column) for column in self.columns.values())
+        if len(lengths) > 1:
+            raise ValueError('Columns of a table must have the same length')
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_records(cls, records, names=None, extra=None):
+        """Creates a table from records
+
+        :param records: iterable of model objects, or of dictionaries
+        :param names: names of the columns, defaults to the fields of the
+                      first record
+        :param extra: dictionary of the values of additional columns, the
+                      same for all the rows
+        :returns: a Table object
+        """
+        builder = _TableBuilder(names)
+        builder.extend(records, extra)
+        return builder.build()
+
+    @classmethod
+    def from_view(cls, view, docs):
+        """Creates a table from enumerated documents, without model objects
+
+        :param view: schema.View object describing the instances
+        :param docs: iterable of element tree objects, eg. returned by
+                     enumerate
+        :returns: a Table object
+        :raises: KeyError when a property isn't optional and is missing
+        """
+        builder = _TableBuilder([field.name for field in view.fields])
+        for doc in docs:
+            builder.extend(
+                view.parse_attrs(item)
+                for item in utils.find_xml(doc, view.element, view.namespace,
+                                           find_all=True))
+        return builder.build()
+
+    @classmethod
+    def from_fleet(cls, results, names=None):
+        """Creates a table from the results of a fleet
+
+        The results reporting an error are left out, the node of the others
+        is stored in the host column.
+
+        :param results: iterable of fleet.FleetResult objects whose result
+                        is a list of model objects, eg. returned by
+                        Fleet.map('list_physical_disks')
+        :param names: names of the columns, defaults to the fields of the
+                      first model object
+        :returns: a Table object
+        """
+        builder = _TableBuilder(names)
+        for result in results:
+            if result.error is None:
+                builder.extend(result.result, {HOST_COLUMN: result.host})
+        return builder.build()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    def take(self, indexes):
+        """Returns the table of the rows at the given indexes"""
+        return Table((name, column.take(indexes))
+                     for name, column in self.columns.items())
+
+    def filter(self, mask):
+        """Returns the table of the rows selected by a mask
+
+        :param mask: sequence of booleans, one per row, eg. a NumPy
+                     expression like table['size_mb'].data > 2 ** 20
+        :returns: a Table object
+        """
+        return self.take(_indexes(mask))
+
+    def where(self, **conditions):
+        """Returns the table of the rows matching all the conditions
+
+        Every condition is either a callable returning whether a value
+        matches, a set, frozenset, list or tuple of the values matching, or
+        the single value matching. Callables are called once per distinct
+        value of the column.
+
+        :param conditions: conditions, by name of the column
+        :returns: a Table object
+        """
+        mask = None
+        for name, condition in conditions.items():
+            column_mask = self.columns[name].mask(condition)
+            if mask is None:
+                mask = column_mask
+            elif numpy is not None:
+                mask = mask & column_mask
+            else:
+                mask = [a and b for a, b in zip(mask, column_mask)]
+
+        if mask is None:
+            return self
+        return self.filter(mask)
+
+    def group_by(self, name):
+        """Groups the rows by the values of a column
+
+        :param name: name of the column
+        :returns: a Groups object
+        """
+        return Groups(self, name)
+
+    def rows(self, model=None):
+        """Yields the rows of the table
+
+        :param model: callable creating the objects of the rows from the
+                      columns passed as keyword arguments, defaults to dict
+        """
+        model = model or dict
+        names = self.names
+        for values in zip(*[column.tolist()
+                            for column in self.columns.values()]):
+            yield model(**dict(zip(names, values)))
+
+
+class _TableBuilder(object):
+    """Builds a table from records appended row by row"""
+
+    def __init__(self, names=None):
+        self.names = list(names) if names is not None else None
+        self._builders = collections.OrderedDict()
+
+    def extend(self, records, extra=None):
+        extra = extra or {}
+        builders = None
+        for record in records:
+            if builders is None:
+                builders = self._get_builders(record, extra)
+
+            if isinstance(record, dict):
+                for name in self.names:
+                    builders[name].append(record.get(name))
+            else:
+                for name in self.names:
+                    builders[name].append(getattr(record, name, None))
+
+            for name, value in extra.items():
+                builders[name].append(value)
+
+    def _get_builders(self, record, extra):
+        if self.names is None:
+            if isinstance(record, dict):
+                self.names = list(record)
+            else:
+                self.names = list(record._fields)
+
+        for name in self.names + list(extra):
+            if name not in self._builders:
+                self._builders[name] = _ColumnBuilder()
+
+        return self._builders
+
+    def build(self):
+        return Table((name, builder.build())
+                     for name, builder in self._builders.items())
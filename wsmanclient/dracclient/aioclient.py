@@ -0,0 +1,31 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+asyncio variant of the DRACClient
+"""
+
+from wsmanclient.aio_base_client import AsyncBaseClient
+from wsmanclient.dracclient.client import DRACClient
+
+
+class AsyncDRACClient(AsyncBaseClient):
+    """asyncio client for managing DRAC nodes
+
+    Provides the same methods as DRACClient, as coroutines.
+    """
+
+    _sync_client_cls = DRACClient
+
+    BIOS_DEVICE_FQDD = DRACClient.BIOS_DEVICE_FQDD
+    NIC_DEVICE_FQDD = DRACClient.NIC_DEVICE_FQDD
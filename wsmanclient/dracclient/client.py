@@ -18,7 +18,7 @@ Wrapper for pywsman.Client
 import logging
 
 from wsmanclient import exceptions, utils
-from wsmanclient.base_client import BaseClient
+from wsmanclient.base_client import BaseClient, traced
 from wsmanclient.dracclient.resources import (bios, inventory, job,
                                               lifecycle_controller, nic, raid,
                                               uris)
@@ -27,6 +27,7 @@ from wsmanclient.wsman import WSManClient
 LOG = logging.getLogger(__name__)
 
 
+@traced
 class DRACClient(BaseClient):
     """Client for managing DRAC nodes"""
 
@@ -34,7 +35,7 @@ class DRACClient(BaseClient):
     NIC_DEVICE_FQDD = 'NIC.Setup.1-1'
 
     def __init__(self, host, username, password, port=443, path='/wsman',
-                 protocol='https'):
+                 protocol='https', **kwargs):
         """Creates client object
 
         :param host: hostname or IP of the DRAC interface
@@ -43,10 +44,15 @@ class DRACClient(BaseClient):
         :param port: port for accessing the DRAC interface
         :param path: path for accessing the DRAC interface
         :param protocol: protocol for accessing the DRAC interface
+        :param kwargs: additional arguments passed to the underlying
+                       WSManClient, eg. pool_maxsize or pool_idle_timeout
         """
         # TODO: Move to ABC class's __init__
-        self.client = WSManClient(host, username, password, port, path,
-                                  protocol)
+        self._set_client(WSManClient(host, username, password, port, path,
+                                     protocol, **kwargs))
+
+    def _set_client(self, client):
+        self.client = client
         self._job_mgmt = job.JobManagement(self.client)
         self._power_mgmt = bios.PowerManagement(self.client)
         self._boot_mgmt = bios.BootManagement(self.client)
@@ -82,27 +88,39 @@ class DRACClient(BaseClient):
         """
         self._power_mgmt.set_power_state(target_state)
 
-    def list_power_supply_units(self):
+    def list_power_supply_units(self, fields=None, where=None):
         """Returns the list of PSUs
 
+        :param fields: names of the fields of the PSU objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching PSU objects are returned.
         :returns: list of BootMode objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._power_mgmt.list_power_supply_units()
+        return self._power_mgmt.list_power_supply_units(fields, where)
 
-    def list_boot_modes(self):
+    def list_boot_modes(self, fields=None, where=None):
         """Returns the list of boot modes
 
+        :param fields: names of the fields of the BootMode objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching BootMode objects are returned.
         :returns: list of BootMode objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._boot_mgmt.list_boot_modes()
+        return self._boot_mgmt.list_boot_modes(fields, where)
 
     def list_boot_devices(self):
         """Returns the list of boot devices
@@ -175,16 +193,22 @@ class DRACClient(BaseClient):
         """
         return self._power_mgmt.get_health_state()
 
-    def list_nic_interfaces(self):
+    def list_nic_interfaces(self, fields=None, where=None):
         """Returns the list of nic interfaces
 
+        :param fields: names of the fields of the NICInterface objects needed,
+                       only their properties being requested. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching NICInterface objects are returned.
         :returns: a list of NICinterfaces objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._nic_mgmt.list_nic_interfaces()
+        return self._nic_mgmt.list_nic_interfaces(fields, where)
 
     def list_nic_settings(self, interface):
         """List the NIC configuration settings
@@ -221,30 +245,38 @@ class DRACClient(BaseClient):
         """
         return self._nic_cfg.set_nic_settings(interface, settings)
 
-    def list_jobs(self, only_unfinished=False):
+    def list_jobs(self, only_unfinished=False, fields=None, where=None):
         """Returns a list of jobs from the job queue
 
         :param only_unfinished: indicates whether only unfinished jobs should
                                 be returned
+        :param fields: names of the fields of the Job objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('JobStatus') ==
+                      'Failed'. Only the matching Job objects are returned.
         :returns: a list of Job objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._job_mgmt.list_jobs(only_unfinished)
+        return self._job_mgmt.list_jobs(only_unfinished, fields, where)
 
-    def get_job(self, job_id):
+    def get_job(self, job_id, fields=None):
         """Returns a job from the job queue
 
         :param job_id: id of the job
+        :param fields: names of the fields of the Job objects needed, the
+                       other fields being None. Defaults to all the fields.
         :returns: a Job object on successful query, None otherwise
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._job_mgmt.get_job(job_id)
+        return self._job_mgmt.get_job(job_id, fields)
 
     def create_config_job(self, resource_uri, cim_creation_class_name,
                           cim_name, target,
@@ -358,38 +390,57 @@ class DRACClient(BaseClient):
         return lifecycle_controller.LifecycleControllerManagement(
             self.client).get_version()
 
-    def list_raid_controllers(self):
+    def list_raid_controllers(self, fields=None, where=None):
         """Returns the list of RAID controllers
 
+        :param fields: names of the fields of the RAIDController objects
+                       needed, only their properties being requested. Defaults
+                       to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching RAIDController objects are
+                      returned.
         :returns: a list of RAIDController objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._raid_mgmt.list_raid_controllers()
+        return self._raid_mgmt.list_raid_controllers(fields, where)
 
-    def list_virtual_disks(self):
+    def list_virtual_disks(self, fields=None, where=None):
         """Returns the list of RAID arrays
 
+        :param fields: names of the fields of the VirtualDisk objects needed,
+                       only their properties being requested. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching VirtualDisk objects are returned.
         :returns: a list of VirtualDisk objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._raid_mgmt.list_virtual_disks()
+        return self._raid_mgmt.list_virtual_disks(fields, where)
 
-    def list_physical_disks(self):
+    def list_physical_disks(self, fields=None, where=None):
         """Returns the list of physical disks
 
+        :param fields: names of the fields of the PhysicalDisk objects needed,
+                       only their properties being requested. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching PhysicalDisk objects are returned.
         :returns: a list of PhysicalDisk objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._raid_mgmt.list_physical_disks()
+        return self._raid_mgmt.list_physical_disks(fields, where)
 
     def convert_physical_disks(self, raid_controller, physical_disks,
                                raid_enable=True):
@@ -493,20 +544,32 @@ class DRACClient(BaseClient):
             cim_creation_class_name='DCIM_RAIDService',
             cim_name='DCIM:RAIDService', target=raid_controller)
 
-    def list_cpus(self):
+    def list_cpus(self, fields=None, where=None):
         """Returns the list of CPUs
 
+        :param fields: names of the fields of the CPU objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching CPU objects are returned.
         :returns: a list of CPU objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._inventory_mgmt.list_cpus()
+        return self._inventory_mgmt.list_cpus(fields, where)
 
-    def list_memory(self):
+    def list_memory(self, fields=None, where=None):
         """Returns a list of memory modules
 
+        :param fields: names of the fields of the Memory objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching Memory objects are returned.
         :returns: a list of Memory objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -514,4 +577,4 @@ class DRACClient(BaseClient):
                  interface
         """
 
-        return self._inventory_mgmt.list_memory()
+        return self._inventory_mgmt.list_memory(fields, where)
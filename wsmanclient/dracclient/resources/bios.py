@@ -11,12 +11,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
 import logging
 import re
 
-from wsmanclient import exceptions, utils, wsman
-from wsmanclient.model import PSU
+from wsmanclient import exceptions, schema, utils, wsman
+from wsmanclient.model import PSU, BootDevice, BootMode
 from wsmanclient.dracclient import constants
 from wsmanclient.dracclient.resources import lifecycle_controller, uris
 
@@ -43,6 +42,11 @@ BOOT_MODE_IS_NEXT = {
 
 LC_CONTROLLER_VERSION_12G = (2, 0, 0)
 
+# properties decoded from the instances, see utils.decode_item
+_BOOT_DEVICE_ATTRS = ('InstanceID', 'BootSourceType',
+                      'CurrentAssignedSequence', 'PendingAssignedSequence',
+                      'BIOSBootString')
+
 # http://en.community.dell.com/dell-groups/dtcmedia/m/mediagallery/20066940/download,
 # p. 11
 HEALTH_STATES = {
@@ -52,14 +56,32 @@ HEALTH_STATES = {
     '25': constants.HEALTH_ERROR,
 }
 
-# TODO: Use inherited objects instead of namedtuples
-BootMode = collections.namedtuple('BootMode', ['id', 'name', 'is_current',
-                                               'is_next'])
-
-BootDevice = collections.namedtuple(
-    'BootDevice',
-    ['id',  'boot_mode', 'current_assigned_sequence',
-     'pending_assigned_sequence', 'bios_boot_string'])
+BOOT_MODE_VIEW = schema.View('BootMode', uris.DCIM_BootConfigSetting, [
+    schema.Field('id', 'InstanceID'),
+    schema.Field('name', 'ElementName'),
+    schema.Field('is_current', 'IsCurrent', values=BOOT_MODE_IS_CURRENT),
+    schema.Field('is_next', 'IsNext', values=BOOT_MODE_IS_NEXT)],
+    model=BootMode)
+
+PSU_VIEW = schema.View('PSU', uris.DCIM_PowerSupplyView, [
+    schema.Field('id', 'FQDD'),
+    schema.Field('description', 'DeviceDescription'),
+    schema.Field('last_system_inventory_time', 'LastSystemInventoryTime',
+                 type=utils.parse_idrac_time),
+    schema.Field('last_update_time', 'LastUpdateTime',
+                 type=utils.parse_idrac_time),
+    schema.Field('primary_status', 'PrimaryStatus',
+                 values=constants.PrimaryStatus)],
+    model=PSU)
+
+COMPUTER_SYSTEM_VIEW = schema.View(
+    'ComputerSystem', uris.DCIM_ComputerSystem, [
+        schema.Field('id', 'Name'),
+        schema.Field('power_state', 'EnabledState', values=POWER_STATES)])
+
+# selectors of the instance of the server
+_COMPUTER_SYSTEM_SELECTORS = {'CreationClassName': 'DCIM_ComputerSystem',
+                              'Name': 'srv:system'}
 
 
 class PowerManagement(object):
@@ -82,18 +104,8 @@ class PowerManagement(object):
                  interface
         """
 
-        filter_query = ('select EnabledState from '
-                        'DCIM_ComputerSystem where Name="srv:system"')
-        #  filter_query = ('select EnabledState from '
-        #  'CIM_ComputerSystem')
-        #  doc = self.client.enumerate(uris.CIM_ComputerSystem,
-        #  filter_query=filter_query)
-        doc = self.client.enumerate(uris.DCIM_ComputerSystem,
-                                    filter_query=filter_query)
-        enabled_state = utils.find_xml(doc, 'EnabledState',
-                                       uris.DCIM_ComputerSystem)
-
-        return POWER_STATES[enabled_state.text]
+        view = COMPUTER_SYSTEM_VIEW.project(['power_state'])
+        return view.get(self.client, _COMPUTER_SYSTEM_SELECTORS).power_state
 
     def get_health_state(self):
         """Returns the current health state of the node
@@ -143,38 +155,29 @@ class PowerManagement(object):
         self.client.invoke(uris.DCIM_ComputerSystem, 'RequestStateChange',
                            selectors, properties)
 
-    def list_power_supply_units(self):
+    def list_power_supply_units(self, fields=None, where=None):
         """Returns the list of PSUs
 
+        :param fields: names of the fields of the PSU objects needed, eg.
+                       ['primary_status']. Only their properties are requested,
+                       the other fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching PSU objects are returned.
         :returns: a list of PSU objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
         """
 
-        doc = self.client.enumerate(uris.DCIM_PowerSupplyView)
+        view = PSU_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         psus = utils.find_xml(doc, 'DCIM_PowerSupplyView',
                               uris.DCIM_PowerSupplyView,
                               find_all=True)
 
-        return [self._parse_psus(psu) for psu in psus]
-
-    def _parse_psus(self, psu):
-        return PSU(
-            id=self._get_psu_attr(psu, 'FQDD'),
-            description=self._get_psu_attr(psu, 'DeviceDescription'),
-            last_system_inventory_time=utils.parse_idrac_time(
-                self._get_psu_attr(psu, 'LastSystemInventoryTime')),
-            last_update_time=utils.parse_idrac_time(
-                self._get_psu_attr(psu, 'LastUpdateTime')),
-            primary_status=PrimaryStatus[
-                self._get_psu_attr(psu, 'PrimaryStatus')]
-        )
-
-    def _get_psu_attr(self, psu, attr_name):
-        return utils.get_wsman_resource_attr(
-            psu, uris.DCIM_PowerSupplyView, attr_name)
+        return [view.parse(psu) for psu in psus]
 
 
 class BootManagement(object):
@@ -186,9 +189,15 @@ class BootManagement(object):
         """
         self.client = client
 
-    def list_boot_modes(self):
+    def list_boot_modes(self, fields=None, where=None):
         """Returns the list of boot modes
 
+        :param fields: names of the fields of the BootMode objects needed, eg.
+                       ['is_next']. Only their properties are requested, the
+                       other fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching BootMode objects are returned.
         :returns: list of BootMode objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -196,13 +205,14 @@ class BootManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_BootConfigSetting)
+        view = BOOT_MODE_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         drac_boot_modes = utils.find_xml(doc, 'DCIM_BootConfigSetting',
                                          uris.DCIM_BootConfigSetting,
                                          find_all=True)
 
-        return [self._parse_drac_boot_mode(drac_boot_mode)
+        return [view.parse(drac_boot_mode)
                 for drac_boot_mode in drac_boot_modes]
 
     def list_boot_devices(self):
@@ -225,7 +235,7 @@ class BootManagement(object):
         try:
             boot_devices = [self._parse_drac_boot_device(drac_boot_device)
                             for drac_boot_device in drac_boot_devices]
-        except AttributeError:
+        except KeyError:
             # DRAC 11g doesn't have the BootSourceType attribute on the
             # DCIM_BootSourceSetting resource
             controller_version = (
@@ -273,58 +283,41 @@ class BootManagement(object):
                            'ChangeBootOrderByInstanceID', selectors,
                            properties, expected_return_value=utils.RET_SUCCESS)
 
-    def _parse_drac_boot_mode(self, drac_boot_mode):
-        return BootMode(
-            id=self._get_boot_mode_attr(drac_boot_mode, 'InstanceID'),
-            name=self._get_boot_mode_attr(drac_boot_mode, 'ElementName'),
-            is_current=BOOT_MODE_IS_CURRENT[self._get_boot_mode_attr(
-                drac_boot_mode, 'IsCurrent')],
-            is_next=BOOT_MODE_IS_NEXT[self._get_boot_mode_attr(
-                drac_boot_mode, 'IsNext')])
-
-    def _get_boot_mode_attr(self, drac_boot_mode, attr_name):
-        return utils.get_wsman_resource_attr(drac_boot_mode,
-                                             uris.DCIM_BootConfigSetting,
-                                             attr_name)
-
-    def _parse_drac_boot_device_common(self, drac_boot_device, instance_id,
-                                       boot_mode):
+    def _parse_drac_boot_device_common(self, attrs, instance_id, boot_mode):
         return BootDevice(
             id=instance_id,
             boot_mode=boot_mode,
-            current_assigned_sequence=int(self._get_boot_device_attr(
-                drac_boot_device, 'CurrentAssignedSequence')),
-            pending_assigned_sequence=int(self._get_boot_device_attr(
-                drac_boot_device, 'PendingAssignedSequence')),
-            bios_boot_string=self._get_boot_device_attr(drac_boot_device,
-                                                        'BIOSBootString'))
+            current_assigned_sequence=int(attrs['CurrentAssignedSequence']),
+            pending_assigned_sequence=int(attrs['PendingAssignedSequence']),
+            bios_boot_string=attrs['BIOSBootString'])
 
     def _parse_drac_boot_device(self, drac_boot_device):
-        instance_id = self._get_boot_device_attr(drac_boot_device,
-                                                 'InstanceID')
-        boot_mode = self._get_boot_device_attr(drac_boot_device,
-                                               'BootSourceType')
+        attrs = self._decode_boot_device(drac_boot_device)
 
-        return self._parse_drac_boot_device_common(drac_boot_device,
-                                                   instance_id, boot_mode)
+        return self._parse_drac_boot_device_common(
+            attrs, attrs['InstanceID'], attrs['BootSourceType'])
 
     def _parse_drac_boot_device_11g(self, drac_boot_device):
-        instance_id = self._get_boot_device_attr(drac_boot_device,
-                                                 'InstanceID')
+        attrs = self._decode_boot_device(drac_boot_device)
+        instance_id = attrs['InstanceID']
         boot_mode = instance_id.split(':')[0]
 
-        return self._parse_drac_boot_device_common(drac_boot_device,
-                                                   instance_id, boot_mode)
+        return self._parse_drac_boot_device_common(attrs, instance_id,
+                                                   boot_mode)
 
-    def _get_boot_device_attr(self, drac_boot_device, attr_name):
-        return utils.get_wsman_resource_attr(drac_boot_device,
-                                             uris.DCIM_BootSourceSetting,
-                                             attr_name)
+    def _decode_boot_device(self, drac_boot_device):
+        return utils.decode_item(drac_boot_device,
+                                 uris.DCIM_BootSourceSetting,
+                                 _BOOT_DEVICE_ATTRS)
 
 
 class BIOSAttribute(object):
     """Generic BIOS attribute class"""
 
+    # properties decoded by parse, extended by the subclasses
+    _attr_names = ('AttributeName', 'CurrentValue', 'PendingValue',
+                   'IsReadOnly')
+
     def __init__(self, name, current_value, pending_value, read_only):
         """Creates BIOSAttribute object
 
@@ -346,22 +339,20 @@ class BIOSAttribute(object):
     def parse(cls, namespace, bios_attr_xml):
         """Parses XML and creates BIOSAttribute object"""
 
-        name = utils.get_wsman_resource_attr(
-            bios_attr_xml, namespace, 'AttributeName')
-        current_value = utils.get_wsman_resource_attr(
-            bios_attr_xml, namespace, 'CurrentValue', nullable=True)
-        pending_value = utils.get_wsman_resource_attr(
-            bios_attr_xml, namespace, 'PendingValue', nullable=True)
-        read_only = utils.get_wsman_resource_attr(
-            bios_attr_xml, namespace, 'IsReadOnly')
+        return cls._from_attrs(utils.decode_item(bios_attr_xml, namespace,
+                                                 cls._attr_names))
 
-        return cls(name, current_value, pending_value, (read_only == 'true'))
+    @classmethod
+    def _from_attrs(cls, attrs):
+        return cls(attrs['AttributeName'], attrs['CurrentValue'],
+                   attrs['PendingValue'], (attrs['IsReadOnly'] == 'true'))
 
 
 class BIOSEnumerableAttribute(BIOSAttribute):
     """Enumerable BIOS attribute class"""
 
     namespace = uris.DCIM_BIOSEnumeration
+    _attr_names = BIOSAttribute._attr_names + ('PossibleValues',)
 
     def __init__(self, name, current_value, pending_value, read_only,
                  possible_values):
@@ -383,14 +374,13 @@ class BIOSEnumerableAttribute(BIOSAttribute):
     def parse(cls, bios_attr_xml):
         """Parses XML and creates BIOSEnumerableAttribute object"""
 
-        bios_attr = BIOSAttribute.parse(cls.namespace, bios_attr_xml)
-        possible_values = [attr.text for attr
-                           in utils.find_xml(bios_attr_xml, 'PossibleValues',
-                                             cls.namespace, find_all=True)]
+        attrs = utils.decode_item(bios_attr_xml, cls.namespace,
+                                  cls._attr_names, lists=('PossibleValues',))
+        bios_attr = BIOSAttribute._from_attrs(attrs)
 
         return cls(bios_attr.name, bios_attr.current_value,
                    bios_attr.pending_value, bios_attr.read_only,
-                   possible_values)
+                   attrs['PossibleValues'])
 
     def validate(self, new_value):
         """Validates new value"""
@@ -408,6 +398,8 @@ class BIOSStringAttribute(BIOSAttribute):
     """String BIOS attribute class"""
 
     namespace = uris.DCIM_BIOSString
+    _attr_names = BIOSAttribute._attr_names + ('MinLength', 'MaxLength',
+                                               'ValueExpression')
 
     def __init__(self, name, current_value, pending_value, read_only,
                  min_length, max_length, pcre_regex):
@@ -433,17 +425,14 @@ class BIOSStringAttribute(BIOSAttribute):
     def parse(cls, bios_attr_xml):
         """Parses XML and creates BIOSStringAttribute object"""
 
-        bios_attr = BIOSAttribute.parse(cls.namespace, bios_attr_xml)
-        min_length = int(utils.get_wsman_resource_attr(
-            bios_attr_xml, cls.namespace, 'MinLength'))
-        max_length = int(utils.get_wsman_resource_attr(
-            bios_attr_xml, cls.namespace, 'MaxLength'))
-        pcre_regex = utils.get_wsman_resource_attr(
-            bios_attr_xml, cls.namespace, 'ValueExpression', nullable=True)
+        attrs = utils.decode_item(bios_attr_xml, cls.namespace,
+                                  cls._attr_names)
+        bios_attr = BIOSAttribute._from_attrs(attrs)
 
         return cls(bios_attr.name, bios_attr.current_value,
                    bios_attr.pending_value, bios_attr.read_only,
-                   min_length, max_length, pcre_regex)
+                   int(attrs['MinLength']), int(attrs['MaxLength']),
+                   attrs['ValueExpression'])
 
     def validate(self, new_value):
         """Validates new value"""
@@ -463,6 +452,7 @@ class BIOSIntegerAttribute(BIOSAttribute):
     """Integer BIOS attribute class"""
 
     namespace = uris.DCIM_BIOSInteger
+    _attr_names = BIOSAttribute._attr_names + ('LowerBound', 'UpperBound')
 
     def __init__(self, name, current_value, pending_value, read_only,
                  lower_bound, upper_bound):
@@ -485,11 +475,9 @@ class BIOSIntegerAttribute(BIOSAttribute):
     def parse(cls, bios_attr_xml):
         """Parses XML and creates BIOSIntegerAttribute object"""
 
-        bios_attr = BIOSAttribute.parse(cls.namespace, bios_attr_xml)
-        lower_bound = utils.get_wsman_resource_attr(
-            bios_attr_xml, cls.namespace, 'LowerBound')
-        upper_bound = utils.get_wsman_resource_attr(
-            bios_attr_xml, cls.namespace, 'UpperBound')
+        attrs = utils.decode_item(bios_attr_xml, cls.namespace,
+                                  cls._attr_names)
+        bios_attr = BIOSAttribute._from_attrs(attrs)
 
         if bios_attr.current_value:
             bios_attr.current_value = int(bios_attr.current_value)
@@ -498,7 +486,7 @@ class BIOSIntegerAttribute(BIOSAttribute):
 
         return cls(bios_attr.name, bios_attr.current_value,
                    bios_attr.pending_value, bios_attr.read_only,
-                   int(lower_bound), int(upper_bound))
+                   int(attrs['LowerBound']), int(attrs['UpperBound']))
 
     def validate(self, new_value):
         """Validates new value"""
@@ -13,11 +13,38 @@
 
 import collections
 
-from wsmanclient import utils
+from wsmanclient import schema, utils
 from wsmanclient.model import CPU, Memory
 from wsmanclient.dracclient import constants
 from wsmanclient.dracclient.resources import uris
 
+ENABLED_STATES = {
+    '0': False,
+    '1': True
+}
+
+CPU_VIEW = schema.View('CPU', uris.DCIM_CPUView, [
+    schema.Field('id', 'FQDD'),
+    schema.Field('cores', 'NumberOfProcessorCores', type=int),
+    schema.Field('speed', 'CurrentClockSpeed', type=int),
+    schema.Field('ht_enabled', 'HyperThreadingEnabled',
+                 values=ENABLED_STATES),
+    schema.Field('model', 'Model'),
+    schema.Field('status', 'PrimaryStatus', values=constants.PrimaryStatus),
+    schema.Field('turbo_enabled', 'TurboModeEnabled', values=ENABLED_STATES),
+    schema.Field('vt_enabled', 'VirtualizationTechnologyEnabled',
+                 values=ENABLED_STATES)],
+    model=CPU)
+
+MEMORY_VIEW = schema.View('Memory', uris.DCIM_MemoryView, [
+    schema.Field('id', 'FQDD'),
+    schema.Field('size', 'Size', type=int),
+    schema.Field('speed', 'Speed', type=int),
+    schema.Field('manufacturer', 'Manufacturer'),
+    schema.Field('model', 'Model'),
+    schema.Field('status', 'PrimaryStatus', values=constants.PrimaryStatus)],
+    model=Memory)
+
 
 class InventoryManagement(object):
 
@@ -28,77 +55,51 @@ class InventoryManagement(object):
         """
         self.client = client
 
-    def list_cpus(self):
+    def list_cpus(self, fields=None, where=None):
         """Returns the list of CPUs
 
+        :param fields: names of the fields of the CPU objects needed, eg.
+                       ['cores', 'status']. Only their properties are
+                       requested, the other fields being None. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching CPU objects are returned.
         :returns: a list of CPU objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
         """
 
-        doc = self.client.enumerate(uris.DCIM_CPUView)
+        view = CPU_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         cpus = utils.find_xml(doc, 'DCIM_CPUView',
                 uris.DCIM_CPUView,
                 find_all=True)
 
-        return [self._parse_cpus(cpu) for cpu in cpus]
-
-    def _parse_cpus(self, cpu):
-        return CPU(
-                self._get_cpu_attr(cpu, 'FQDD'),
-                constants.PrimaryStatus[self._get_cpu_attr(cpu, 'PrimaryStatus')])
-        # TODO(antoni): Extend CPU object
-                #  return CPU(
-                    #  id=self._get_cpu_attr(cpu, 'FQDD'),
-                    #  cores=int(self._get_cpu_attr(cpu, 'NumberOfProcessorCores')),
-                    #  speed=int(self._get_cpu_attr(cpu, 'CurrentClockSpeed')),
-                    #  ht_enabled=bool(self._get_cpu_attr(cpu, 'HyperThreadingEnabled')),
-                    #  model=self._get_cpu_attr(cpu, 'Model'),
-                    #  status=PrimaryStatus[self._get_cpu_attr(cpu, 'PrimaryStatus')],
-                    #  turbo_enabled=bool(self._get_cpu_attr(cpu, 'TurboModeEnabled')),
-                    #  vt_enabled=bool(self._get_cpu_attr(cpu,
-                                                       #  'VirtualizationTechnologyEnabled'))
-                #  )
-
-    def _get_cpu_attr(self, cpu, attr_name):
-        return utils.get_wsman_resource_attr(
-                cpu, uris.DCIM_CPUView, attr_name)
-
-    def list_memory(self):
+        return [view.parse(cpu) for cpu in cpus]
+
+    def list_memory(self, fields=None, where=None):
         """Returns the list of installed memory
 
+        :param fields: names of the fields of the Memory objects needed, eg.
+                       ['size']. Only their properties are requested, the other
+                       fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching Memory objects are returned.
         :returns: a list of Memory objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
         """
 
-        doc = self.client.enumerate(uris.DCIM_MemoryView)
+        view = MEMORY_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         installed_memory = utils.find_xml(doc, 'DCIM_MemoryView',
                 uris.DCIM_MemoryView,
                 find_all=True)
 
-        return [self._parse_memory(memory) for memory in installed_memory]
-
-    def _parse_memory(self, memory):
-        return Memory(self._get_memory_attr(memory, 'FQDD'),
-                constants.PrimaryStatus[self._get_memory_attr(
-                    memory,
-                    'PrimaryStatus')])
-                # TODO(antoni): Extend Memory object
-        #  return Memory(id=self._get_memory_attr(memory, 'FQDD'),
-                      #  size=int(self._get_memory_attr(memory, 'Size')),
-                      #  speed=int(self._get_memory_attr(memory, 'Speed')),
-                      #  manufacturer=self._get_memory_attr(memory,
-                                                         #  'Manufacturer'),
-                      #  model=self._get_memory_attr(memory, 'Model'),
-                      #  status=PrimaryStatus[self._get_memory_attr(
-                          #  memory,
-                          #  'PrimaryStatus')])
-
-    def _get_memory_attr(self, memory, attr_name):
-        return utils.get_wsman_resource_attr(memory, uris.DCIM_MemoryView,
-                attr_name)
+        return [view.parse(memory) for memory in installed_memory]
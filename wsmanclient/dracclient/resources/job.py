@@ -11,11 +11,26 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import collections
-
-from wsmanclient import utils, wsman
+from wsmanclient import query, schema, utils, wsman
+from wsmanclient.model import Job
 from wsmanclient.dracclient.resources import uris
 
+JOB_VIEW = schema.View('Job', uris.DCIM_LifecycleJob, [
+    schema.Field('id', 'InstanceID'),
+    schema.Field('name', 'Name'),
+    schema.Field('start_time', 'JobStartTime'),
+    schema.Field('until_time', 'JobUntilTime'),
+    schema.Field('message', 'Message'),
+    schema.Field('state', 'JobStatus'),
+    schema.Field('percent_complete', 'PercentComplete')],
+    model=Job)
+
+FINISHED_JOB_STATES = ('Reboot Completed', 'Completed',
+                       'Completed with Errors', 'Failed')
+
+UNFINISHED_JOBS = ((query.Property('Name') != 'CLEARALL') &
+                   query.Property('JobStatus').not_in(FINISHED_JOB_STATES))
+
 
 class JobManagement(object):
 
@@ -26,11 +41,17 @@ class JobManagement(object):
         """
         self.client = client
 
-    def list_jobs(self, only_unfinished=False):
+    def list_jobs(self, only_unfinished=False, fields=None, where=None):
         """Returns a list of jobs from the job queue
 
         :param only_unfinished: indicates whether only unfinished jobs should
                                 be returned
+        :param fields: names of the fields of the Job objects needed, eg.
+                       ['state']. Only their properties are requested, the
+                       other fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('JobStatus') ==
+                      'Failed'. Only the matching Job objects are returned.
         :returns: a list of Job objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -38,27 +59,25 @@ class JobManagement(object):
                  interface
         """
 
-        filter_query = None
         if only_unfinished:
-            filter_query = ('select * from DCIM_LifecycleJob '
-                            'where Name != "CLEARALL" and '
-                            'JobStatus != "Reboot Completed" and '
-                            'JobStatus != "Completed" and '
-                            'JobStatus != "Completed with Errors" and '
-                            'JobStatus != "Failed"')
+            where = (UNFINISHED_JOBS if where is None else
+                     UNFINISHED_JOBS & where)
 
-        doc = self.client.enumerate(uris.DCIM_LifecycleJob,
-                                    filter_query=filter_query)
+        view = JOB_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         drac_jobs = utils.find_xml(doc, 'DCIM_LifecycleJob',
                                    uris.DCIM_LifecycleJob, find_all=True)
 
-        return [self._parse_drac_job(drac_job) for drac_job in drac_jobs]
+        return [view.parse(drac_job) for drac_job in drac_jobs]
 
-    def get_job(self, job_id):
+    def get_job(self, job_id, fields=None):
         """Returns a job from the job queue
 
         :param job_id: id of the job
+        :param fields: names of the fields of the Job objects needed, eg.
+                       ['state'], the other fields being None. Defaults to
+                       all the fields.
         :returns: a Job object on successful query, None otherwise
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -66,17 +85,8 @@ class JobManagement(object):
                  interface
         """
 
-        filter_query = ('select * from DCIM_LifecycleJob where InstanceID="%s"'
-                        % job_id)
-
-        doc = self.client.enumerate(uris.DCIM_LifecycleJob,
-                                    filter_query=filter_query)
-
-        drac_job = utils.find_xml(doc, 'DCIM_LifecycleJob',
-                                  uris.DCIM_LifecycleJob)
-
-        if drac_job is not None:
-            return self._parse_drac_job(drac_job)
+        view = JOB_VIEW.project(fields)
+        return view.get(self.client, {'InstanceID': job_id})
 
     def create_config_job(self, resource_uri, cim_creation_class_name,
                           cim_name, target,
@@ -171,17 +181,3 @@ class JobManagement(object):
         self.client.invoke(resource_uri, 'DeletePendingConfiguration',
                            selectors, properties,
                            expected_return_value=utils.RET_SUCCESS)
-
-    def _parse_drac_job(self, drac_job):
-        return Job(id=self._get_job_attr(drac_job, 'InstanceID'),
-                   name=self._get_job_attr(drac_job, 'Name'),
-                   start_time=self._get_job_attr(drac_job, 'JobStartTime'),
-                   until_time=self._get_job_attr(drac_job, 'JobUntilTime'),
-                   message=self._get_job_attr(drac_job, 'Message'),
-                   state=self._get_job_attr(drac_job, 'JobStatus'),
-                   percent_complete=self._get_job_attr(drac_job,
-                                                       'PercentComplete'))
-
-    def _get_job_attr(self, drac_job, attr_name):
-        return utils.get_wsman_resource_attr(drac_job, uris.DCIM_LifecycleJob,
-                                             attr_name)
@@ -1,8 +1,7 @@
-import collections
 import logging
 import re
 
-from wsmanclient import exceptions, utils, wsman
+from wsmanclient import exceptions, schema, utils, wsman
 from wsmanclient.model import NICInterface
 from wsmanclient.dracclient.resources import uris
 
@@ -14,6 +13,12 @@ STATUS_MAP = {
     "3": "Disabled"
 }
 
+# TODO: Extend NICInterface object, eg. with the DeviceDescription,
+# ProductName, PermanentMACAddress and LinkSpeed properties
+NIC_INTERFACE_VIEW = schema.View(
+    'NICInterface', uris.DCIM_NICView, [schema.Field('id', 'FQDD')],
+    model=NICInterface)
+
 
 class NICManagement(object):
 
@@ -24,9 +29,15 @@ class NICManagement(object):
         """
         self.client = client
 
-    def list_nic_interfaces(self):
+    def list_nic_interfaces(self, fields=None, where=None):
         """Returns the list of NIC interfaces
 
+        :param fields: names of the fields of the NICInterface objects needed,
+                       eg. ['id']. Only their properties are requested, the
+                       other fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching NICInterface objects are returned.
         :returns: a list of NIC inteface objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -34,40 +45,23 @@ class NICManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_NICView)
+        view = NIC_INTERFACE_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         drac_nic_interfaces = utils.find_xml(doc, 'DCIM_NICView',
                                              uris.DCIM_NICView,
                                              find_all=True)
 
-        return [self._parse_drac_nic_interfaces(interface)
-                for interface in drac_nic_interfaces]
-
-    def _parse_drac_nic_interfaces(self, drac_nic_interface):
-        return NICInterface(
-            self._get_nic_interface_attr(drac_nic_interface, 'FQDD'),None)
-        # TODO: Extend NICInterface object
-        #  return NICInterface(
-            #  id=self._get_nic_interface_attr(drac_nic_interface, 'FQDD'),
-            #  description=self._get_nic_interface_attr(
-                #  drac_nic_interface, 'DeviceDescription'),
-            #  product_name=self._get_nic_interface_attr(
-                #  drac_nic_interface, 'ProductName'),
-            #  mac_address=self._get_nic_interface_attr(
-                #  drac_nic_interface, 'PermanentMACAddress'),
-            #  linkspeed=self._get_nic_interface_attr(
-                #  drac_nic_interface, 'LinkSpeed')
-        #  )
-
-    def _get_nic_interface_attr(self, drac_nic_interface, attr_name):
-        return utils.get_wsman_resource_attr(
-            drac_nic_interface, uris.DCIM_NICView, attr_name)
+        return [view.parse(interface) for interface in drac_nic_interfaces]
 
 
 class NICAttribute(object):
     """Generic NIC attribute class"""
 
     namespace = uris.DCIM_NICAttribute
+    # properties decoded by parse, extended by the subclasses
+    _attr_names = ('FQDD', 'AttributeName', 'CurrentValue', 'PendingValue',
+                   'IsReadOnly')
 
     def __init__(self, fqdd, name, current_value, pending_value, read_only):
         """Creates NICAttribute object
@@ -92,24 +86,21 @@ class NICAttribute(object):
     def parse(cls, namespace, nic_attr_xml):
         """Parses XML and creates NICAttribute object"""
 
-        fqdd = utils.get_wsman_resource_attr(
-            nic_attr_xml, namespace, 'FQDD', nullable=True)
-        name = utils.get_wsman_resource_attr(
-            nic_attr_xml, namespace, 'AttributeName')
-        current_value = utils.get_wsman_resource_attr(
-            nic_attr_xml, namespace, 'CurrentValue', nullable=True)
-        pending_value = utils.get_wsman_resource_attr(
-            nic_attr_xml, namespace, 'PendingValue', nullable=True)
-        read_only = utils.get_wsman_resource_attr(
-            nic_attr_xml, namespace, 'IsReadOnly')
+        return cls._from_attrs(utils.decode_item(nic_attr_xml, namespace,
+                                                 cls._attr_names))
 
-        return cls(fqdd, name, current_value, pending_value, (read_only == 'true'))
+    @classmethod
+    def _from_attrs(cls, attrs):
+        return cls(attrs['FQDD'], attrs['AttributeName'],
+                   attrs['CurrentValue'], attrs['PendingValue'],
+                   (attrs['IsReadOnly'] == 'true'))
 
 
 class NICEnumerableAttribute(NICAttribute):
     """Enumerable NIC attribute class"""
 
     namespace = uris.DCIM_NICEnumeration
+    _attr_names = NICAttribute._attr_names + ('PossibleValues',)
 
     def __init__(self, fqdd, name, current_value, pending_value, read_only,
                  possible_values):
@@ -130,14 +121,13 @@ class NICEnumerableAttribute(NICAttribute):
     @classmethod
     def parse(cls, nic_attr_xml):
         """Parses XML and creates NICEnumerableAttribute object"""
-        nic_attr = NICAttribute.parse(cls.namespace, nic_attr_xml)
-        possible_values = [attr.text for attr
-                           in utils.find_xml(nic_attr_xml, 'PossibleValues',
-                                             cls.namespace, find_all=True)]
+        attrs = utils.decode_item(nic_attr_xml, cls.namespace,
+                                  cls._attr_names, lists=('PossibleValues',))
+        nic_attr = NICAttribute._from_attrs(attrs)
 
         return cls(nic_attr.fqdd, nic_attr.name, nic_attr.current_value,
                    nic_attr.pending_value, nic_attr.read_only,
-                   possible_values)
+                   attrs['PossibleValues'])
 
     def validate(self, new_value):
         """Validates new value"""
@@ -155,6 +145,8 @@ class NICStringAttribute(NICAttribute):
     """String NIC attribute class"""
 
     namespace = uris.DCIM_NICString
+    _attr_names = NICAttribute._attr_names + ('MinLength', 'MaxLength',
+                                              'ValueExpression')
 
     def __init__(self, fqdd, name, current_value, pending_value, read_only,
                  min_length, max_length, pcre_regex):
@@ -180,17 +172,14 @@ class NICStringAttribute(NICAttribute):
     def parse(cls, nic_attr_xml):
         """Parses XML and creates NICStringAttribute object"""
 
-        nic_attr = NICAttribute.parse(cls.namespace, nic_attr_xml)
-        min_length = int(utils.get_wsman_resource_attr(
-            nic_attr_xml, cls.namespace, 'MinLength'))
-        max_length = int(utils.get_wsman_resource_attr(
-            nic_attr_xml, cls.namespace, 'MaxLength'))
-        pcre_regex = utils.get_wsman_resource_attr(
-            nic_attr_xml, cls.namespace, 'ValueExpression', nullable=True)
+        attrs = utils.decode_item(nic_attr_xml, cls.namespace,
+                                  cls._attr_names)
+        nic_attr = NICAttribute._from_attrs(attrs)
 
         return cls(nic_attr.fqdd, nic_attr.name, nic_attr.current_value,
                    nic_attr.pending_value, nic_attr.read_only,
-                   min_length, max_length, pcre_regex)
+                   int(attrs['MinLength']), int(attrs['MaxLength']),
+                   attrs['ValueExpression'])
 
     def validate(self, new_value):
         """Validates new value"""
@@ -210,6 +199,7 @@ class NICIntegerAttribute(NICAttribute):
     """Integer NIC attribute class"""
 
     namespace = uris.DCIM_NICInteger
+    _attr_names = NICAttribute._attr_names + ('LowerBound', 'UpperBound')
 
     def __init__(self, fqdd, name, current_value, pending_value, read_only,
                  lower_bound, upper_bound):
@@ -232,11 +222,9 @@ class NICIntegerAttribute(NICAttribute):
     def parse(cls, nic_attr_xml):
         """Parses XML and creates NICIntegerAttribute object"""
 
-        nic_attr = NICAttribute.parse(cls.namespace, nic_attr_xml)
-        lower_bound = utils.get_wsman_resource_attr(
-            nic_attr_xml, cls.namespace, 'LowerBound')
-        upper_bound = utils.get_wsman_resource_attr(
-            nic_attr_xml, cls.namespace, 'UpperBound')
+        attrs = utils.decode_item(nic_attr_xml, cls.namespace,
+                                  cls._attr_names)
+        nic_attr = NICAttribute._from_attrs(attrs)
 
         if nic_attr.current_value:
             nic_attr.current_value = int(nic_attr.current_value)
@@ -245,7 +233,7 @@ class NICIntegerAttribute(NICAttribute):
 
         return cls(nic_attr.fqdd, nic_attr.name, nic_attr.current_value,
                    nic_attr.pending_value, nic_attr.read_only,
-                   int(lower_bound), int(upper_bound))
+                   int(attrs['LowerBound']), int(attrs['UpperBound']))
 
     def validate(self, new_value):
         """Validates new value"""
@@ -331,7 +319,6 @@ class NICConfiguration(object):
         :raises: InvalidParameterValue on invalid NIC attribute
         """
         self.interface = interface
-        print interface
         current_settings = self.list_nic_settings(self.interface)
         unknown_keys = set(new_settings) - set(current_settings)
         if unknown_keys:
@@ -344,7 +331,6 @@ class NICConfiguration(object):
         invalid_attribs_msgs = []
         attrib_names = []
         candidates = set(new_settings)
-        print candidates
         for attr in candidates:
             if str(new_settings[attr]) == str(
                     current_settings[attr].current_value):
@@ -385,7 +371,6 @@ class NICConfiguration(object):
                       'AttributeName': attrib_names,
                       'AttributeValue': [new_settings[attr] for attr
                                          in attrib_names]}
-        print properties
         doc = self.client.invoke(uris.DCIM_NICService, 'SetAttributes',
                                  selectors, properties)
 
@@ -13,7 +13,8 @@
 
 import collections
 
-from wsmanclient import exceptions, utils
+from wsmanclient import exceptions, schema, utils
+from wsmanclient.model import PhysicalDisk, RAIDController, VirtualDisk
 from wsmanclient.dracclient.resources import uris
 
 RAID_LEVELS = {
@@ -70,6 +71,56 @@ PHYSICAL_DISK_BUS_PROTOCOL = {
     '6': 'sas'
 }
 
+
+def _get_controller(fqdd):
+    return fqdd.split(':')[-1]
+
+
+RAID_CONTROLLER_VIEW = schema.View(
+    'RAIDController', uris.DCIM_ControllerView, [
+        schema.Field('id', 'FQDD'),
+        schema.Field('description', 'DeviceDescription'),
+        schema.Field('manufacturer', 'DeviceCardManufacturer'),
+        schema.Field('model', 'ProductName'),
+        schema.Field('firmware_version', 'ControllerFirmwareVersion')],
+    model=RAIDController)
+
+VIRTUAL_DISK_VIEW = schema.View('VirtualDisk', uris.DCIM_VirtualDiskView, [
+    schema.Field('id', 'FQDD'),
+    schema.Field('name', 'Name'),
+    schema.Field('description', 'DeviceDescription'),
+    schema.Field('controller', 'FQDD', type=_get_controller),
+    schema.Field('raid_level', 'RAIDTypes', values=REVERSE_RAID_LEVELS),
+    schema.Field('size_mb', 'SizeInBytes', type=schema.megabytes),
+    schema.Field('state', 'PrimaryStatus', values=DISK_STATUS),
+    schema.Field('raid_state', 'RAIDStatus', values=DISK_RAID_STATUS),
+    schema.Field('span_depth', 'SpanDepth', type=int),
+    schema.Field('span_length', 'SpanLength', type=int),
+    schema.Field('pending_operations', 'PendingOperations',
+                 values=VIRTUAL_DISK_PENDING_OPERATIONS)],
+    model=VirtualDisk)
+
+PHYSICAL_DISK_VIEW = schema.View(
+    'PhysicalDisk', uris.DCIM_PhysicalDiskView, [
+        schema.Field('id', 'FQDD'),
+        schema.Field('description', 'DeviceDescription'),
+        schema.Field('controller', 'FQDD', type=_get_controller),
+        schema.Field('manufacturer', 'Manufacturer'),
+        schema.Field('model', 'Model'),
+        schema.Field('media_type', 'MediaType',
+                     values=PHYSICAL_DISK_MEDIA_TYPE),
+        schema.Field('interface_type', 'BusProtocol',
+                     values=PHYSICAL_DISK_BUS_PROTOCOL),
+        schema.Field('size_mb', 'SizeInBytes', type=schema.megabytes),
+        schema.Field('free_size_mb', 'FreeSizeInBytes',
+                     type=schema.megabytes),
+        schema.Field('serial_number', 'SerialNumber'),
+        schema.Field('firmware_version', 'Revision'),
+        schema.Field('state', 'PrimaryStatus', values=DISK_STATUS),
+        schema.Field('raid_state', 'RaidStatus', values=DISK_RAID_STATUS)],
+    model=PhysicalDisk)
+
+
 class RAIDManagement(object):
 
     def __init__(self, client):
@@ -79,9 +130,17 @@ class RAIDManagement(object):
         """
         self.client = client
 
-    def list_raid_controllers(self):
+    def list_raid_controllers(self, fields=None, where=None):
         """Returns the list of RAID controllers
 
+        :param fields: names of the fields of the RAIDController objects
+                       needed, eg. ['model']. Only their properties are
+                       requested, the other fields being None. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching RAIDController objects are
+                      returned.
         :returns: a list of RAIDController objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -89,34 +148,24 @@ class RAIDManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_ControllerView)
+        view = RAID_CONTROLLER_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         drac_raid_controllers = utils.find_xml(doc, 'DCIM_ControllerView',
                                                uris.DCIM_ControllerView,
                                                find_all=True)
 
-        return [self._parse_drac_raid_controller(controller)
-                for controller in drac_raid_controllers]
-
-    def _parse_drac_raid_controller(self, drac_controller):
-        return RAIDController(
-            id=self._get_raid_controller_attr(drac_controller, 'FQDD'),
-            description=self._get_raid_controller_attr(
-                drac_controller, 'DeviceDescription'),
-            manufacturer=self._get_raid_controller_attr(
-                drac_controller, 'DeviceCardManufacturer'),
-            model=self._get_raid_controller_attr(
-                drac_controller, 'ProductName'),
-            firmware_version=self._get_raid_controller_attr(
-                drac_controller, 'ControllerFirmwareVersion'))
-
-    def _get_raid_controller_attr(self, drac_controller, attr_name):
-        return utils.get_wsman_resource_attr(
-            drac_controller, uris.DCIM_ControllerView, attr_name)
-
-    def list_virtual_disks(self):
+        return [view.parse(controller) for controller in drac_raid_controllers]
+
+    def list_virtual_disks(self, fields=None, where=None):
         """Returns the list of virtual disks
 
+        :param fields: names of the fields of the VirtualDisk objects needed,
+                       eg. ['raid_state']. Only their properties are requested,
+                       the other fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching VirtualDisk objects are returned.
         :returns: a list of VirtualDisk objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -124,48 +173,25 @@ class RAIDManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_VirtualDiskView)
+        view = VIRTUAL_DISK_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         drac_virtual_disks = utils.find_xml(doc, 'DCIM_VirtualDiskView',
                                             uris.DCIM_VirtualDiskView,
                                             find_all=True)
 
-        return [self._parse_drac_virtual_disk(disk)
-                for disk in drac_virtual_disks]
-
-    def _parse_drac_virtual_disk(self, drac_disk):
-        fqdd = self._get_virtual_disk_attr(drac_disk, 'FQDD')
-        drac_raid_level = self._get_virtual_disk_attr(drac_disk, 'RAIDTypes')
-        size_b = self._get_virtual_disk_attr(drac_disk, 'SizeInBytes')
-        drac_status = self._get_virtual_disk_attr(drac_disk, 'PrimaryStatus')
-        drac_raid_status = self._get_virtual_disk_attr(drac_disk, 'RAIDStatus')
-        drac_pending_operations = self._get_virtual_disk_attr(
-            drac_disk, 'PendingOperations')
-
-        return VirtualDisk(
-            id=fqdd,
-            name=self._get_virtual_disk_attr(drac_disk, 'Name'),
-            description=self._get_virtual_disk_attr(drac_disk,
-                                                    'DeviceDescription'),
-            controller=fqdd.split(':')[1],
-            raid_level=REVERSE_RAID_LEVELS[drac_raid_level],
-            size_mb=int(size_b) / 2 ** 20,
-            state=DISK_STATUS[drac_status],
-            raid_state=DISK_RAID_STATUS[drac_raid_status],
-            span_depth=int(self._get_virtual_disk_attr(drac_disk,
-                                                       'SpanDepth')),
-            span_length=int(self._get_virtual_disk_attr(drac_disk,
-                                                        'SpanLength')),
-            pending_operations=(
-                VIRTUAL_DISK_PENDING_OPERATIONS[drac_pending_operations]))
-
-    def _get_virtual_disk_attr(self, drac_disk, attr_name):
-        return utils.get_wsman_resource_attr(
-            drac_disk, uris.DCIM_VirtualDiskView, attr_name)
-
-    def list_physical_disks(self):
+        return [view.parse(disk) for disk in drac_virtual_disks]
+
+    def list_physical_disks(self, fields=None, where=None):
         """Returns the list of physical disks
 
+        :param fields: names of the fields of the PhysicalDisk objects needed,
+                       eg. ['model', 'raid_state']. Only their properties are
+                       requested, the other fields being None. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('PrimaryStatus') !=
+                      '1'. Only the matching PhysicalDisk objects are returned.
         :returns: a list of PhysicalDisk objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -173,49 +199,14 @@ class RAIDManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.DCIM_PhysicalDiskView)
+        view = PHYSICAL_DISK_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         drac_physical_disks = utils.find_xml(doc, 'DCIM_PhysicalDiskView',
                                              uris.DCIM_PhysicalDiskView,
                                              find_all=True)
 
-        return [self._parse_drac_physical_disk(disk)
-                for disk in drac_physical_disks]
-
-    def _parse_drac_physical_disk(self, drac_disk):
-        fqdd = self._get_physical_disk_attr(drac_disk, 'FQDD')
-        size_b = self._get_physical_disk_attr(drac_disk, 'SizeInBytes')
-        free_size_b = self._get_physical_disk_attr(drac_disk,
-                                                   'FreeSizeInBytes')
-        drac_status = self._get_physical_disk_attr(drac_disk, 'PrimaryStatus')
-        drac_raid_status = self._get_physical_disk_attr(drac_disk,
-                                                        'RaidStatus')
-        drac_media_type = self._get_physical_disk_attr(drac_disk, 'MediaType')
-        drac_bus_protocol = self._get_physical_disk_attr(drac_disk,
-                                                         'BusProtocol')
-
-        return PhysicalDisk(
-            id=fqdd,
-            description=self._get_physical_disk_attr(drac_disk,
-                                                     'DeviceDescription'),
-            controller=fqdd.split(':')[2],
-            manufacturer=self._get_physical_disk_attr(drac_disk,
-                                                      'Manufacturer'),
-            model=self._get_physical_disk_attr(drac_disk, 'Model'),
-            media_type=PHYSICAL_DISK_MEDIA_TYPE[drac_media_type],
-            interface_type=PHYSICAL_DISK_BUS_PROTOCOL[drac_bus_protocol],
-            size_mb=int(size_b) / 2 ** 20,
-            free_size_mb=int(free_size_b) / 2 ** 20,
-            serial_number=self._get_physical_disk_attr(drac_disk,
-                                                       'SerialNumber'),
-            firmware_version=self._get_physical_disk_attr(drac_disk,
-                                                          'Revision'),
-            state=DISK_STATUS[drac_status],
-            raid_state=DISK_RAID_STATUS[drac_raid_status])
-
-    def _get_physical_disk_attr(self, drac_disk, attr_name):
-        return utils.get_wsman_resource_attr(
-            drac_disk, uris.DCIM_PhysicalDiskView, attr_name)
+        return [view.parse(disk) for disk in drac_physical_disks]
 
     def convert_physical_disks(self, physical_disks, raid_enable):
         """Converts a list of physical disks into or out of RAID mode.
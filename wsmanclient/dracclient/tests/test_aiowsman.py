@@ -0,0 +1,227 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+import lxml.etree
+import mock
+from wsmanclient import exceptions
+from wsmanclient.dracclient.resources import uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+
+try:
+    import asyncio
+
+    import aiohttp
+    from wsmanclient import aiowsman
+    from wsmanclient.dracclient import aioclient
+except (ImportError, SyntaxError):
+    aiowsman = None
+
+
+def _response(body, status=200, reason='OK'):
+    # AsyncClient._post is patched with a plain Mock, so return an awaitable
+    future = asyncio.Future()
+    future.set_result((status, reason, body.encode('utf-8')))
+    return future
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+@unittest.skipIf(aiowsman is None, 'requires Python 3 and aiohttp')
+class AsyncClientTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(AsyncClientTestCase, self).setUp()
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        self.addCleanup(asyncio.get_event_loop().close)
+        self.client = aiowsman.AsyncClient(**test_utils.FAKE_ENDPOINT)
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_enumerate(self, mock_post):
+        mock_post.return_value = _response('<result>yay!</result>')
+
+        resp = _run(self.client.enumerate('resource', auto_pull=False))
+        self.assertEqual('yay!', resp.text)
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_enumerate_with_auto_pull(self, mock_post):
+        mock_post.side_effect = [
+            _response(test_utils.WSManEnumerations['context'][0]),
+            _response(test_utils.WSManEnumerations['context'][1]),
+            _response(test_utils.WSManEnumerations['context'][2]),
+            _response(test_utils.WSManEnumerations['context'][3])]
+
+        resp_xml = _run(self.client.enumerate('FooResource'))
+
+        foo_resource_uri = 'http://FooResource'
+        bar_resource_uri = 'http://BarResource'
+        self.assertEqual(
+            3, len(resp_xml.findall('.//{%s}FooResource' % foo_resource_uri)))
+        self.assertEqual(
+            1, len(resp_xml.findall('.//{%s}BazResource' % bar_resource_uri)))
+        self.assertEqual(
+            0, len(resp_xml.findall(
+                './/{%s}EnumerationContext' % aiowsman.wsman.NS_WSMAN_ENUM)))
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_iter_enumerate(self, mock_post):
+        mock_post.side_effect = [
+            _response(test_utils.WSManEnumerations['context'][0]),
+            _response(test_utils.WSManEnumerations['context'][1]),
+            _response(test_utils.WSManEnumerations['context'][2]),
+            _response(test_utils.WSManEnumerations['context'][3])]
+
+        agen = self.client.iter_enumerate('FooResource')
+        items = []
+        while True:
+            try:
+                items.append(_run(agen.__anext__()))
+            except StopAsyncIteration:
+                break
+
+        self.assertEqual(['1', '2', '3', '4'],
+                         [item[0].text for item in items])
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_invoke(self, mock_post):
+        mock_post.return_value = _response('<result>yay!</result>')
+
+        resp = _run(self.client.invoke('http://resource', 'method',
+                                       {'selector': 'foo'}, {}))
+        self.assertEqual('yay!', resp.text)
+        payload = lxml.etree.fromstring(mock_post.call_args[0][0])
+        self.assertEqual(
+            'http://resource/method',
+            payload.find('.//{%s}Action' % aiowsman.wsman.NS_WS_ADDR).text)
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_request_failure(self, mock_post):
+        mock_post.side_effect = aiohttp.ClientError()
+
+        self.assertRaises(exceptions.WSManRequestFailure, _run,
+                          self.client.enumerate('resource'))
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_request_timeout(self, mock_post):
+        mock_post.side_effect = asyncio.TimeoutError()
+
+        self.assertRaises(exceptions.WSManRequestFailure, _run,
+                          self.client.invoke('http://resource', 'method',
+                                             {}, {}))
+
+    def test_post_with_timeouts(self):
+        self.client = aiowsman.AsyncClient(connect_timeout=5, read_timeout=60,
+                                           **test_utils.FAKE_ENDPOINT)
+        session = mock.Mock()
+        session.post.side_effect = aiohttp.ClientError()
+
+        with mock.patch.object(self.client, '_get_session',
+                               return_value=session):
+            self.assertRaises(aiohttp.ClientError, _run,
+                              self.client._post(b'<payload/>'))
+
+        timeout = session.post.call_args[1]['timeout']
+        self.assertEqual(5, timeout.sock_connect)
+        self.assertEqual(60, timeout.sock_read)
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_invalid_response(self, mock_post):
+        mock_post.return_value = _response('', status=500,
+                                           reason='Server Error')
+
+        self.assertRaises(exceptions.WSManInvalidResponse, _run,
+                          self.client.enumerate('resource'))
+
+
+@unittest.skipIf(aiowsman is None, 'requires Python 3 and aiohttp')
+class AsyncDRACClientTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(AsyncDRACClientTestCase, self).setUp()
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        self.addCleanup(asyncio.get_event_loop().close)
+        self.drac_client = aioclient.AsyncDRACClient(
+            **test_utils.FAKE_ENDPOINT)
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_get_power_state(self, mock_post):
+        mock_post.return_value = _response(
+            test_utils.BIOSEnumerations[uris.DCIM_ComputerSystem]['ok'])
+
+        self.assertEqual('POWER_ON',
+                         _run(self.drac_client.get_power_state()))
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_set_power_state_fail(self, mock_post):
+        mock_post.return_value = _response(
+            test_utils.BIOSInvocations[
+                uris.DCIM_ComputerSystem]['RequestStateChange']['error'])
+
+        self.assertRaises(exceptions.DRACOperationFailed, _run,
+                          self.drac_client.set_power_state('POWER_ON'))
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_list_boot_devices_11g(self, mock_post):
+        system_view_11g = test_utils.LifecycleControllerEnumerations[
+            uris.DCIM_SystemView]['ok'].replace('>2.1.0<', '>1.0.0<')
+        mock_post.side_effect = [
+            _response(test_utils.BIOSEnumerations[
+                uris.DCIM_BootSourceSetting]['ok-11g']),
+            _response(system_view_11g)]
+
+        boot_devices = _run(self.drac_client.list_boot_devices())
+
+        # one request per response, despite the replayed parsing
+        self.assertEqual(2, mock_post.call_count)
+        self.assertEqual(3, len(boot_devices))
+        self.assertEqual(3, len(boot_devices['IPL']))
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_request_failure(self, mock_post):
+        mock_post.side_effect = aiohttp.ClientError()
+
+        self.assertRaises(exceptions.WSManRequestFailure, _run,
+                          self.drac_client.list_boot_modes())
+
+    @mock.patch('wsmanclient.aiowsman.AsyncClient._post',
+                new_callable=mock.Mock)
+    def test_list_cpus_projection_rejected(self, mock_post):
+        cpus = test_utils.CPUEnumerations[uris.DCIM_CPUView]['ok']
+        mock_post.side_effect = [_response('', status=400,
+                                           reason='Bad Request'),
+                                 _response(cpus), _response(cpus)]
+
+        self.assertEqual(
+            ['CPU.Socket.1'],
+            [cpu.id for cpu in _run(self.drac_client.list_cpus(['status']))])
+        self.assertEqual(2, mock_post.call_count)
+        self.assertEqual(set([uris.DCIM_CPUView]),
+                         self.drac_client.client.unsupported_projections)
+
+        _run(self.drac_client.list_cpus(['status']))
+        self.assertEqual(3, mock_post.call_count)
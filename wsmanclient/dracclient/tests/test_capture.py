@@ -0,0 +1,131 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+import lxml.etree
+import mock
+import requests_mock
+from wsmanclient import capture, exceptions, retry, wsman
+from wsmanclient.dracclient import client
+from wsmanclient.dracclient.resources import uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+
+
+class CaptureTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(CaptureTestCase, self).setUp()
+        circuit_breakers = mock.patch.dict(retry._circuit_breakers,
+                                           clear=True)
+        circuit_breakers.start()
+        self.addCleanup(circuit_breakers.stop)
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.path = os.path.join(tmpdir, 'bmcs.capture')
+
+    def _record(self, responses, func):
+        with requests_mock.Mocker() as mock_requests:
+            mock_requests.post('https://1.2.3.4:443/wsman', responses)
+            with capture.Recorder(self.path) as recorder:
+                wsman_client = wsman.Client(transport=recorder,
+                                            **test_utils.FAKE_ENDPOINT)
+                return func(wsman_client)
+
+    def _replay(self, func):
+        # no responses are mocked, so any request reaching the network fails
+        with requests_mock.Mocker():
+            with capture.Replayer(self.path) as replayer:
+                wsman_client = wsman.Client(transport=replayer,
+                                            **test_utils.FAKE_ENDPOINT)
+                return func(wsman_client)
+
+    def test_replay_enumerate(self):
+        def enumerate_(wsman_client):
+            return lxml.etree.tostring(wsman_client.enumerate('FooResource'))
+
+        recorded = self._record(
+            [{'text': test_utils.WSManEnumerations['context'][page]}
+             for page in range(4)], enumerate_)
+
+        self.assertEqual(recorded, self._replay(enumerate_))
+        with capture.Replayer(self.path) as replayer:
+            self.assertEqual(4, len(replayer))
+
+    def test_replay_client(self):
+        def get_power_state(wsman_client):
+            drac_client = client.DRACClient(transport=wsman_client.transport,
+                                            **test_utils.FAKE_ENDPOINT)
+            return drac_client.get_power_state()
+
+        self._record(
+            [{'text': test_utils.BIOSEnumerations[
+                uris.DCIM_ComputerSystem]['ok']}], get_power_state)
+
+        self.assertEqual('POWER_ON', self._replay(get_power_state))
+
+    def test_replay_repeated_requests(self):
+        def invoke(wsman_client):
+            return [wsman_client.invoke('http://resource', 'method',
+                                        {'selector': 'foo'}, {}).text
+                    for _ in range(3)]
+
+        self._record([{'text': '<result>first</result>'},
+                      {'text': '<result>second</result>'}], invoke)
+
+        # the last response recorded is repeated once they run out
+        self.assertEqual(['first', 'second', 'second'], self._replay(invoke))
+
+    def test_replay_failure(self):
+        def enumerate_(wsman_client):
+            self.assertRaises(exceptions.WSManInvalidResponse,
+                              wsman_client.enumerate, 'resource',
+                              auto_pull=False)
+
+        self._record([{'status_code': 500}], enumerate_)
+
+        self._replay(enumerate_)
+
+    def test_replay_missing_request(self):
+        def invoke(selector):
+            return lambda wsman_client: wsman_client.invoke(
+                'http://resource', 'method', {'selector': selector}, {})
+
+        self._record([{'text': '<result>yay!</result>'}], invoke('foo'))
+
+        self.assertRaises(exceptions.WSManCaptureMiss, self._replay,
+                          invoke('bar'))
+
+    def test_invalid_capture(self):
+        with open(self.path, 'wb') as capture_file:
+            capture_file.write(b'<result>not a capture</result>')
+
+        self.assertRaises(ValueError, capture.Replayer, self.path)
+
+    def test_replay_unclosed_capture(self):
+        recorder = capture.Recorder(self.path)
+        self.addCleanup(recorder.close)
+        recorder.add('first', 200, 'OK', b'<result>first</result>')
+        recorder.add('second', 200, 'OK', b'<result>second</result>')
+
+        # the recording crashed while writing the second record
+        with open(self.path, 'rb') as capture_file:
+            content = capture_file.read()
+        with open(self.path, 'wb') as capture_file:
+            capture_file.write(content[:-5])
+
+        with capture.Replayer(self.path) as replayer:
+            self.assertEqual(1, len(replayer))
@@ -454,44 +454,87 @@ class ClientJobManagementTestCase(base.BaseTest):
             mock.ANY, uris.DCIM_LifecycleJob,
             filter_query=expected_filter_query)
 
+    @mock.patch.object(wsmanclient.client.WSManClient, 'get',
+                       spec_set=True, autospec=True)
+    def test_get_job(self, mock_get):
+        expected_job = wsmanclient.resources.job.Job(
+            id='JID_001436912645', name='ConfigBIOS:BIOS.Setup.1-1',
+            start_time='00000101000000', until_time='TIME_NA',
+            message='Job completed successfully', state='Completed',
+            percent_complete='100')
+        mock_get.return_value = lxml.etree.fromstring(
+            test_utils.JobGets[uris.DCIM_LifecycleJob]['ok'])
+
+        job = self.drac_client.get_job('JID_001436912645')
+
+        mock_get.assert_called_once_with(
+            mock.ANY, uris.DCIM_LifecycleJob,
+            {'InstanceID': 'JID_001436912645'})
+        self.assertEqual(expected_job, job)
+
     @mock.patch.object(wsmanclient.client.WSManClient, 'enumerate',
                        spec_set=True, autospec=True)
-    def test_get_job(self, mock_enumerate):
+    @mock.patch.object(wsmanclient.client.WSManClient, 'get',
+                       spec_set=True, autospec=True)
+    def test_get_job_not_found(self, mock_get, mock_enumerate):
         expected_filter_query = ('select * from DCIM_LifecycleJob'
-                                 ' where InstanceID="42"')
-        # NOTE: This is the first job in the xml. Filtering the job is the
-        #       responsibility of the controller, so not testing it.
-        expected_job = wsmanclient.resources.job.Job(id='JID_CLEARALL',
-                                                    name='CLEARALL',
-                                                    start_time='TIME_NA',
-                                                    until_time='TIME_NA',
-                                                    message='NA',
-                                                    state='Pending',
-                                                    percent_complete='0')
+                                 ' where InstanceID = "42"')
+        mock_get.side_effect = exceptions.WSManInvalidResponse(
+            400, 'Bad Request')
         mock_enumerate.return_value = lxml.etree.fromstring(
-            test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['ok'])
+            test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['not_found'])
 
         job = self.drac_client.get_job(42)
 
         mock_enumerate.assert_called_once_with(
             mock.ANY, uris.DCIM_LifecycleJob,
             filter_query=expected_filter_query)
-        self.assertEqual(expected_job, job)
+        self.assertIsNone(job)
+        # a missing job doesn't tell that Get isn't supported
+        self.assertEqual(set(), self.drac_client.client.unsupported_gets)
 
     @mock.patch.object(wsmanclient.client.WSManClient, 'enumerate',
                        spec_set=True, autospec=True)
-    def test_get_job_not_found(self, mock_enumerate):
-        expected_filter_query = ('select * from DCIM_LifecycleJob'
-                                 ' where InstanceID="42"')
+    @mock.patch.object(wsmanclient.client.WSManClient, 'get',
+                       spec_set=True, autospec=True)
+    def test_get_job_get_unsupported(self, mock_get, mock_enumerate):
+        mock_get.side_effect = exceptions.WSManInvalidResponse(
+            400, 'Bad Request')
+        # NOTE: This is the first job in the xml. Filtering the job is the
+        #       responsibility of the controller, so not testing it.
+        mock_enumerate.return_value = lxml.etree.fromstring(
+            test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['ok'])
+
+        job = self.drac_client.get_job('JID_CLEARALL')
+
+        self.assertEqual('CLEARALL', job.name)
+        self.assertEqual(set([uris.DCIM_LifecycleJob]),
+                         self.drac_client.client.unsupported_gets)
+
+        # the Get isn't attempted again
+        self.drac_client.get_job('JID_CLEARALL')
+        self.assertEqual(1, mock_get.call_count)
+        self.assertEqual(2, mock_enumerate.call_count)
+
+    @mock.patch.object(wsmanclient.client.WSManClient, 'enumerate',
+                       spec_set=True, autospec=True)
+    @mock.patch.object(wsmanclient.client.WSManClient, 'get',
+                       spec_set=True, autospec=True)
+    def test_get_job_not_found_get_unsupported(self, mock_get,
+                                               mock_enumerate):
+        mock_get.side_effect = exceptions.WSManInvalidResponse(
+            400, 'Bad Request', fault_subcode='ActionNotSupported')
         mock_enumerate.return_value = lxml.etree.fromstring(
             test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['not_found'])
 
-        job = self.drac_client.get_job(42)
+        self.assertIsNone(self.drac_client.get_job(42))
+        # the fault tells that Get isn't supported, even without the job
+        self.assertEqual(set([uris.DCIM_LifecycleJob]),
+                         self.drac_client.client.unsupported_gets)
 
-        mock_enumerate.assert_called_once_with(
-            mock.ANY, uris.DCIM_LifecycleJob,
-            filter_query=expected_filter_query)
-        self.assertIsNone(job)
+        self.assertIsNone(self.drac_client.get_job(42))
+        self.assertEqual(1, mock_get.call_count)
+        self.assertEqual(2, mock_enumerate.call_count)
 
     @mock.patch.object(wsmanclient.client.WSManClient, 'invoke',
                        spec_set=True, autospec=True)
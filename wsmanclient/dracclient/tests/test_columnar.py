@@ -0,0 +1,126 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import lxml.etree
+import mock
+from wsmanclient import columnar, fleet, model
+from wsmanclient.dracclient.resources import raid, uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+
+
+def _disk(index, model_name, raid_state, size_mb=571776):
+    return model.PhysicalDisk(
+        id='Disk.Bay.%d:Enclosure.Internal.0-1:RAID.Integrated.1-1' % index,
+        controller='RAID.Integrated.1-1', model=model_name,
+        size_mb=size_mb, state='ok', raid_state=raid_state)
+
+
+class TableTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(TableTestCase, self).setUp()
+        self.table = columnar.Table.from_fleet([
+            fleet.FleetResult('1.2.3.4', [_disk(0, 'ST600MM0006', 'online'),
+                                          _disk(1, 'ST600MM0006', 'degraded'),
+                                          _disk(2, 'PX04SHB040', 'ready',
+                                                size_mb=381029)], None),
+            fleet.FleetResult('1.2.3.5', None, Exception('failed')),
+            fleet.FleetResult('1.2.3.6', [_disk(0, 'PX04SHB040', 'degraded',
+                                                size_mb=381029)], None)])
+
+    def test_from_fleet(self):
+        self.assertEqual(4, len(self.table))
+        self.assertEqual(list(model.PhysicalDisk._fields) + ['host'],
+                         self.table.names)
+        self.assertEqual(['1.2.3.4', '1.2.3.4', '1.2.3.4', '1.2.3.6'],
+                         self.table['host'].tolist())
+
+    def test_columns(self):
+        self.assertIsInstance(self.table['size_mb'], columnar.NumberColumn)
+        self.assertEqual(381029, self.table['size_mb'][2])
+        self.assertIsInstance(self.table['model'], columnar.Column)
+        self.assertEqual(['ST600MM0006', 'PX04SHB040'],
+                         self.table['model'].values)
+        self.assertEqual([None], self.table['description'].values)
+
+    def test_where(self):
+        degraded = self.table.where(raid_state='degraded')
+
+        self.assertEqual(['1.2.3.4', '1.2.3.6'], degraded['host'].tolist())
+        self.assertEqual(
+            1, len(self.table.where(raid_state=('degraded', 'ready'),
+                                    host='1.2.3.6')))
+        self.assertEqual(
+            2, len(self.table.where(size_mb=lambda size: size < 500000)))
+        self.assertEqual(0, len(self.table.where(model='foo')))
+
+    def test_filter(self):
+        mask = [size > 500000 for size in self.table['size_mb'].tolist()]
+
+        self.assertEqual(['online', 'degraded'],
+                         self.table.filter(mask)['raid_state'].tolist())
+
+    def test_group_by(self):
+        self.assertEqual(
+            {'ST600MM0006': 1, 'PX04SHB040': 1},
+            self.table.where(raid_state='degraded').group_by('model').count())
+        self.assertEqual({'1.2.3.4': 571776 * 2 + 381029, '1.2.3.6': 381029},
+                         self.table.group_by('host').sum('size_mb'))
+        self.assertEqual({571776: 2, 381029: 2},
+                         self.table.group_by('size_mb').count())
+
+        groups = dict(self.table.group_by('host'))
+        self.assertEqual(3, len(groups['1.2.3.4']))
+
+    def test_rows(self):
+        rows = list(self.table.rows())
+
+        self.assertEqual('degraded', rows[1]['raid_state'])
+        self.assertEqual(_disk(0, 'PX04SHB040', 'degraded', size_mb=381029),
+                         model.PhysicalDisk(**dict(
+                             (name, value) for name, value in rows[3].items()
+                             if name != 'host')))
+
+    def test_from_view(self):
+        doc = lxml.etree.fromstring(
+            test_utils.RAIDEnumerations[uris.DCIM_VirtualDiskView]['ok'])
+
+        table = columnar.Table.from_view(raid.VIRTUAL_DISK_VIEW, [doc, doc])
+
+        self.assertEqual(raid.VIRTUAL_DISK_VIEW.parse_all(doc) * 2,
+                         list(table.rows(model.VirtualDisk)))
+
+    def test_from_records(self):
+        table = columnar.Table.from_records(
+            [{'id': 'a', 'enabled': True}, {'id': 'b', 'enabled': 1}])
+
+        # booleans are told apart from numbers
+        self.assertEqual([True, 1], table['enabled'].tolist())
+        self.assertIsInstance(table['enabled'], columnar.Column)
+
+    def test_empty(self):
+        table = columnar.Table.from_records([])
+
+        self.assertEqual(0, len(table))
+        self.assertEqual([], table.names)
+
+
+class ArrayTableTestCase(TableTestCase):
+    """Runs the tests with the array module even if NumPy is installed"""
+
+    def setUp(self):
+        patcher = mock.patch.object(columnar, 'numpy', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super(ArrayTableTestCase, self).setUp()
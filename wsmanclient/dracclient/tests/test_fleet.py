@@ -0,0 +1,113 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+import mock
+import requests_mock
+from wsmanclient import exceptions, fleet
+from wsmanclient.dracclient.resources import uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+
+
+@requests_mock.Mocker()
+class FleetTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(FleetTestCase, self).setUp()
+        self.fleet = fleet.Fleet(['1.2.3.4', {'host': '1.2.3.5',
+                                              'password': 'other'}],
+                                 username='admin', password='s3cr3t')
+        self.addCleanup(self.fleet.close)
+
+    def test_map(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text=test_utils.BIOSEnumerations[uris.DCIM_ComputerSystem]['ok'])
+        mock_requests.post('https://1.2.3.5:443/wsman', status_code=500)
+
+        results = dict((result.host, result)
+                       for result in self.fleet.map('get_power_state'))
+
+        self.assertEqual(['1.2.3.4', '1.2.3.5'], sorted(results))
+        self.assertEqual('POWER_ON', results['1.2.3.4'].result)
+        self.assertIsNone(results['1.2.3.4'].error)
+        self.assertIsNone(results['1.2.3.5'].result)
+        self.assertIsInstance(results['1.2.3.5'].error,
+                              exceptions.WSManInvalidResponse)
+
+    def test_client_args(self, mock_requests):
+        self.assertEqual('s3cr3t',
+                         self.fleet.get_client('1.2.3.4').client.password)
+        self.assertEqual('other',
+                         self.fleet.get_client('1.2.3.5').client.password)
+        self.assertIs(self.fleet.get_client('1.2.3.4'),
+                      self.fleet.get_client('1.2.3.4'))
+
+
+class FleetConcurrencyTestCase(base.BaseTest):
+
+    def test_per_host_limit(self):
+        lock = threading.Lock()
+        in_flight = {'current': 0, 'max': 0}
+
+        def get_power_state():
+            with lock:
+                in_flight['current'] += 1
+                in_flight['max'] = max(in_flight['max'],
+                                       in_flight['current'])
+            time.sleep(0.01)
+            with lock:
+                in_flight['current'] -= 1
+            return 'POWER_ON'
+
+        client_cls = mock.Mock()
+        client_cls.return_value.get_power_state.side_effect = get_power_state
+
+        with fleet.Fleet(['1.2.3.4'], client_cls=client_cls, max_workers=8,
+                         per_host_limit=2) as drac_fleet:
+            calls = [drac_fleet.submit('1.2.3.4', 'get_power_state')
+                     for _ in range(8)]
+            self.assertEqual(['POWER_ON'] * 8,
+                             [call.result() for call in calls])
+
+        self.assertEqual(2, in_flight['max'])
+        client_cls.assert_called_once_with(host='1.2.3.4', username=None,
+                                           password=None, pool_maxsize=2)
+
+    def test_busy_host_does_not_hold_workers(self):
+        released = threading.Event()
+
+        def get_power_state(host):
+            if host == '1.2.3.4':
+                released.wait(5)
+            return 'POWER_ON'
+
+        def create_client(host, **kwargs):
+            client = mock.Mock()
+            client.get_power_state.side_effect = lambda: get_power_state(host)
+            return client
+
+        with fleet.Fleet(['1.2.3.4', '1.2.3.5'], client_cls=create_client,
+                         max_workers=2, per_host_limit=1) as drac_fleet:
+            busy_calls = [drac_fleet.submit('1.2.3.4', 'get_power_state')
+                          for _ in range(3)]
+            call = drac_fleet.submit('1.2.3.5', 'get_power_state')
+
+            # the calls queued for the busy host don't take the other worker
+            self.assertEqual('POWER_ON', call.result(timeout=1))
+            released.set()
+            self.assertEqual(['POWER_ON'] * 3,
+                             [busy_call.result() for busy_call in busy_calls])
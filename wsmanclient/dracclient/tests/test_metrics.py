@@ -0,0 +1,200 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+import lxml.etree
+import mock
+import requests.exceptions
+import requests_mock
+from wsmanclient import exceptions, metrics, retry, wsman
+from wsmanclient.dracclient import client
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+
+try:
+    from wsmanclient.testing import server
+except (ImportError, SyntaxError):
+    server = None
+
+
+class HistogramTestCase(base.BaseTest):
+
+    def test_quantile(self):
+        histogram = metrics.Histogram(buckets=(1, 2, 4))
+        for value in [0.5] * 8 + [3, 10]:
+            histogram.observe(value)
+
+        self.assertEqual([8, 0, 1, 1], histogram.counts)
+        self.assertEqual(1.7, histogram.mean)
+        # interpolated within the bucket
+        self.assertEqual(0.625, histogram.quantile(0.5))
+        self.assertEqual(4, histogram.quantile(0.9))
+        self.assertEqual(10, histogram.quantile(1))
+
+    def test_quantile_without_values(self):
+        self.assertIsNone(metrics.Histogram().quantile(0.5))
+
+
+class MetricsCollectorTestCase(base.BaseTest):
+
+    def _event(self, host, resource_uri, duration, error=None):
+        event = metrics.RequestEvent(host, 'action', resource_uri, 100)
+        event.response_size = 1000
+        event.finish(error)
+        event.duration = duration
+        return event
+
+    def test_collect(self):
+        collector = metrics.MetricsCollector()
+        collector(self._event('bmc-1', 'FooResource', 0.1))
+        collector(self._event('bmc-1', 'BarResource', 2.0))
+        collector(self._event('bmc-2', 'FooResource', 0.2,
+                              exceptions.WSManRequestFailure()))
+
+        self.assertEqual(['bmc-1', 'bmc-2'],
+                         [host for (host, _) in collector.slowest_hosts()])
+        self.assertEqual(
+            ['BarResource'],
+            [uri for (uri, _) in collector.slowest_resources(limit=1)])
+
+        snapshot = collector.snapshot()
+        self.assertEqual({'success': 2, 'request_failure': 1},
+                         snapshot['outcomes'])
+        self.assertEqual(300, snapshot['request_bytes'])
+        self.assertEqual(3000, snapshot['response_bytes'])
+        self.assertEqual(2, snapshot['hosts']['bmc-1']['count'])
+
+        collector.reset()
+        self.assertEqual([], collector.slowest_hosts())
+
+
+@requests_mock.Mocker()
+class ClientHooksTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ClientHooksTestCase, self).setUp()
+        circuit_breakers = mock.patch.dict(retry._circuit_breakers,
+                                           clear=True)
+        circuit_breakers.start()
+        self.addCleanup(circuit_breakers.stop)
+        self.events = []
+
+    def _client(self, **kwargs):
+        return wsman.Client(hooks=[self.events.append],
+                            **dict(test_utils.FAKE_ENDPOINT, **kwargs))
+
+    def test_enumerate(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.WSManEnumerations['context'][page]}
+            for page in range(4)])
+
+        self._client().enumerate('FooResource', optimization=False)
+
+        self.assertEqual([1, 2, 3, 4],
+                         [event.page for event in self.events])
+        self.assertEqual(['Enumerate', 'Pull', 'Pull', 'Pull'],
+                         [event.operation for event in self.events])
+        for event in self.events:
+            self.assertEqual('1.2.3.4', event.host)
+            self.assertEqual('FooResource', event.resource_uri)
+            self.assertEqual(metrics.OUTCOME_SUCCESS, event.outcome)
+            self.assertEqual(200, event.status_code)
+            self.assertGreater(event.request_size, 0)
+            self.assertGreater(event.response_size, 0)
+            self.assertIn('server', event.timings)
+            self.assertIn('parse', event.timings)
+
+    def test_iter_enumerate(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.WSManEnumerations['context'][page]}
+            for page in range(4)])
+
+        list(self._client().iter_enumerate('FooResource',
+                                           optimization=False))
+
+        self.assertEqual([1, 2, 3, 4],
+                         [event.page for event in self.events])
+
+    def test_invoke(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+
+        self._client().invoke('http://resource', 'Method', {}, {})
+
+        self.assertEqual(1, len(self.events))
+        self.assertEqual('Method', self.events[0].operation)
+        self.assertIsNone(self.events[0].page)
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_retried_request(self, mock_requests, mock_sleep):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'exc': requests.exceptions.ConnectTimeout},
+            {'text': '<result>yay!</result>'}])
+
+        self._client().invoke('http://resource', 'Method', {}, {})
+
+        self.assertEqual([1, 2], [event.attempt for event in self.events])
+        self.assertEqual(
+            [metrics.OUTCOME_REQUEST_FAILURE, metrics.OUTCOME_SUCCESS],
+            [event.outcome for event in self.events])
+
+    def test_invalid_response(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', status_code=500)
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self._client(retry_policy=retry.NO_RETRY).invoke,
+                          'http://resource', 'Method', {}, {})
+        self.assertEqual(metrics.OUTCOME_INVALID_RESPONSE,
+                         self.events[0].outcome)
+        self.assertEqual(500, self.events[0].status_code)
+
+    def test_parse_error(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', text='<result>')
+
+        self.assertRaises(lxml.etree.XMLSyntaxError, self._client().invoke,
+                          'http://resource', 'Method', {}, {})
+        self.assertEqual(metrics.OUTCOME_PARSE_ERROR, self.events[0].outcome)
+
+    def test_failing_hook(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+        wsman_client = self._client()
+        wsman_client.hooks.insert(0, mock.Mock(side_effect=ValueError))
+
+        wsman_client.invoke('http://resource', 'Method', {}, {})
+
+        self.assertEqual(1, len(self.events))
+
+
+@unittest.skipIf(server is None, 'requires Python 3')
+class ConnectionTimingsTestCase(base.BaseTest):
+
+    def test_connection_timings(self):
+        fake = server.FakeWSManServer()
+        fake.start()
+        self.addCleanup(fake.stop)
+        collector = metrics.MetricsCollector()
+        events = []
+
+        drac_client = client.DRACClient(username='admin', password='s3cr3t',
+                                        hooks=[collector, events.append],
+                                        **fake.endpoint(0))
+        self.addCleanup(drac_client.close)
+        drac_client.get_power_state()
+        drac_client.get_power_state()
+
+        # the second request reuses the connection
+        self.assertIn('connect', events[0].timings)
+        self.assertNotIn('connect', events[1].timings)
+        self.assertEqual(2, collector.hosts['127.0.0.1'].count)
@@ -0,0 +1,55 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import pickle
+
+from wsmanclient import model
+from wsmanclient.dracclient.tests import base
+
+
+class ModelTestCase(base.BaseTest):
+
+    def test_defaults(self):
+        cpu = model.CPU(id='CPU.Socket.1', status='OK')
+
+        self.assertEqual('CPU.Socket.1', cpu.id)
+        self.assertEqual('OK', cpu.status)
+        self.assertIsNone(cpu.cores)
+        self.assertIsInstance(cpu, model.StatusedResource)
+
+    def test_immutable(self):
+        memory = model.Memory(id='DIMM.Socket.A1')
+
+        self.assertRaises(AttributeError, setattr, memory, 'id', 'foo')
+        self.assertRaises(AttributeError, setattr, memory, 'foo', 'bar')
+
+    def test_equality(self):
+        jobs = [model.Job(id='JID_1', state='Pending'),
+                model.Job(id='JID_1', state='Pending'),
+                model.Job(id='JID_2', state='Pending')]
+
+        self.assertEqual(jobs[0], jobs[1])
+        self.assertNotEqual(jobs[0], jobs[2])
+        self.assertEqual(2, len(set(jobs)))
+
+    def test_pickle(self):
+        disk = model.VirtualDisk(id='Disk.Virtual.0:RAID.Integrated.1-1',
+                                 size_mb=571776)
+
+        self.assertEqual(disk, pickle.loads(pickle.dumps(disk)))
+
+    def test_repr(self):
+        self.assertEqual(
+            "BootMode(id='IPL', name='BootSeq', is_current=True, "
+            "is_next=None)",
+            repr(model.BootMode(id='IPL', name='BootSeq', is_current=True)))
@@ -0,0 +1,57 @@
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from wsmanclient import paging
+from wsmanclient.dracclient.tests import base
+
+
+class PageSizerTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(PageSizerTestCase, self).setUp()
+        self.sizer = paging.PageSizer(initial=100, minimum=5, maximum=1000,
+                                      target_page_time=5.0,
+                                      max_page_size=1024 * 1024)
+
+    def test_grows_fast_pages(self):
+        self.sizer.record(100, 100, 0.5, 100 * 1024)
+
+        self.assertEqual(200, self.sizer.max_elems)
+
+    def test_growth_is_bounded(self):
+        for _ in range(10):
+            self.sizer.record(self.sizer.max_elems, self.sizer.max_elems,
+                              0.01, 10)
+
+        self.assertEqual(1000, self.sizer.max_elems)
+
+    def test_shrinks_slow_pages(self):
+        self.sizer.record(100, 100, 10.0, 100 * 1024)
+
+        self.assertEqual(50, self.sizer.max_elems)
+
+    def test_shrinks_large_pages(self):
+        self.sizer.record(100, 100, 0.5, 4 * 1024 * 1024)
+
+        self.assertEqual(25, self.sizer.max_elems)
+
+    def test_empty_page(self):
+        self.sizer.record(100, 0, 0.5, 1024)
+
+        self.assertEqual(100, self.sizer.max_elems)
+        self.assertIsNone(self.sizer.item_time)
+
+    def test_record_failure(self):
+        self.sizer.record_failure(8)
+
+        self.assertEqual(5, self.sizer.max_elems)
@@ -0,0 +1,137 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import requests_mock
+from wsmanclient import exceptions, query, utils
+from wsmanclient.dracclient import client
+from wsmanclient.dracclient.resources import job, uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+
+
+class QueryTestCase(base.BaseTest):
+
+    def test_literal(self):
+        self.assertEqual('"foo"', query.literal('foo'))
+        self.assertEqual(r'"say \"hi\" C:\\"', query.literal('say "hi" C:\\'))
+        self.assertEqual('42', query.literal(42))
+        self.assertEqual('1.5', query.literal(1.5))
+        self.assertEqual('true', query.literal(True))
+        self.assertEqual(
+            '"20160711135039.000000+000"',
+            query.literal(datetime.datetime(2016, 7, 11, 13, 50, 39,
+                                            tzinfo=utils.FixedOffset(0))))
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          query.literal, object())
+
+    def test_comparison(self):
+        state = query.Property('JobStatus')
+
+        self.assertEqual('JobStatus = "Failed"', str(state == 'Failed'))
+        self.assertEqual('JobStatus != "Failed"', str(state != 'Failed'))
+        self.assertEqual('PercentComplete >= 50',
+                         str(query.Property('PercentComplete') >= 50))
+        self.assertEqual('JobStatus is null', str(state == None))  # noqa
+        self.assertEqual('JobStatus is not null', str(state != None))  # noqa
+
+    def test_in(self):
+        state = query.Property('JobStatus')
+
+        self.assertEqual('JobStatus = "Failed" or JobStatus = "Completed"',
+                         str(state.in_(['Failed', 'Completed'])))
+        self.assertEqual('JobStatus != "Failed" and JobStatus != "Completed"',
+                         str(state.not_in(['Failed', 'Completed'])))
+        self.assertRaises(exceptions.InvalidParameterValue, state.in_, [])
+
+    def test_precedence(self):
+        name = query.Property('Name')
+        state = query.Property('JobStatus')
+
+        condition = ((name == 'a') | (name == 'b')) & (state != 'Failed')
+
+        self.assertEqual(
+            '(Name = "a" or Name = "b") and JobStatus != "Failed"',
+            condition.render())
+        self.assertEqual('Name = "a" or Name = "b" and JobStatus != "Failed"',
+                         ((name == 'a') | (name == 'b') &
+                          (state != 'Failed')).render())
+        self.assertEqual('not (Name = "a" and JobStatus = "b")',
+                         (~((name == 'a') & (state == 'b'))).render())
+        self.assertEqual('Name = "a" and (Name like "JID%")',
+                         ((name == 'a') & 'Name like "JID%"').render())
+
+    def test_invalid_identifier(self):
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          query.Property, 'Name; DROP TABLE users')
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          query.Query, 'DCIM_LifecycleJob', ['*'])
+
+    def test_query(self):
+        jobs = query.Query('DCIM_LifecycleJob')
+
+        self.assertEqual('select * from DCIM_LifecycleJob', jobs.render())
+        self.assertEqual(
+            'select InstanceID, JobStatus from DCIM_LifecycleJob '
+            'where Name != "CLEARALL" and JobStatus = "Failed"',
+            jobs.select('InstanceID', 'JobStatus').where(
+                query.Property('Name') != 'CLEARALL').where(
+                    query.Property('JobStatus') == 'Failed').render())
+        self.assertEqual(jobs, query.Query('DCIM_LifecycleJob', where=''))
+
+    def test_unfinished_jobs(self):
+        self.assertEqual('Name != "CLEARALL" and '
+                         'JobStatus != "Reboot Completed" and '
+                         'JobStatus != "Completed" and '
+                         'JobStatus != "Completed with Errors" and '
+                         'JobStatus != "Failed"',
+                         job.UNFINISHED_JOBS.render())
+
+
+@requests_mock.Mocker()
+class ClientQueryTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ClientQueryTestCase, self).setUp()
+        self.drac_client = client.DRACClient(**test_utils.FAKE_ENDPOINT)
+
+    def test_enumerate_query(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text=test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['ok'])
+
+        self.drac_client.client.enumerate(
+            uris.DCIM_LifecycleJob,
+            filter_query=query.Query('DCIM_LifecycleJob',
+                                     where=query.Property('Name') == 'x"y'))
+
+        self.assertIn(r'select * from DCIM_LifecycleJob where Name = "x\"y"',
+                      mock_requests.last_request.text)
+
+    def test_list_with_where(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text=test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['ok'])
+
+        self.drac_client.list_jobs(
+            only_unfinished=True,
+            where=query.Property('JobStatus') == 'Scheduled')
+
+        self.assertIn('JobStatus != "Failed" and JobStatus = "Scheduled"',
+                      mock_requests.last_request.text)
+
+        self.drac_client.list_jobs(where='Name like "JID%"')
+
+        self.assertIn('select * from DCIM_LifecycleJob where Name like "JID%"',
+                      mock_requests.last_request.text)
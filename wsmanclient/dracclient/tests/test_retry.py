@@ -0,0 +1,124 @@
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+import mock
+import requests.exceptions
+from wsmanclient import exceptions, retry
+from wsmanclient.dracclient.tests import base
+
+
+class RetryPolicyTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(RetryPolicyTestCase, self).setUp()
+        self.policy = retry.RetryPolicy(max_attempts=3, backoff=0.5,
+                                        max_backoff=1.5)
+
+    def test_is_retryable(self):
+        connection_error = requests.exceptions.ConnectionError()
+        connect_timeout = requests.exceptions.ConnectTimeout()
+        unavailable = exceptions.WSManInvalidResponse(503, 'Unavailable')
+        server_error = exceptions.WSManInvalidResponse(500, 'Server Error')
+        invalid_url = requests.exceptions.InvalidURL()
+
+        self.assertTrue(self.policy.is_retryable(connection_error, True))
+        self.assertTrue(self.policy.is_retryable(connect_timeout, True))
+        self.assertTrue(self.policy.is_retryable(unavailable, True))
+        self.assertFalse(self.policy.is_retryable(server_error, True))
+        self.assertFalse(self.policy.is_retryable(invalid_url, True))
+
+    def test_is_retryable_not_idempotent(self):
+        self.assertTrue(self.policy.is_retryable(
+            requests.exceptions.ConnectTimeout(), False))
+        self.assertFalse(self.policy.is_retryable(
+            requests.exceptions.ReadTimeout(), False))
+        self.assertFalse(self.policy.is_retryable(
+            exceptions.WSManInvalidResponse(503, 'Unavailable'), False))
+
+    @mock.patch('random.uniform', autospec=True,
+                side_effect=lambda low, high: high)
+    def test_get_delay(self, mock_uniform):
+        self.assertEqual([0.5, 1.0, 1.5],
+                         [self.policy.get_delay(attempt)
+                          for attempt in (1, 2, 3)])
+
+
+@mock.patch.object(time, 'time', autospec=True)
+class CircuitBreakerTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(CircuitBreakerTestCase, self).setUp()
+        self.breaker = retry.CircuitBreaker('https://1.2.3.4:443/wsman',
+                                            failure_threshold=2,
+                                            reset_timeout=30)
+
+    def test_opens_after_consecutive_failures(self, mock_time):
+        mock_time.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.is_open)
+
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open)
+        self.assertRaises(exceptions.WSManCircuitOpen,
+                          self.breaker.before_request)
+
+    def test_probe_after_reset_timeout(self, mock_time):
+        mock_time.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        mock_time.return_value = 131
+        self.breaker.before_request()
+        # only a single probe is let through
+        self.assertRaises(exceptions.WSManCircuitOpen,
+                          self.breaker.before_request)
+
+        self.breaker.record_success()
+        self.assertFalse(self.breaker.is_open)
+        self.breaker.before_request()
+
+    def test_failed_probe_opens_circuit(self, mock_time):
+        mock_time.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        mock_time.return_value = 131
+        self.breaker.before_request()
+        self.breaker.record_failure()
+
+        mock_time.return_value = 150
+        self.assertRaises(exceptions.WSManCircuitOpen,
+                          self.breaker.before_request)
+
+    def test_cancelled_probe_lets_next_through(self, mock_time):
+        mock_time.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        mock_time.return_value = 131
+        self.breaker.before_request()
+        self.breaker.record_cancelled()
+
+        self.assertTrue(self.breaker.is_open)
+        self.breaker.before_request()
+
+    def test_get_circuit_breaker(self, mock_time):
+        with mock.patch.dict(retry._circuit_breakers, clear=True):
+            self.assertIs(retry.get_circuit_breaker('https://1.2.3.4'),
+                          retry.get_circuit_breaker('https://1.2.3.4'))
+            self.assertIsNot(retry.get_circuit_breaker('https://1.2.3.4'),
+                             retry.get_circuit_breaker('https://1.2.3.5'))
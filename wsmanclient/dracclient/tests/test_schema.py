@@ -0,0 +1,237 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import lxml.etree
+import requests_mock
+from wsmanclient import exceptions, schema, utils, wsman
+from wsmanclient.dracclient import client
+from wsmanclient.dracclient.resources import raid, uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+from wsmanclient.testing import synthetic
+
+FOO_RESOURCE_URI = 'http://FooResource'
+
+
+class ViewTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ViewTestCase, self).setUp()
+        self.view = schema.View('Foo', FOO_RESOURCE_URI, [
+            schema.Field('id', 'InstanceID'),
+            schema.Field('size', 'Size', type=int),
+            schema.Field('state', 'State', values={'1': 'on', '2': 'off'}),
+            schema.Field('enabled', 'Enabled', type=schema.boolean),
+            schema.Field('note', 'Note', optional=True),
+            schema.Field('tags', 'Tag', multiple=True),
+            schema.Field('parent', 'Parent', values={'x': 'y'})])
+        self.item = lxml.etree.fromstring(
+            '<n1:FooResource xmlns:n1="%(ns)s" xmlns:xsi="%(xsi)s">'
+            '<n1:InstanceID>foo-1</n1:InstanceID>'
+            '<n1:Size>42</n1:Size>'
+            '<n1:State>2</n1:State>'
+            '<n1:Enabled>TRUE</n1:Enabled>'
+            '<n1:Tag>a</n1:Tag>'
+            '<n1:Tag>b</n1:Tag>'
+            '<n1:Parent xsi:nil="true"/>'
+            '</n1:FooResource>' % {'ns': FOO_RESOURCE_URI,
+                                   'xsi': utils.NS_XMLSchema_Instance})
+
+    def test_parse(self):
+        foo = self.view.parse(self.item)
+
+        self.assertEqual(self.view.model(id='foo-1', size=42, state='off',
+                                         enabled=True, note=None,
+                                         tags=['a', 'b'], parent=None),
+                         foo)
+        self.assertEqual('Foo', type(foo).__name__)
+
+    def test_parse_with_missing_property(self):
+        self.item.remove(self.item[0])
+
+        self.assertRaises(KeyError, self.view.parse, self.item)
+
+    def test_parse_all(self):
+        doc = lxml.etree.fromstring(
+            '<Items>%s%s</Items>' % ((lxml.etree.tostring(self.item)
+                                      .decode('utf-8'),) * 2))
+
+        self.assertEqual(2, len(self.view.parse_all(doc)))
+
+    def test_query(self):
+        self.assertEqual('select InstanceID, Size, State, Enabled, Note, Tag, '
+                         'Parent from FooResource', self.view.query())
+        self.assertEqual(
+            'select FQDD from DCIM_CPUView where PrimaryStatus = "1"',
+            schema.View('CPU', uris.DCIM_CPUView,
+                        [schema.Field('id', 'FQDD'),
+                         schema.Field('status', 'FQDD')]).query(
+                'PrimaryStatus = "1"'))
+
+
+class RAIDViewsTestCase(base.BaseTest):
+
+    def test_virtual_disk_view(self):
+        doc = lxml.etree.fromstring(
+            test_utils.RAIDEnumerations[uris.DCIM_VirtualDiskView]['ok'])
+
+        disks = raid.VIRTUAL_DISK_VIEW.parse_all(doc)
+
+        self.assertEqual('RAID.Integrated.1-1', disks[0].controller)
+        self.assertEqual(1, disks[0].span_depth)
+
+    def test_synthetic_instances(self):
+        for name, view in [('DCIM_PhysicalDiskView', raid.PHYSICAL_DISK_VIEW),
+                           ('DCIM_VirtualDiskView', raid.VIRTUAL_DISK_VIEW),
+                           ('DCIM_ControllerView', raid.RAID_CONTROLLER_VIEW)]:
+            for item in synthetic.generate(name, 3):
+                instance = view.parse(lxml.etree.fromstring(item.xml))
+                self.assertIsInstance(instance, view.model)
+
+
+class ProjectionTestCase(base.BaseTest):
+
+    def test_project(self):
+        view = raid.PHYSICAL_DISK_VIEW.project(['model', 'controller'])
+
+        self.assertEqual(['id', 'controller', 'model'],
+                         [field.name for field in view.fields])
+        self.assertEqual('select FQDD, Model from DCIM_PhysicalDiskView',
+                         view.query())
+        self.assertIs(raid.PHYSICAL_DISK_VIEW, view.parent)
+        self.assertIs(view, raid.PHYSICAL_DISK_VIEW.project(['controller',
+                                                             'model']))
+        self.assertIs(raid.PHYSICAL_DISK_VIEW,
+                      raid.PHYSICAL_DISK_VIEW.project(None))
+
+    def test_project_unknown_field(self):
+        self.assertRaises(exceptions.InvalidParameterValue,
+                          raid.PHYSICAL_DISK_VIEW.project, ['foo'])
+
+
+@requests_mock.Mocker()
+class ClientProjectionTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ClientProjectionTestCase, self).setUp()
+        self.drac_client = client.DRACClient(**test_utils.FAKE_ENDPOINT)
+
+    def test_list_physical_disks_with_fields(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text=test_utils.RAIDEnumerations[uris.DCIM_PhysicalDiskView]['ok'])
+
+        disks = self.drac_client.list_physical_disks(fields=['raid_state'])
+
+        self.assertIn('select FQDD, RaidStatus from DCIM_PhysicalDiskView',
+                      mock_requests.last_request.text)
+        self.assertEqual(
+            'Disk.Bay.0:Enclosure.Internal.0-1:RAID.Integrated.1-1',
+            disks[0].id)
+        self.assertEqual('ready', disks[0].raid_state)
+        self.assertIsNone(disks[0].model)
+
+    def test_list_jobs_with_fields(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text=test_utils.JobEnumerations[uris.DCIM_LifecycleJob]['ok'])
+
+        self.drac_client.list_jobs(only_unfinished=True, fields=['state'])
+
+        self.assertIn('select InstanceID, JobStatus from DCIM_LifecycleJob '
+                      'where Name != "CLEARALL"',
+                      mock_requests.last_request.text)
+
+    def test_projection_rejected(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'status_code': 400},
+            {'text': test_utils.RAIDEnumerations[
+                uris.DCIM_PhysicalDiskView]['ok']},
+            {'text': test_utils.RAIDEnumerations[
+                uris.DCIM_PhysicalDiskView]['ok']}])
+
+        disks = self.drac_client.list_physical_disks(fields=['raid_state'])
+
+        self.assertEqual(2, mock_requests.call_count)
+        self.assertNotIn('select ', mock_requests.last_request.text)
+        # the fields left out are None whatever the endpoint returned
+        self.assertEqual('ready', disks[0].raid_state)
+        self.assertIsNone(disks[0].model)
+        self.assertEqual(set([uris.DCIM_PhysicalDiskView]),
+                         self.drac_client.client.unsupported_projections)
+
+        # the projection isn't attempted again
+        self.drac_client.list_physical_disks(fields=['raid_state'])
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertNotIn('select ', mock_requests.last_request.text)
+
+    def test_get_job_projection_rejected(self, mock_requests):
+        # fragment transfer, get and projection rejected in turn
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'status_code': 400},
+            {'status_code': 400},
+            {'status_code': 400},
+            {'text': test_utils.JobEnumerations[
+                uris.DCIM_LifecycleJob]['ok']}])
+
+        job = self.drac_client.get_job('JID_CLEARALL', fields=['state'])
+
+        self.assertEqual(4, mock_requests.call_count)
+        self.assertIn('select * from DCIM_LifecycleJob '
+                      'where InstanceID = "JID_CLEARALL"',
+                      mock_requests.last_request.text)
+        self.assertEqual('Pending', job.state)
+        client = self.drac_client.client
+        self.assertEqual(set([uris.DCIM_LifecycleJob]),
+                         client.unsupported_fragments)
+        self.assertEqual(set([uris.DCIM_LifecycleJob]),
+                         client.unsupported_gets)
+        self.assertEqual(set([uris.DCIM_LifecycleJob]),
+                         client.unsupported_projections)
+
+    def test_get_power_state_fragment(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text='<s:Envelope xmlns:s="%s" xmlns:wsman="%s"><s:Body>'
+                 '<wsman:XmlFragment><n1:EnabledState xmlns:n1="%s">3'
+                 '</n1:EnabledState></wsman:XmlFragment></s:Body>'
+                 '</s:Envelope>' % (wsman.NS_SOAP_ENV, wsman.NS_WSMAN,
+                                    uris.DCIM_ComputerSystem))
+
+        self.assertEqual('POWER_OFF', self.drac_client.get_power_state())
+        self.assertEqual(1, mock_requests.call_count)
+        self.assertIn('>EnabledState</wsman:FragmentTransfer>',
+                      mock_requests.last_request.text)
+
+    def test_fragment_transfer_unsupported(self, mock_requests):
+        # the fragment transfer header is ignored
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            text=test_utils.BIOSEnumerations[uris.DCIM_ComputerSystem]['ok'])
+
+        self.assertEqual('POWER_ON', self.drac_client.get_power_state())
+        self.assertEqual(2, mock_requests.call_count)
+        self.assertEqual(set([uris.DCIM_ComputerSystem]),
+                         self.drac_client.client.unsupported_fragments)
+
+        self.assertEqual('POWER_ON', self.drac_client.get_power_state())
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertNotIn('FragmentTransfer', mock_requests.last_request.text)
+
+    def test_request_failure_not_remembered(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', status_code=401)
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self.drac_client.list_cpus, fields=['status'])
+        self.assertEqual(set(),
+                         self.drac_client.client.unsupported_projections)
@@ -0,0 +1,180 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import unittest
+
+import mock
+from wsmanclient import exceptions, retry
+from wsmanclient.dracclient import client
+from wsmanclient.dracclient.resources import uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.testing import data
+
+try:
+    from wsmanclient.testing import server
+except (ImportError, SyntaxError):
+    server = None
+
+
+class DataSetTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(DataSetTestCase, self).setUp()
+        self.dataset = data.DataSet().load_responses()
+
+    def test_load_responses(self):
+        self.assertEqual(
+            66, len(self.dataset.get_items(uris.DCIM_BIOSEnumeration)))
+        self.assertIsNotNone(self.dataset.get_invocation(
+            uris.DCIM_ComputerSystem, 'RequestStateChange'))
+        self.assertIsNone(self.dataset.get_items('http://FooResource'))
+
+    def test_get_items_with_filter(self):
+        items = self.dataset.get_items(
+            uris.DCIM_LifecycleJob,
+            'select * from DCIM_LifecycleJob where JobStatus != "Completed" '
+            'and JobStatus != "Failed"')
+
+        self.assertTrue(items)
+        self.assertLess(len(items),
+                        len(self.dataset.get_items(uris.DCIM_LifecycleJob)))
+        for item in items:
+            self.assertNotIn(item.properties['JobStatus'],
+                             ['Completed', 'Failed'])
+
+    def test_get_items_with_unsupported_filter(self):
+        items = self.dataset.get_items(
+            uris.DCIM_LifecycleJob,
+            'select * from DCIM_LifecycleJob where Name like "JID%"')
+
+        self.assertEqual(self.dataset.get_items(uris.DCIM_LifecycleJob),
+                         items)
+
+
+@unittest.skipIf(server is None, 'requires Python 3')
+class FakeWSManServerTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(FakeWSManServerTestCase, self).setUp()
+        circuit_breakers = mock.patch.dict(retry._circuit_breakers,
+                                           clear=True)
+        circuit_breakers.start()
+        self.addCleanup(circuit_breakers.stop)
+
+    def _start(self, **kwargs):
+        fake = server.FakeWSManServer(endpoints=4, **kwargs)
+        fake.start()
+        self.addCleanup(fake.stop)
+        return fake
+
+    def _client(self, fake, index=0, **kwargs):
+        drac_client = client.DRACClient(username='admin', password='s3cr3t',
+                                        retry_policy=retry.NO_RETRY,
+                                        **dict(fake.endpoint(index),
+                                               **kwargs))
+        self.addCleanup(drac_client.close)
+        return drac_client
+
+    def test_paged_enumeration(self):
+        fake = self._start(page_size=7)
+
+        bios_settings = self._client(fake).list_bios_settings()
+
+        self.assertEqual(103, len(bios_settings))
+        # 66 + 35 + 2 items in pages of 7
+        self.assertEqual(10 + 5 + 1, fake.stats[200])
+
+    def test_filter_and_invoke(self):
+        fake = self._start()
+        drac_client = self._client(fake, index=3)
+
+        self.assertEqual('POWER_ON', drac_client.get_power_state())
+        drac_client.set_power_state('REBOOT')
+
+    def test_get_and_fragment_transfer(self):
+        fake = self._start()
+        drac_client = self._client(fake)
+
+        job = drac_client.get_job('JID_001436912645')
+        self.assertEqual('Completed', job.state)
+
+        drac_client.client.put_fragment(uris.DCIM_LifecycleJob,
+                                        {'InstanceID': 'JID_001436912645'},
+                                        'JobStatus', 'Failed')
+        job = drac_client.get_job('JID_001436912645', fields=['state'])
+
+        self.assertEqual('Failed', job.state)
+        self.assertIsNone(job.name)
+        self.assertEqual(3, fake.stats[200])
+        self.assertEqual(set(), drac_client.client.unsupported_fragments)
+
+    def test_get_missing_instance(self):
+        fake = self._start()
+
+        self.assertIsNone(self._client(fake).get_job('JID_42'))
+        # the get is rejected, the enumeration doesn't find the job
+        self.assertEqual(1, fake.stats[400])
+        self.assertEqual(1, fake.stats[200])
+
+    def test_iter_enumerate_releases_context(self):
+        fake = self._start()
+        wsman_client = self._client(fake).client
+
+        items = wsman_client.iter_enumerate(uris.DCIM_BIOSString,
+                                            max_elems=5)
+        next(items)
+        items.close()
+
+        self.assertEqual({}, fake._get_endpoint(0).contexts)
+
+    def test_session_limit(self):
+        fake = self._start(latency=0.2, session_limit=1)
+        errors = []
+
+        def get_power_state():
+            try:
+                self._client(fake).get_power_state()
+            except exceptions.WSManInvalidResponse as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=get_power_state)
+                   for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len(errors))
+        self.assertEqual(1, fake.stats[503])
+
+    def test_faults(self):
+        fake = self._start(faults=server.Faults(busy_rate=1.0))
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self._client(fake).get_power_state)
+        self.assertEqual(1, fake.stats[503])
+
+    def test_unknown_endpoint(self):
+        fake = self._start()
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self._client(fake, index=4).get_power_state)
+        self.assertEqual(1, fake.stats[404])
+
+    def test_credentials(self):
+        fake = self._start(credentials=('admin', 'other'))
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          self._client(fake).get_power_state)
+        self.assertEqual(1, fake.stats[401])
@@ -0,0 +1,96 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import lxml.etree
+import requests_mock
+from wsmanclient.dracclient import client
+from wsmanclient.dracclient.resources import uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+from wsmanclient.testing import data
+from wsmanclient.testing import synthetic
+
+
+class SyntheticTestCase(base.BaseTest):
+
+    def test_generate(self):
+        for name in synthetic.CLASSES:
+            items = synthetic.generate(name, 3)
+
+            self.assertEqual(3, len(items))
+            for item in items:
+                elem = lxml.etree.fromstring(item.xml)
+                self.assertEqual(name, lxml.etree.QName(elem).localname)
+
+    def test_generate_unique_instances(self):
+        items = synthetic.generate('DCIM_MemoryView', 400)
+
+        self.assertEqual(400, len(set(item.properties['InstanceID']
+                                      for item in items)))
+
+    def test_generate_nil_properties(self):
+        item = synthetic.generate('DCIM_NICView', 1, start=5)[0]
+        elem = lxml.etree.fromstring(item.xml)
+
+        self.assertEqual('NIC.Integrated.1-2-2', item.properties['FQDD'])
+        self.assertIsNone(item.properties['WWN'])
+        self.assertEqual(
+            'true',
+            elem.find('{%s}WWN' % uris.DCIM_NICView).get(
+                '{%s}nil' % synthetic.NS_XSI))
+
+    @requests_mock.Mocker()
+    def test_enumeration_responses(self, mock_requests):
+        items = synthetic.generate('DCIM_PhysicalDiskView', 250)
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'content': response}
+            for response in data.enumeration_responses(items, page_size=100)])
+
+        drac_client = client.DRACClient(**test_utils.FAKE_ENDPOINT)
+        doc = drac_client.client.enumerate(uris.DCIM_PhysicalDiskView)
+
+        self.assertEqual(
+            250, len(doc.findall('.//{%s}FQDD' % uris.DCIM_PhysicalDiskView)))
+        self.assertEqual(3, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    def test_list_bios_settings(self, mock_requests):
+        responses = [
+            data.enumeration_responses(
+                synthetic.generate('DCIM_BIOSEnumeration', 2000), 500),
+            data.enumeration_responses(
+                synthetic.generate('DCIM_BIOSString', 10)),
+            data.enumeration_responses(
+                synthetic.generate('DCIM_BIOSInteger', 10))]
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'content': response}
+            for pages in responses for response in pages])
+
+        drac_client = client.DRACClient(**test_utils.FAKE_ENDPOINT)
+        bios_settings = drac_client.list_bios_settings()
+
+        self.assertEqual(2020, len(bios_settings))
+        self.assertEqual('SynEnum1999', bios_settings['SynEnum1999'].name)
+
+    def test_dataset(self):
+        dataset = synthetic.dataset({'DCIM_LifecycleJob': 10,
+                                     'CIM_EthernetPort': 2}, scale=3)
+
+        self.assertEqual(30, len(dataset.get_items(uris.DCIM_LifecycleJob)))
+        self.assertEqual(6, len(dataset.get_items(
+            synthetic.CIM_SCHEMA + 'CIM_NetworkPort')))
+        # the rest comes from the mocks
+        self.assertEqual(
+            66, len(dataset.get_items(uris.DCIM_BIOSEnumeration)))
+        self.assertIsNotNone(dataset.get_invocation(
+            uris.DCIM_ComputerSystem, 'RequestStateChange'))
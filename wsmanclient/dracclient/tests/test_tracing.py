@@ -0,0 +1,109 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import requests_mock
+from wsmanclient import exceptions, retry, tracing, wsman
+from wsmanclient.dracclient import client
+from wsmanclient.dracclient.resources import uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+
+
+class NoopTracerTestCase(base.BaseTest):
+
+    def test_default(self):
+        self.assertFalse(tracing.enabled())
+        with tracing.span('foo') as span:
+            self.assertIs(tracing._NOOP_SPAN, span)
+        self.assertIsNone(tracing.current_span())
+
+    def test_suppressed(self):
+        tracing.set_tracer(tracing.RecordingTracer())
+        self.addCleanup(tracing.set_tracer, None)
+
+        with tracing.suppressed():
+            self.assertFalse(tracing.enabled())
+        self.assertTrue(tracing.enabled())
+
+
+@requests_mock.Mocker()
+class ClientTracingTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(ClientTracingTestCase, self).setUp()
+        circuit_breakers = mock.patch.dict(retry._circuit_breakers,
+                                           clear=True)
+        circuit_breakers.start()
+        self.addCleanup(circuit_breakers.stop)
+        self.tracer = tracing.RecordingTracer()
+        tracing.set_tracer(self.tracer)
+        self.addCleanup(tracing.set_tracer, None)
+
+    def test_list_bios_settings(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSEnumeration]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSString]['ok']},
+            {'text': test_utils.BIOSEnumerations[
+                uris.DCIM_BIOSInteger]['ok']}])
+        drac_client = client.DRACClient(**test_utils.FAKE_ENDPOINT)
+
+        drac_client.list_bios_settings()
+
+        self.assertEqual(1, len(self.tracer.spans))
+        root = self.tracer.spans[0]
+        self.assertEqual('DRACClient.list_bios_settings', root.name)
+        self.assertEqual('1.2.3.4', root.attributes['host'])
+        self.assertEqual(['WSMan.Enumerate'] * 3,
+                         [span.name for span in root.children])
+        self.assertEqual(
+            [uris.DCIM_BIOSEnumeration, uris.DCIM_BIOSString,
+             uris.DCIM_BIOSInteger],
+            [span.attributes['resource_uri'] for span in root.children])
+        for span in root.children:
+            self.assertGreaterEqual(span.start_time, root.start_time)
+            self.assertLessEqual(span.end_time, root.end_time)
+        self.assertIn('DRACClient.list_bios_settings', self.tracer.format())
+
+    def test_failure(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', status_code=500)
+        drac_client = client.DRACClient(retry_policy=retry.NO_RETRY,
+                                        **test_utils.FAKE_ENDPOINT)
+
+        self.assertRaises(exceptions.WSManInvalidResponse,
+                          drac_client.get_power_state)
+
+        root = self.tracer.spans[0]
+        self.assertIsInstance(root.exception, exceptions.WSManInvalidResponse)
+        self.assertEqual(500, root.children[0].attributes['status_code'])
+        self.assertIsInstance(root.children[0].exception,
+                              exceptions.WSManInvalidResponse)
+
+    def test_prefetch(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman', [
+            {'text': test_utils.WSManEnumerations['context'][page]}
+            for page in range(4)])
+        wsman_client = wsman.Client(prefetch=True, **test_utils.FAKE_ENDPOINT)
+        self.addCleanup(wsman_client.close)
+
+        with tracing.span('enumerate'):
+            wsman_client.enumerate('FooResource', optimization=False)
+
+        root = self.tracer.spans[0]
+        self.assertEqual(['WSMan.Enumerate', 'WSMan.Pull', 'WSMan.Pull',
+                          'WSMan.Pull'],
+                         [span.name for span in sorted(
+                             root.children,
+                             key=lambda span: span.attributes['page'])])
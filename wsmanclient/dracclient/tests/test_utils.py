@@ -0,0 +1,121 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import pickle
+
+import lxml.etree
+from wsmanclient import utils
+from wsmanclient.dracclient.resources import uris
+from wsmanclient.dracclient.tests import base
+from wsmanclient.dracclient.tests import utils as test_utils
+
+
+class DecodeItemTestCase(base.BaseTest):
+
+    def setUp(self):
+        super(DecodeItemTestCase, self).setUp()
+        self.item = lxml.etree.fromstring(
+            '<n1:DCIM_BIOSEnumeration xmlns:n1="%(ns)s" xmlns:xsi="%(xsi)s">'
+            '<n1:AttributeName> MemTest </n1:AttributeName>'
+            '<n1:CurrentValue>Disabled</n1:CurrentValue>'
+            '<n1:PendingValue xsi:nil="true"/>'
+            '<n1:PossibleValues>Enabled</n1:PossibleValues>'
+            '<n1:PossibleValues>Disabled</n1:PossibleValues>'
+            '<n1:Other><n1:AttributeName>Nested</n1:AttributeName></n1:Other>'
+            '<n2:AttributeName xmlns:n2="http://other">Foo</n2:AttributeName>'
+            '</n1:DCIM_BIOSEnumeration>' % {
+                'ns': uris.DCIM_BIOSEnumeration,
+                'xsi': utils.NS_XMLSchema_Instance})
+
+    def test_decode_item(self):
+        self.assertEqual(
+            {'AttributeName': 'MemTest',
+             'PendingValue': None,
+             'PossibleValues': ['Enabled', 'Disabled']},
+            utils.decode_item(self.item, uris.DCIM_BIOSEnumeration,
+                              ('AttributeName', 'PendingValue',
+                               'PossibleValues', 'IsReadOnly'),
+                              lists=('PossibleValues',)))
+
+    def test_decode_item_all_properties(self):
+        properties = utils.decode_item(self.item, uris.DCIM_BIOSEnumeration)
+
+        self.assertEqual(['AttributeName', 'CurrentValue', 'Other',
+                          'PendingValue', 'PossibleValues'],
+                         sorted(properties))
+        # only the first value of repeated properties is kept
+        self.assertEqual('Enabled', properties['PossibleValues'])
+
+    def test_decode_item_matches_lookups(self):
+        doc = lxml.etree.fromstring(test_utils.RAIDEnumerations[
+            uris.DCIM_VirtualDiskView]['ok'])
+        names = ('FQDD', 'Name', 'RAIDTypes', 'SizeInBytes', 'SpanDepth',
+                 'PendingOperations', 'OperationName')
+
+        for item in utils.find_xml(doc, 'DCIM_VirtualDiskView',
+                                   uris.DCIM_VirtualDiskView, find_all=True):
+            properties = utils.decode_item(item, uris.DCIM_VirtualDiskView,
+                                           names)
+            for name in names:
+                self.assertEqual(
+                    utils.get_wsman_resource_attr(
+                        item, uris.DCIM_VirtualDiskView, name,
+                        nullable=True),
+                    properties[name])
+
+
+class ParseCIMDatetimeTestCase(base.BaseTest):
+
+    def test_parse_timestamp(self):
+        timestamp = utils.parse_cim_datetime('20160714202232.123456+000')
+
+        self.assertEqual(datetime.datetime(2016, 7, 14, 20, 22, 32, 123456),
+                         timestamp.replace(tzinfo=None))
+        self.assertEqual(datetime.timedelta(0), timestamp.utcoffset())
+        self.assertEqual('UTC', timestamp.tzname())
+
+    def test_parse_timestamp_with_offset(self):
+        timestamp = utils.parse_cim_datetime('20160714202232.000000-150')
+
+        self.assertEqual(datetime.timedelta(minutes=-150),
+                         timestamp.utcoffset())
+        self.assertEqual('-02:30', timestamp.tzname())
+        self.assertEqual(utils.parse_cim_datetime('20160714225232.000000+000'),
+                         timestamp)
+
+    def test_parse_interval(self):
+        self.assertEqual(
+            datetime.timedelta(days=12, hours=1, minutes=2, seconds=3,
+                               microseconds=4),
+            utils.parse_cim_datetime('00000012010203.000004:000'))
+
+    def test_parse_invalid(self):
+        for value in ['TIME_NA', '00000101000000',
+                      '2016071420223.000000+000', '20160714202232.000000*000',
+                      '20161314202232.000000+000', '20160714202232.000000:060',
+                      '20160714******.000000+000']:
+            self.assertRaises(ValueError, utils.parse_cim_datetime, value)
+
+    def test_cache(self):
+        value = '20160711135039.000000+000'
+
+        self.assertIs(utils.parse_cim_datetime(value),
+                      utils.parse_cim_datetime(value))
+
+    def test_pickle(self):
+        timestamp = utils.parse_idrac_time('20160711135039.000000+060')
+
+        self.assertEqual(timestamp, pickle.loads(pickle.dumps(timestamp)))
+        self.assertEqual(timestamp.utcoffset(),
+                         pickle.loads(pickle.dumps(timestamp)).utcoffset())
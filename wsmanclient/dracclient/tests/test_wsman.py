@@ -17,7 +17,9 @@ import uuid
 import lxml.etree
 import lxml.objectify
 import mock
+import requests.exceptions
 import requests_mock
+import wsmanclient.retry
 import wsmanclient.wsman
 from wsmanclient import exceptions
 from wsmanclient.tests import utils as test_utils
@@ -28,6 +30,10 @@ class ClientTestCase(base.BaseTest):
 
     def setUp(self):
         super(ClientTestCase, self).setUp()
+        circuit_breakers = mock.patch.dict(
+            wsmanclient.retry._circuit_breakers, clear=True)
+        circuit_breakers.start()
+        self.addCleanup(circuit_breakers.stop)
         self.client = wsmanclient.wsman.Client(**test_utils.FAKE_ENDPOINT)
 
     @requests_mock.Mocker()
@@ -53,6 +59,261 @@ class ClientTestCase(base.BaseTest):
         self.assertRaises(exceptions.WSManInvalidResponse,
                           self.client.enumerate, 'resource')
 
+    @requests_mock.Mocker()
+    def test_get_with_fault(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman', status_code=400,
+            text='<s:Envelope xmlns:s="%s" xmlns:wsa="%s"><s:Body><s:Fault>'
+                 '<s:Code><s:Value>s:Sender</s:Value><s:Subcode>'
+                 '<s:Value>wsa:ActionNotSupported</s:Value></s:Subcode>'
+                 '</s:Code></s:Fault></s:Body></s:Envelope>' % (
+                     wsmanclient.wsman.NS_SOAP_ENV,
+                     wsmanclient.wsman.NS_WS_ADDR))
+
+        with self.assertRaises(exceptions.WSManInvalidResponse) as context:
+            self.client.get('resource', {})
+
+        self.assertEqual(400, context.exception.status_code)
+        self.assertEqual('ActionNotSupported',
+                         context.exception.fault_subcode)
+
+    @requests_mock.Mocker()
+    @mock.patch('time.sleep', autospec=True)
+    def test_enumerate_with_transient_failure(self, mock_requests,
+                                              mock_sleep):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'exc': requests.exceptions.ConnectionError},
+             {'status_code': 503},
+             {'text': '<result>yay!</result>'}])
+
+        resp = self.client.enumerate('resource', auto_pull=False)
+
+        self.assertEqual('yay!', resp.text)
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+
+    @requests_mock.Mocker()
+    @mock.patch('time.sleep', autospec=True)
+    def test_enumerate_with_persistent_failure(self, mock_requests,
+                                               mock_sleep):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ConnectionError)
+
+        self.assertRaises(exceptions.WSManRequestFailure,
+                          self.client.enumerate, 'resource')
+        self.assertEqual(3, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    @mock.patch('time.sleep', autospec=True)
+    def test_invoke_is_not_retried(self, mock_requests, mock_sleep):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ReadTimeout)
+
+        self.assertRaises(exceptions.WSManRequestFailure,
+                          self.client.invoke, 'http://resource', 'method',
+                          {}, {})
+        self.assertEqual(1, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    @mock.patch('time.sleep', autospec=True)
+    def test_circuit_breaker_fails_fast(self, mock_requests, mock_sleep):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ConnectionError)
+        other_client = wsmanclient.wsman.Client(**test_utils.FAKE_ENDPOINT)
+
+        for _ in range(2):
+            self.assertRaises(exceptions.WSManRequestFailure,
+                              self.client.enumerate, 'resource')
+
+        self.assertRaises(exceptions.WSManCircuitOpen,
+                          other_client.enumerate, 'resource')
+        self.assertEqual(5, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    @mock.patch('time.sleep', autospec=True)
+    def test_enumerate_with_body_failure(self, mock_requests, mock_sleep):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'body': _BrokenBody(b'<result>y')},
+             {'text': '<result>yay!</result>'}])
+
+        resp = self.client.enumerate('resource', auto_pull=False)
+
+        self.assertEqual('yay!', resp.text)
+        self.assertEqual(2, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    @mock.patch('time.sleep', autospec=True)
+    def test_enumerate_with_persistent_body_failure(self, mock_requests,
+                                                    mock_sleep):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           body=_BrokenBody(b'<result>y'))
+        breaker = wsmanclient.retry.get_circuit_breaker(self.client.endpoint)
+
+        self.assertRaises(exceptions.WSManRequestFailure,
+                          self.client.enumerate, 'resource')
+        self.assertEqual(3, mock_requests.call_count)
+        self.assertEqual(3, breaker._failures)
+
+    def _open_circuit(self):
+        breaker = wsmanclient.retry.get_circuit_breaker(self.client.endpoint)
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        # let the probe through
+        breaker._opened_at -= breaker.reset_timeout
+        return breaker
+
+    @requests_mock.Mocker()
+    def test_failed_invoke_probe_opens_circuit(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ConnectionError)
+        breaker = self._open_circuit()
+
+        self.assertRaises(exceptions.WSManRequestFailure,
+                          self.client.invoke, 'http://resource', 'method',
+                          {}, {})
+
+        self.assertEqual(1, mock_requests.call_count)
+        self.assertFalse(breaker._probing)
+        self.assertRaises(exceptions.WSManCircuitOpen,
+                          self.client.enumerate, 'resource')
+
+    @requests_mock.Mocker()
+    def test_out_of_time_before_sending_leaves_circuit(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+        breaker = wsmanclient.retry.get_circuit_breaker(self.client.endpoint)
+        other_client = wsmanclient.wsman.Client(**test_utils.FAKE_ENDPOINT)
+
+        with self.client.deadline(0):
+            for _ in range(breaker.failure_threshold):
+                self.assertRaises(exceptions.WSManDeadlineExceeded,
+                                  self.client.enumerate, 'resource')
+
+        self.assertFalse(mock_requests.called)
+        self.assertFalse(breaker.is_open)
+        resp = other_client.enumerate('resource', auto_pull=False)
+        self.assertEqual('yay!', resp.text)
+
+    @requests_mock.Mocker()
+    def test_probe_out_of_time_before_sending(self, mock_requests):
+        breaker = self._open_circuit()
+
+        with self.client.deadline(0):
+            self.assertRaises(exceptions.WSManDeadlineExceeded,
+                              self.client.enumerate, 'resource')
+
+        self.assertFalse(mock_requests.called)
+        # the probe wasn't taken, the next request is let through
+        self.assertFalse(breaker._probing)
+        breaker.before_request()
+
+    @requests_mock.Mocker()
+    @mock.patch.object(wsmanclient.wsman, 'time', autospec=True)
+    def test_probe_out_of_time_while_receiving_opens_circuit(
+            self, mock_requests, mock_time):
+        mock_time.time.return_value = 1000
+
+        def respond(request, context):
+            mock_time.time.return_value += 10
+            return '<result>yay!</result>'
+
+        mock_requests.post('https://1.2.3.4:443/wsman', text=respond)
+        breaker = self._open_circuit()
+
+        with self.client.deadline(5):
+            self.assertRaises(exceptions.WSManDeadlineExceeded,
+                              self.client.enumerate, 'resource')
+
+        self.assertEqual(1, mock_requests.call_count)
+        self.assertFalse(breaker._probing)
+        self.assertRaises(exceptions.WSManCircuitOpen,
+                          breaker.before_request)
+
+    @requests_mock.Mocker()
+    def test_cancelled_probe_lets_next_through(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+        breaker = self._open_circuit()
+
+        with mock.patch.object(self.client, '_send', autospec=True,
+                               side_effect=exceptions.WSManCaptureMiss(
+                                   action='Enumerate', resource_uri='resource',
+                                   host='1.2.3.4')):
+            self.assertRaises(exceptions.WSManCaptureMiss,
+                              self.client.enumerate, 'resource')
+
+        self.assertFalse(breaker._probing)
+        resp = self.client.enumerate('resource', auto_pull=False)
+        self.assertEqual('yay!', resp.text)
+        self.assertFalse(breaker.is_open)
+
+    @requests_mock.Mocker()
+    def test_enumerate_with_timeouts(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+        self.client = wsmanclient.wsman.Client(
+            connect_timeout=5, read_timeout=60, **test_utils.FAKE_ENDPOINT)
+
+        self.client.enumerate('resource', auto_pull=False)
+
+        self.assertEqual((5, 60), mock_requests.last_request.timeout)
+
+    @requests_mock.Mocker()
+    @mock.patch.object(wsmanclient.wsman, 'time', autospec=True)
+    def test_enumerate_with_deadline(self, mock_requests, mock_time):
+        mock_time.time.return_value = 1000
+        timeouts = []
+
+        def respond(request, context):
+            timeouts.append(request.timeout)
+            mock_time.time.return_value += 10
+            return test_utils.WSManEnumerations['context'][len(timeouts) - 1]
+
+        mock_requests.post('https://1.2.3.4:443/wsman', text=respond)
+
+        self.assertRaises(exceptions.WSManDeadlineExceeded,
+                          self.client.enumerate, 'FooResource', timeout=25)
+        # the deadline is carried across the pulls, running out on the third
+        self.assertEqual([(10, 25), (10, 15), (5, 5)], timeouts)
+
+    @requests_mock.Mocker()
+    @mock.patch.object(wsmanclient.wsman, 'time', autospec=True)
+    def test_deadline_stops_retries(self, mock_requests, mock_time):
+        mock_time.time.return_value = 1000
+
+        def sleep(delay):
+            mock_time.time.return_value += delay
+
+        mock_time.sleep.side_effect = sleep
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ConnectionError)
+        self.client.retry_policy = wsmanclient.retry.RetryPolicy(
+            max_attempts=5, backoff=10, max_backoff=10)
+
+        with mock.patch.object(self.client.retry_policy, 'get_delay',
+                               return_value=10):
+            with self.client.deadline(15):
+                self.assertRaises(exceptions.WSManDeadlineExceeded,
+                                  self.client.enumerate, 'resource')
+
+        self.assertEqual(2, mock_requests.call_count)
+        mock_time.sleep.assert_called_once_with(10)
+
+    def test_nested_deadlines(self):
+        with wsmanclient.wsman.deadline(10):
+            outer = wsmanclient.wsman._get_deadline()
+            with wsmanclient.wsman.deadline(60):
+                self.assertEqual(outer, wsmanclient.wsman._get_deadline())
+            with wsmanclient.wsman.deadline(None):
+                self.assertEqual(outer, wsmanclient.wsman._get_deadline())
+            with wsmanclient.wsman.deadline(1):
+                self.assertGreater(outer, wsmanclient.wsman._get_deadline())
+            self.assertEqual(outer, wsmanclient.wsman._get_deadline())
+
+        self.assertIsNone(wsmanclient.wsman._get_deadline())
+
     @requests_mock.Mocker()
     def test_enumerate_with_auto_pull(self, mock_requests):
         mock_requests.post(
@@ -74,6 +335,90 @@ class ClientTestCase(base.BaseTest):
             0, len(resp_xml.findall(
                 './/{%s}EnumerationContext' % wsmanclient.wsman.NS_WSMAN_ENUM)))
 
+    @requests_mock.Mocker()
+    def test_enumerate_with_prefetch(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][1]},
+             {'text': test_utils.WSManEnumerations['context'][2]},
+             {'text': test_utils.WSManEnumerations['context'][3]}])
+
+        resp_xml = self.client.enumerate('FooResource', prefetch=True)
+
+        foo_resource_uri = 'http://FooResource'
+        bar_resource_uri = 'http://BarResource'
+        self.assertEqual(
+            3, len(resp_xml.findall('.//{%s}FooResource' % foo_resource_uri)))
+        self.assertEqual(
+            1, len(resp_xml.findall('.//{%s}BazResource' % bar_resource_uri)))
+        self.assertEqual(4, mock_requests.call_count)
+        self.assertIsNotNone(self.client._prefetch_executor)
+
+        self.client.close()
+        self.assertIsNone(self.client._prefetch_executor)
+
+    @requests_mock.Mocker()
+    def test_adaptive_max_elems_out_of_time_before_sending(self,
+                                                           mock_requests):
+        self.client.adaptive_max_elems = True
+
+        with self.client.deadline(0):
+            for _ in range(3):
+                self.assertRaises(exceptions.WSManDeadlineExceeded,
+                                  self.client.enumerate, 'FooResource')
+
+        self.assertFalse(mock_requests.called)
+        self.assertEqual(100, self.client.get_max_elems('FooResource'))
+
+    def test_adaptive_max_elems_with_capture_miss(self):
+        self.client.adaptive_max_elems = True
+
+        with mock.patch.object(self.client, '_send', autospec=True,
+                               side_effect=exceptions.WSManCaptureMiss(
+                                   action='Enumerate',
+                                   resource_uri='FooResource',
+                                   host='1.2.3.4')):
+            for _ in range(3):
+                self.assertRaises(exceptions.WSManCaptureMiss,
+                                  self.client.enumerate, 'FooResource')
+
+        self.assertEqual(100, self.client.get_max_elems('FooResource'))
+
+    @requests_mock.Mocker()
+    @mock.patch('time.sleep', autospec=True)
+    def test_adaptive_max_elems_with_failure(self, mock_requests,
+                                             mock_sleep):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           exc=requests.exceptions.ConnectionError)
+        self.client.adaptive_max_elems = True
+
+        self.assertRaises(exceptions.WSManRequestFailure,
+                          self.client.enumerate, 'FooResource')
+
+        self.assertGreater(100, self.client.get_max_elems('FooResource'))
+
+    @requests_mock.Mocker()
+    def test_enumerate_with_adaptive_max_elems(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][1]},
+             {'text': test_utils.WSManEnumerations['context'][2]},
+             {'text': test_utils.WSManEnumerations['context'][3]}])
+        self.client.adaptive_max_elems = True
+        self.client._get_page_sizer('FooResource').max_elems = 2
+
+        self.client.enumerate('FooResource')
+
+        max_elems = [
+            int(lxml.etree.fromstring(request.body).find(
+                './/{%s}MaxElements' % wsmanclient.wsman.NS_WSMAN).text)
+            for request in mock_requests.request_history]
+        self.assertEqual([2, 2, 5, 10], max_elems)
+        self.assertEqual(20, self.client.get_max_elems('FooResource'))
+        self.assertEqual(100, self.client.get_max_elems('BarResource'))
+
     @requests_mock.Mocker()
     @mock.patch.object(wsmanclient.wsman.Client, 'pull', autospec=True)
     def test_enumerate_with_auto_pull_without_optimization(self, mock_requests,
@@ -88,6 +433,89 @@ class ClientTestCase(base.BaseTest):
         mock_pull.assert_called_once_with(self.client, 'FooResource',
                                           'enum-context-uuid', 42)
 
+    @requests_mock.Mocker()
+    def test_iter_enumerate(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][1]},
+             {'text': test_utils.WSManEnumerations['context'][2]},
+             {'text': test_utils.WSManEnumerations['context'][3]}])
+
+        items = self.client.iter_enumerate('FooResource')
+
+        instance_ids = [item[0].text for item in items]
+        self.assertEqual(['1', '2', '3', '4'], instance_ids)
+        self.assertEqual(4, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    def test_iter_enumerate_clears_consumed_items(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][1]},
+             {'text': test_utils.WSManEnumerations['context'][2]},
+             {'text': test_utils.WSManEnumerations['context'][3]}])
+
+        items = []
+        for item in self.client.iter_enumerate('FooResource'):
+            self.assertEqual(1, len(item))
+            items.append(item)
+
+        self.assertEqual(4, len(items))
+        self.assertEqual([0, 0, 0, 0], [len(item) for item in items])
+        self.assertEqual([None, None, None, None],
+                         [item.getparent() for item in items])
+
+    @requests_mock.Mocker()
+    def test_iter_enumerate_is_lazy(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][1]},
+             {'text': test_utils.WSManEnumerations['context'][2]},
+             {'text': test_utils.WSManEnumerations['context'][3]}])
+
+        items = self.client.iter_enumerate('FooResource')
+        next(items)
+
+        self.assertEqual(2, mock_requests.call_count)
+
+    @requests_mock.Mocker()
+    def test_iter_enumerate_releases_context(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][1]},
+             {'text': '<result>released</result>'}])
+
+        items = self.client.iter_enumerate('FooResource')
+        next(items)
+        items.close()
+
+        self.assertEqual(3, mock_requests.call_count)
+        release_xml = lxml.etree.fromstring(mock_requests.last_request.body)
+        self.assertEqual(
+            wsmanclient.wsman.NS_WSMAN_ENUM + '/Release',
+            release_xml.find('.//{%s}Action' %
+                             wsmanclient.wsman.NS_WS_ADDR).text)
+        self.assertEqual(
+            'enum-context-uuid',
+            release_xml.find('.//{%s}EnumerationContext' %
+                             wsmanclient.wsman.NS_WSMAN_ENUM).text)
+
+    @requests_mock.Mocker()
+    def test_iter_enumerate_without_release_at_end(self, mock_requests):
+        mock_requests.post(
+            'https://1.2.3.4:443/wsman',
+            [{'text': test_utils.WSManEnumerations['context'][0]},
+             {'text': test_utils.WSManEnumerations['context'][3]}])
+
+        items = list(self.client.iter_enumerate('FooResource'))
+
+        self.assertEqual(1, len(items))
+        self.assertEqual(2, mock_requests.call_count)
+
     @requests_mock.Mocker()
     def test_pull(self, mock_requests):
         expected_resp = '<result>yay!</result>'
@@ -97,6 +525,17 @@ class ClientTestCase(base.BaseTest):
 
         self.assertEqual('yay!', resp.text)
 
+    @requests_mock.Mocker()
+    def test_get(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+
+        resp = self.client.get('http://resource', {'selector': 'foo'})
+
+        self.assertEqual('yay!', resp.text)
+        self.assertIn('http://schemas.xmlsoap.org/ws/2004/09/transfer/Get',
+                      mock_requests.last_request.text)
+
     @requests_mock.Mocker()
     def test_invoke(self, mock_requests):
         expected_resp = '<result>yay!</result>'
@@ -107,6 +546,63 @@ class ClientTestCase(base.BaseTest):
 
         self.assertEqual('yay!', resp.text)
 
+    @requests_mock.Mocker()
+    def test_requests_reuse_session(self, mock_requests):
+        mock_requests.post('https://1.2.3.4:443/wsman',
+                           text='<result>yay!</result>')
+
+        self.client.enumerate('resource', auto_pull=False)
+        session = self.client._session
+        self.client.invoke('http://resource', 'method', {}, {})
+
+        self.assertIsNotNone(session)
+        self.assertIs(session, self.client._session)
+        self.assertEqual(2, mock_requests.call_count)
+
+    @mock.patch('time.time', autospec=True)
+    def test_idle_session_is_dropped(self, mock_time):
+        mock_time.return_value = 100
+        session = self.client._get_session()
+
+        mock_time.return_value = 100 + self.client.pool_idle_timeout
+        self.assertIs(session, self.client._get_session())
+
+        mock_time.return_value = 101 + 2 * self.client.pool_idle_timeout
+        self.assertIsNot(session, self.client._get_session())
+
+    def test_close(self):
+        with wsmanclient.wsman.Client(**test_utils.FAKE_ENDPOINT) as client:
+            client._get_session()
+            self.assertIsNotNone(client._session)
+
+        self.assertIsNone(client._session)
+
+    def test_session_pool_size(self):
+        client = wsmanclient.wsman.Client(pool_maxsize=5,
+                                          **test_utils.FAKE_ENDPOINT)
+        adapter = client._get_session().get_adapter(client.endpoint)
+
+        self.assertEqual(5, adapter._pool_maxsize)
+
+
+class _BrokenBody(object):
+    """Response body losing the connection after the first chunk"""
+
+    closed = False
+
+    def __init__(self, chunk):
+        self._chunk = chunk
+
+    def read(self, *args, **kwargs):
+        chunk, self._chunk = self._chunk, None
+        if chunk is None:
+            raise requests.packages.urllib3.exceptions.ProtocolError(
+                'Connection broken')
+        return chunk
+
+    def close(self):
+        pass
+
 
 class PayloadTestCase(base.BaseTest):
 
@@ -240,6 +736,75 @@ class PayloadTestCase(base.BaseTest):
         self.assertEqual(lxml.etree.tostring(expected_payload_obj),
                          lxml.etree.tostring(payload_obj))
 
+    @mock.patch.object(uuid, 'uuid4', autospec=True)
+    def test_build_get(self, mock_uuid):
+        expected_payload = """<?xml version="1.0" ?>
+<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope"
+            xmlns:wsa="http://schemas.xmlsoap.org/ws/2004/08/addressing"
+            xmlns:wsman="http://schemas.dmtf.org/wbem/wsman/1/wsman.xsd">
+    <s:Header>
+        <wsa:To s:mustUnderstand="true">http://host:443/wsman</wsa:To>
+        <wsman:ResourceURI s:mustUnderstand="true">http://resource_uri</wsman:ResourceURI>
+        <wsa:MessageID s:mustUnderstand="true">uuid:1234-12</wsa:MessageID>
+        <wsa:ReplyTo>
+            <wsa:Address>http://schemas.xmlsoap.org/ws/2004/08/addressing/role/anonymous</wsa:Address>
+        </wsa:ReplyTo>
+        <wsa:Action s:mustUnderstand="true">http://schemas.xmlsoap.org/ws/2004/09/transfer/Get</wsa:Action>
+        <wsman:SelectorSet>
+            <wsman:Selector Name="InstanceID">JID_42</wsman:Selector>
+        </wsman:SelectorSet>
+    </s:Header>
+    <s:Body/>
+</s:Envelope>
+"""  # noqa
+        expected_payload_obj = lxml.objectify.fromstring(expected_payload)
+
+        mock_uuid.return_value = '1234-12'
+        payload = wsmanclient.wsman._GetPayload(
+            'http://host:443/wsman', 'http://resource_uri',
+            {'InstanceID': 'JID_42'}).build()
+        payload_obj = lxml.objectify.fromstring(payload)
+
+        self.assertEqual(lxml.etree.tostring(expected_payload_obj),
+                         lxml.etree.tostring(payload_obj))
+
+    @mock.patch.object(uuid, 'uuid4', autospec=True)
+    def test_build_put_fragment(self, mock_uuid):
+        expected_payload = """<?xml version="1.0" ?>
+<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope"
+            xmlns:wsa="http://schemas.xmlsoap.org/ws/2004/08/addressing"
+            xmlns:wsman="http://schemas.dmtf.org/wbem/wsman/1/wsman.xsd">
+    <s:Header>
+        <wsa:To s:mustUnderstand="true">http://host:443/wsman</wsa:To>
+        <wsman:ResourceURI s:mustUnderstand="true">http://resource_uri</wsman:ResourceURI>
+        <wsa:MessageID s:mustUnderstand="true">uuid:1234-12</wsa:MessageID>
+        <wsa:ReplyTo>
+            <wsa:Address>http://schemas.xmlsoap.org/ws/2004/08/addressing/role/anonymous</wsa:Address>
+        </wsa:ReplyTo>
+        <wsa:Action s:mustUnderstand="true">http://schemas.xmlsoap.org/ws/2004/09/transfer/Put</wsa:Action>
+        <wsman:SelectorSet>
+            <wsman:Selector Name="InstanceID">JID_42</wsman:Selector>
+        </wsman:SelectorSet>
+        <wsman:FragmentTransfer s:mustUnderstand="true" Dialect="http://www.w3.org/TR/1999/REC-xpath-19991116">JobStatus</wsman:FragmentTransfer>
+    </s:Header>
+    <s:Body>
+        <wsman:XmlFragment>
+            <ns0:JobStatus xmlns:ns0="http://resource_uri">Failed</ns0:JobStatus>
+        </wsman:XmlFragment>
+    </s:Body>
+</s:Envelope>
+"""  # noqa
+        expected_payload_obj = lxml.objectify.fromstring(expected_payload)
+
+        mock_uuid.return_value = '1234-12'
+        payload = wsmanclient.wsman._PutFragmentPayload(
+            'http://host:443/wsman', 'http://resource_uri',
+            {'InstanceID': 'JID_42'}, 'JobStatus', 'Failed').build()
+        payload_obj = lxml.objectify.fromstring(payload)
+
+        self.assertEqual(lxml.etree.tostring(expected_payload_obj),
+                         lxml.etree.tostring(payload_obj))
+
     @mock.patch.object(uuid, 'uuid4', autospec=True)
     def test_build_invoke(self, mock_uuid):
         expected_payload = """<?xml version="1.0" ?>
@@ -313,3 +878,60 @@ class PayloadTestCase(base.BaseTest):
 
         self.assertEqual(lxml.etree.tostring(expected_payload_obj),
                          lxml.etree.tostring(payload_obj))
+
+    def test_build_matches_tree(self):
+        payload = wsmanclient.wsman._InvokePayload(
+            'http://host:443/wsman', 'http://resource_uri', 'method',
+            {'selector': u'<foo> & \xe9'},
+            {'property': ['foo', 'b\rar'], 'other': '"baz"'})
+
+        built = payload.build()
+        self.assertEqual(lxml.etree.tostring(payload._build_tree()), built)
+
+    @mock.patch.dict(wsmanclient.wsman._payload_templates)
+    def test_build_with_empty_list_and_value(self):
+        for values in ([[], 'foo'], ['foo', []]):
+            wsmanclient.wsman._payload_templates.clear()
+            for value in values:
+                payload = wsmanclient.wsman._InvokePayload(
+                    'http://host:443/wsman', 'http://resource_uri', 'method',
+                    {'selector': 'foo'}, {'property': value})
+                payload_xml = lxml.etree.fromstring(payload.build())
+
+                self.assertEqual(
+                    [value] if value else [],
+                    [elem.text for elem in payload_xml.iterfind(
+                        './/{http://resource_uri}property')])
+
+    def test_build_with_non_string_values(self):
+        payload = wsmanclient.wsman._InvokePayload(
+            'http://host:443/wsman', 'http://resource_uri', 'method',
+            {'selector': None}, {'property': [1, True], 'other': None})
+        payload_xml = lxml.etree.fromstring(payload.build())
+
+        self.assertEqual(
+            [None],
+            [elem.text for elem in payload_xml.iterfind(
+                './/{%s}Selector' % wsmanclient.wsman.NS_WSMAN)])
+        self.assertEqual(
+            ['1', 'True'],
+            [elem.text for elem in payload_xml.iterfind(
+                './/{http://resource_uri}property')])
+        self.assertIsNone(
+            payload_xml.find('.//{http://resource_uri}other').text)
+
+    @mock.patch.dict(wsmanclient.wsman._payload_templates, clear=True)
+    @mock.patch.object(wsmanclient.wsman, '_PayloadTemplate', autospec=True,
+                       side_effect=wsmanclient.wsman._PayloadTemplate)
+    def test_build_reuses_template(self, mock_template):
+        for context in ('context-1', 'context-2'):
+            payload = wsmanclient.wsman._PullPayload(
+                'http://host:443/wsman', 'http://resource_uri', context)
+            payload_xml = lxml.etree.fromstring(payload.build())
+
+            self.assertEqual(
+                context,
+                payload_xml.find('.//{%s}EnumerationContext' %
+                                 wsmanclient.wsman.NS_WSMAN_ENUM).text)
+
+        self.assertEqual(1, mock_template.call_count)
@@ -116,6 +116,12 @@ JobEnumerations = {
     },
 }
 
+JobGets = {
+    uris.DCIM_LifecycleJob: {
+        'ok': load_wsman_xml('lifecycle_job-get-ok'),
+    },
+}
+
 JobInvocations = {
     uris.DCIM_BIOSService: {
         'CreateTargetedConfigJob': {
@@ -43,11 +43,27 @@ class WSManRequestFailure(BaseClientException):
     msg_fmt = ('WSMan request failed')
 
 
+class WSManCircuitOpen(WSManRequestFailure):
+    msg_fmt = ('Requests to %(endpoint)s are failing, not retrying for '
+               '%(retry_in).1f seconds')
+
+
+class WSManDeadlineExceeded(WSManRequestFailure):
+    msg_fmt = ('Deadline of the operation on %(endpoint)s exceeded')
+
+
+class WSManCaptureMiss(WSManRequestFailure):
+    msg_fmt = ('No response to %(action)s of %(resource_uri)s on %(host)s '
+               'was captured')
+
+
 class WSManInvalidResponse(BaseClientException):
 
-    def __init__(self, status_code, reason):
+    def __init__(self, status_code, reason, fault_subcode=None):
         self.status_code = status_code
         self.reason = reason
+        # local name of the subcode of the SOAP fault, eg. 'ActionNotSupported'
+        self.fault_subcode = fault_subcode
         msg_fmt = ('Invalid response received. Status code: "%(status_code)s", '
                    'reason: "%(reason)s"')
 
@@ -0,0 +1,215 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Running client operations across many nodes concurrently
+"""
+
+import collections
+import logging
+import threading
+
+from concurrent import futures
+
+from wsmanclient import exceptions
+from wsmanclient.dracclient.client import DRACClient
+
+LOG = logging.getLogger(__name__)
+
+# number of worker threads shared by all the hosts of a fleet
+DEFAULT_MAX_WORKERS = 64
+# iDRACs reject more than a few parallel sessions, so calls to the same host
+# are limited separately
+DEFAULT_PER_HOST_LIMIT = 2
+
+FleetResult = collections.namedtuple('FleetResult',
+                                     ['host', 'result', 'error'])
+
+
+class Fleet(object):
+    """Runs client operations across many nodes concurrently"""
+
+    def __init__(self, hosts, username=None, password=None,
+                 client_cls=DRACClient, max_workers=DEFAULT_MAX_WORKERS,
+                 per_host_limit=DEFAULT_PER_HOST_LIMIT, **kwargs):
+        """Creates fleet object
+
+        :param hosts: list of nodes. Each item is either the hostname or IP
+                      of the node, or a dictionary of client arguments with
+                      at least the 'host' key, overriding the fleet-wide ones
+        :param username: username for accessing the nodes
+        :param password: password for accessing the nodes
+        :param client_cls: client class used for talking to the nodes, eg.
+                           DRACClient or ThinkServerClient
+        :param max_workers: maximum number of calls in flight across the
+                            whole fleet
+        :param per_host_limit: maximum number of calls in flight to a single
+                               node
+        :param kwargs: additional arguments passed to the clients, eg. port
+                       or protocol
+        """
+        self.client_cls = client_cls
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+
+        defaults = dict(kwargs, username=username, password=password)
+        defaults.setdefault('pool_maxsize', per_host_limit)
+
+        self._client_args = collections.OrderedDict()
+        for host in hosts:
+            if not isinstance(host, dict):
+                host = {'host': host}
+
+            self._client_args[host['host']] = dict(defaults, **host)
+
+        self._clients = {}
+        # calls waiting for a call of the same host to finish, so that the
+        # workers only run calls which can proceed
+        self._queues = dict((host, collections.deque())
+                            for host in self._client_args)
+        self._in_flight = dict((host, 0) for host in self._client_args)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def hosts(self):
+        return list(self._client_args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Shuts down the workers and closes the clients"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            clients, self._clients = self._clients, {}
+            queued = []
+            for queue in self._queues.values():
+                queued.extend(call[0] for call in queue)
+                queue.clear()
+
+        for future in queued:
+            future.cancel()
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        for client in clients.values():
+            client.close()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(self.max_workers)
+
+            return self._executor
+
+    def get_client(self, host):
+        """Returns the client of a node, creating it if needed
+
+        :param host: hostname or IP of the node
+        :returns: a client_cls object
+        """
+        with self._lock:
+            client = self._clients.get(host)
+            if client is None:
+                client = self.client_cls(**self._client_args[host])
+                self._clients[host] = client
+
+            return client
+
+    def _call(self, host, future, method, args, kwargs):
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+
+            try:
+                result = getattr(self.get_client(host), method)(*args,
+                                                                **kwargs)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+        finally:
+            self._call_next(host)
+
+    def _call_next(self, host):
+        with self._lock:
+            queue = self._queues[host]
+            if not queue:
+                self._in_flight[host] -= 1
+                return
+
+            call = queue.popleft()
+
+        self._get_executor().submit(self._call, host, *call)
+
+    def submit(self, host, method, *args, **kwargs):
+        """Schedules a client method to be called on a single node
+
+        Calls beyond the per_host_limit of the node wait in its queue,
+        without taking a worker.
+
+        :param host: hostname or IP of the node
+        :param method: name of the client method to call
+        :param args: positional arguments of the method
+        :param kwargs: keyword arguments of the method
+        :returns: a concurrent.futures.Future of the result
+        """
+        future = futures.Future()
+        call = (future, method, args, kwargs)
+        with self._lock:
+            if self._in_flight[host] >= self.per_host_limit:
+                self._queues[host].append(call)
+                return future
+
+            self._in_flight[host] += 1
+
+        self._get_executor().submit(self._call, host, *call)
+        return future
+
+    def map(self, method, *args, **kwargs):
+        """Calls a client method on all nodes
+
+        Results are yielded as soon as they are available, in completion
+        order. Errors reported by a node don't stop the others.
+
+        :param method: name of the client method to call, eg.
+                       'list_physical_disks'
+        :param args: positional arguments of the method
+        :param kwargs: keyword arguments of the method
+        :returns: a generator of FleetResult objects, with the error set to
+                  the exception raised for the node
+        """
+        pending = dict((self.submit(host, method, *args, **kwargs), host)
+                       for host in self._client_args)
+        try:
+            for future in futures.as_completed(pending):
+                host = pending.pop(future)
+                try:
+                    result = future.result()
+                except exceptions.BaseClientException as exc:
+                    yield FleetResult(host, None, exc)
+                except Exception as exc:
+                    LOG.exception('Calling %(method)s on %(host)s failed',
+                                  {'method': method, 'host': host})
+                    yield FleetResult(host, None, exc)
+                else:
+                    yield FleetResult(host, result, None)
+        finally:
+            # the caller stopped consuming the results
+            for future in pending:
+                future.cancel()
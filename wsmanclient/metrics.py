@@ -0,0 +1,272 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Instrumentation of the WS-Man requests
+
+The hooks of a wsman.Client are called with a RequestEvent for every HTTP
+request sent, retried attempts included, once its response was parsed or the
+request failed::
+
+    collector = metrics.MetricsCollector()
+    client = wsmanclient.dracclient.client.DRACClient(
+        '1.2.3.4', 'username', 's3cr3t', hooks=[collector])
+    client.list_bios_settings()
+    collector.slowest_hosts()
+
+Hooks may be called from the prefetch worker threads of the client, so they
+have to be thread-safe.
+"""
+
+import bisect
+import collections
+import threading
+import time
+
+from lxml import etree as ElementTree
+import requests.exceptions
+
+from wsmanclient import exceptions
+
+OUTCOME_SUCCESS = 'success'
+OUTCOME_INVALID_RESPONSE = 'invalid_response'
+OUTCOME_REQUEST_FAILURE = 'request_failure'
+OUTCOME_DEADLINE_EXCEEDED = 'deadline_exceeded'
+OUTCOME_PARSE_ERROR = 'parse_error'
+OUTCOME_ERROR = 'error'
+
+# upper bounds of the buckets of the latency histograms in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0, 120.0)
+
+
+class RequestEvent(object):
+    """Instrumentation of a single request
+
+    The timings are in seconds, by phase:
+
+    - connect: resolving the hostname of the endpoint and establishing the
+      TCP connection
+    - tls: the TLS handshake
+    - server: sending the request and waiting for the response headers
+    - parse: receiving and parsing the body, which overlap as the body is
+      parsed while it arrives
+
+    The connection phases are only present when a new connection had to be
+    established.
+    """
+
+    __slots__ = ('host', 'action', 'resource_uri', 'request_size',
+                 'response_size', 'page', 'attempt', 'status_code',
+                 'timings', 'start', 'duration', 'outcome', 'error')
+
+    def __init__(self, host, action, resource_uri, request_size, page=None,
+                 attempt=1):
+        """Creates request event object
+
+        :param host: hostname or IP of the endpoint
+        :param action: value of the Action header of the request
+        :param resource_uri: URI of the resource
+        :param request_size: number of bytes of the payload
+        :param page: number of the page within an enumeration, 1 being the
+                     enumerate request and the following ones the pulls
+        :param attempt: number of the attempt of the request
+        """
+        self.host = host
+        self.action = action
+        self.resource_uri = resource_uri
+        self.request_size = request_size
+        self.response_size = 0
+        self.page = page
+        self.attempt = attempt
+        self.status_code = None
+        self.timings = {}
+        self.start = time.time()
+        self.duration = None
+        self.outcome = None
+        self.error = None
+
+    @property
+    def operation(self):
+        """Short name of the action, eg. Pull or the name of the method"""
+        return self.action.rsplit('/', 1)[-1]
+
+    def finish(self, error=None):
+        """Records the outcome of the request
+
+        :param error: the exception the request failed with, if any
+        """
+        self.duration = time.time() - self.start
+        self.outcome = _get_outcome(error)
+        self.error = error
+
+    def __repr__(self):
+        return ('<RequestEvent %(operation)s %(resource_uri)s on %(host)s: '
+                '%(outcome)s in %(duration).3fs>' % {
+                    'operation': self.operation,
+                    'resource_uri': self.resource_uri,
+                    'host': self.host,
+                    'outcome': self.outcome,
+                    'duration': self.duration or 0})
+
+
+def _get_outcome(error):
+    if error is None:
+        return OUTCOME_SUCCESS
+    elif isinstance(error, exceptions.WSManDeadlineExceeded):
+        return OUTCOME_DEADLINE_EXCEEDED
+    elif isinstance(error, exceptions.WSManInvalidResponse):
+        return OUTCOME_INVALID_RESPONSE
+    elif isinstance(error, (exceptions.WSManRequestFailure,
+                            requests.exceptions.RequestException)):
+        return OUTCOME_REQUEST_FAILURE
+    elif isinstance(error, ElementTree.XMLSyntaxError):
+        return OUTCOME_PARSE_ERROR
+
+    return OUTCOME_ERROR
+
+
+class Histogram(object):
+    """Histogram of values with fixed buckets"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Creates histogram object
+
+        :param buckets: sorted upper bounds of the buckets. Larger values
+                        are counted in an extra bucket.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        if self.count:
+            return self.sum / self.count
+
+    def quantile(self, q):
+        """Returns an estimate of a quantile
+
+        The value is interpolated linearly within the bucket the quantile
+        falls in, so it's only as accurate as the buckets are narrow.
+
+        :param q: the quantile, between 0 and 1
+        :returns: the estimate or None if no values were observed
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = (self.buckets[index] if index < len(self.buckets)
+                         else self.max)
+                return min(lower + (upper - lower) * (rank - seen) / count,
+                           self.max)
+            seen += count
+
+        return self.max
+
+    def to_dict(self):
+        return {'buckets': list(self.buckets),
+                'counts': list(self.counts),
+                'count': self.count,
+                'sum': self.sum,
+                'max': self.max}
+
+
+class MetricsCollector(object):
+    """In-process collector of the request metrics
+
+    Passed as hook to the clients, it keeps latency histograms of the
+    requests per host and per resource URI, and counts the outcomes and
+    bytes transferred.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Creates metrics collector object
+
+        :param buckets: upper bounds of the buckets of the histograms
+        """
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hosts = collections.defaultdict(self._new_histogram)
+            self.resources = collections.defaultdict(self._new_histogram)
+            self.outcomes = collections.Counter()
+            self.request_bytes = 0
+            self.response_bytes = 0
+
+    def _new_histogram(self):
+        return Histogram(self.buckets)
+
+    def __call__(self, event):
+        with self._lock:
+            self.hosts[event.host].observe(event.duration)
+            self.resources[event.resource_uri].observe(event.duration)
+            self.outcomes[event.outcome] += 1
+            self.request_bytes += event.request_size
+            self.response_bytes += event.response_size
+
+    def slowest_hosts(self, limit=10, quantile=0.95):
+        """Returns the hosts with the highest latency
+
+        :param limit: maximum number of hosts returned
+        :param quantile: quantile of the latencies compared
+        :returns: a list of (host, latency) tuples, slowest first
+        """
+        return self._slowest(self.hosts, limit, quantile)
+
+    def slowest_resources(self, limit=10, quantile=0.95):
+        """Returns the resource URIs with the highest latency
+
+        :param limit: maximum number of resource URIs returned
+        :param quantile: quantile of the latencies compared
+        :returns: a list of (resource_uri, latency) tuples, slowest first
+        """
+        return self._slowest(self.resources, limit, quantile)
+
+    def _slowest(self, histograms, limit, quantile):
+        with self._lock:
+            latencies = [(key, histogram.quantile(quantile))
+                         for (key, histogram) in histograms.items()]
+
+        return sorted(latencies, key=lambda latency: latency[1],
+                      reverse=True)[:limit]
+
+    def snapshot(self):
+        """Returns the metrics as a dictionary, eg. for exporting as JSON"""
+        with self._lock:
+            return {
+                'hosts': dict((host, histogram.to_dict())
+                              for (host, histogram) in self.hosts.items()),
+                'resources': dict(
+                    (resource_uri, histogram.to_dict())
+                    for (resource_uri, histogram) in self.resources.items()),
+                'outcomes': dict(self.outcomes),
+                'request_bytes': self.request_bytes,
+                'response_bytes': self.response_bytes}
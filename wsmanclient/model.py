@@ -1,51 +1,113 @@
-import json
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Models of the resources returned by the clients
+
+The models are immutable tuples with named fields and no per-instance
+dictionary, so that large inventories stay compact. They are compared and
+hashed by value, and the fields missing from a resource default to None.
+"""
+
+import collections
+
+
+def _fields(name, field_names):
+    """Returns the base class of a model with the given fields
+
+    The fields default to None.
+    """
+    base = collections.namedtuple(name, field_names)
+    base.__new__.__defaults__ = (None,) * len(base._fields)
+    return base
 
 
 class StatusedResource(object):
     """
     An interface defining resource with an id and health status ('HealthStatus')
     """
-    def __init__(self, id, status):
-        self.id = id
-        self.status = status
-    def __repr__(self):
-        return json.dumps(self.__dict__)
-
-class CPU(StatusedResource): pass
-#  id', 'cores', 'speed', 'ht_enabled', 'model', 'status', 'turbo_enabled',
-#  'vt_enabled'
-        
-class Memory(StatusedResource): pass
-#  'id', 'size', 'speed', 'manufacturer', 'model', 'status'
-
-class PSU(StatusedResource): pass
+
+    __slots__ = ()
+
+
+class CPU(_fields('CPU', ['id', 'cores', 'speed', 'ht_enabled', 'model',
+                          'status', 'turbo_enabled', 'vt_enabled']),
+          StatusedResource):
+    __slots__ = ()
+
+
+class Memory(_fields('Memory', ['id', 'size', 'speed', 'manufacturer',
+                                'model', 'status']),
+             StatusedResource):
+    __slots__ = ()
+
+
 # See iDRAC Service Module - Windows Management Instrumentation.pdf for
 # more fields available
-#  'id', 'description', 'last_system_inventory_time', 'last_update_time',
-#  'primary_status'
+class PSU(_fields('PSU', ['id', 'description', 'last_system_inventory_time',
+                          'last_update_time', 'primary_status']),
+          StatusedResource):
+    __slots__ = ()
+
+
+class NICInterface(_fields('NICInterface', ['id', 'description',
+                                            'product_name', 'mac_address',
+                                            'linkspeed', 'status']),
+                   StatusedResource):
+    __slots__ = ()
+
+
+class BootMode(_fields('BootMode', ['id', 'name', 'is_current', 'is_next']),
+               StatusedResource):
+    __slots__ = ()
+
+
+class BootDevice(_fields('BootDevice', ['id', 'boot_mode',
+                                        'current_assigned_sequence',
+                                        'pending_assigned_sequence',
+                                        'bios_boot_string']),
+                 StatusedResource):
+    __slots__ = ()
+
 
-class NICInterface(StatusedResource): pass
-#  'id', 'description', 'product_name', 'mac_address', 'linkspeed'
+class Job(_fields('Job', ['id', 'name', 'start_time', 'until_time', 'message',
+                          'state', 'percent_complete']),
+          StatusedResource):
+    __slots__ = ()
 
-class BootMode(StatusedResource): pass
-#  'id', 'name', 'is_current', 'is_next'
 
-class BootDevice(StatusedResource): pass
-#  'id',  'boot_mode', 'current_assigned_sequence','pending_assigned_sequence',
-#  bios_boot_string'
+class PhysicalDisk(_fields('PhysicalDisk', ['id', 'description', 'controller',
+                                            'manufacturer', 'model',
+                                            'media_type', 'interface_type',
+                                            'size_mb', 'free_size_mb',
+                                            'serial_number',
+                                            'firmware_version', 'state',
+                                            'raid_state']),
+                   StatusedResource):
+    __slots__ = ()
 
-class Job(StatusedResource): pass
-#  'id', 'name', 'start_time', 'until_time','message', 'state',
-#  'percent_complete'
 
-class PhysicalDisk(StatusedResource): pass
-#  'id', 'description', 'controller', 'manufacturer', 'model', 'media_type',
-#  'interface_type', 'size_mb', 'free_size_mb', 'serial_number',
-#  'firmware_version', 'state', 'raid_state'
+class RAIDController(_fields('RAIDController', ['id', 'description',
+                                                'manufacturer', 'model',
+                                                'firmware_version']),
+                     StatusedResource):
+    __slots__ = ()
 
-class RAIDController(StatusedResource): pass
-#  'id', 'description', 'manufacturer', 'model','firmware_version'
 
-class VirtualDisk(StatusedResource): pass
-#  'id', 'name', 'description', 'controller', 'raid_level', 'size_mb','state',
-#  'raid_state', 'span_depth', 'span_length', 'pending_operations'
+class VirtualDisk(_fields('VirtualDisk', ['id', 'name', 'description',
+                                          'controller', 'raid_level',
+                                          'size_mb', 'state', 'raid_state',
+                                          'span_depth', 'span_length',
+                                          'pending_operations']),
+                  StatusedResource):
+    __slots__ = ()
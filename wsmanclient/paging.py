@@ -0,0 +1,110 @@
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Adaptive sizing of enumeration pages
+"""
+
+import logging
+
+LOG = logging.getLogger(__name__)
+
+# MaxElements used when the page size isn't learned
+DEFAULT_MAX_ELEMS = 100
+# bounds of the learned MaxElements
+MIN_MAX_ELEMS = 5
+MAX_MAX_ELEMS = 1000
+# Seconds a single page may take. Old iDRAC firmware times out on large pages,
+# so pages are kept well below the usual request timeouts.
+DEFAULT_TARGET_PAGE_TIME = 5.0
+# bytes a single page may take
+DEFAULT_MAX_PAGE_SIZE = 4 * 1024 * 1024
+# weight of the latest page in the moving averages
+SMOOTHING = 0.5
+
+
+def _average(average, sample):
+    if average is None:
+        return sample
+
+    return SMOOTHING * sample + (1 - SMOOTHING) * average
+
+
+class PageSizer(object):
+    """Learns the MaxElements of enumerations of a single resource
+
+    Tracks the time and size per item of the pages received, and picks the
+    largest page fitting both the time and the size budget, so that the
+    enumeration needs as few round-trips as possible without running into
+    timeouts. The page size grows at most twofold per page.
+    """
+
+    def __init__(self, initial=DEFAULT_MAX_ELEMS, minimum=MIN_MAX_ELEMS,
+                 maximum=MAX_MAX_ELEMS,
+                 target_page_time=DEFAULT_TARGET_PAGE_TIME,
+                 max_page_size=DEFAULT_MAX_PAGE_SIZE):
+        """Creates page sizer object
+
+        :param initial: MaxElements used until the first page is received
+        :param minimum: lower bound of MaxElements
+        :param maximum: upper bound of MaxElements
+        :param target_page_time: number of seconds a single page may take
+        :param max_page_size: number of bytes a single page may take
+        """
+        self.max_elems = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_page_time = target_page_time
+        self.max_page_size = max_page_size
+
+        #: moving average of the seconds taken by an item
+        self.item_time = None
+        #: moving average of the bytes taken by an item
+        self.item_size = None
+
+    def _clamp(self, max_elems):
+        return int(max(self.minimum, min(self.maximum, max_elems)))
+
+    def record(self, max_elems, items, elapsed, size):
+        """Records a page received
+
+        :param max_elems: MaxElements requested for the page
+        :param items: number of items received
+        :param elapsed: number of seconds the page took
+        :param size: number of bytes the page took
+        """
+        if not items:
+            if elapsed > self.target_page_time:
+                self.max_elems = self._clamp(max_elems // 2)
+            return
+
+        self.item_time = _average(self.item_time, float(elapsed) / items)
+        self.item_size = _average(self.item_size, float(size) / items)
+
+        budget = max_elems * 2
+        if self.item_time:
+            budget = min(budget, self.target_page_time / self.item_time)
+        if self.item_size:
+            budget = min(budget, self.max_page_size / self.item_size)
+
+        self.max_elems = self._clamp(budget)
+
+    def record_failure(self, max_elems):
+        """Records a page which couldn't be received
+
+        :param max_elems: MaxElements requested for the page
+        """
+        self.max_elems = self._clamp(max_elems // 2)
+        LOG.debug('Page of %(failed)d items failed, continuing with '
+                  '%(max_elems)d', {'failed': max_elems,
+                                    'max_elems': self.max_elems})
@@ -0,0 +1,298 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Builder of the CQL and WQL filter queries of the enumerations
+
+Conditions are built from properties with the comparison operators, and
+combined with & (and), | (or) and ~ (not). Values are quoted and escaped::
+
+    from wsmanclient import query
+
+    failed = ((query.Property('JobStatus') == 'Failed') &
+              (query.Property('JobStartTime') >= '20160711000000'))
+    doc = client.enumerate(uris.DCIM_LifecycleJob,
+                           filter_query=query.Query('DCIM_LifecycleJob',
+                                                    where=failed))
+
+Queries and conditions are accepted wherever a filter query string is, eg.
+by wsman.Client.enumerate and by the where argument of the list methods of
+the clients. They render to the syntax shared by the CQL and WQL dialects
+supported by the BMCs.
+"""
+
+import datetime
+import numbers
+import re
+
+from wsmanclient import exceptions, utils
+
+try:
+    _STRING_TYPES = (basestring,)
+except NameError:
+    _STRING_TYPES = (str,)
+
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _check_identifier(name):
+    if not (isinstance(name, _STRING_TYPES) and _IDENTIFIER_RE.match(name)):
+        raise exceptions.InvalidParameterValue(
+            reason='Invalid property or class name: %r' % (name,))
+
+    return name
+
+
+def literal(value):
+    """Renders a value as a literal of a query
+
+    Strings are double quoted, with the quotes and backslashes escaped.
+    Datetimes are rendered as quoted CIM datetimes.
+
+    :param value: a string, number, boolean or datetime
+    :returns: the literal
+    :raises: InvalidParameterValue on values of other types
+    """
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, numbers.Integral):
+        return str(value)
+    if isinstance(value, numbers.Real):
+        return repr(float(value))
+    if isinstance(value, datetime.datetime):
+        value = utils.format_cim_datetime(value)
+    if isinstance(value, _STRING_TYPES):
+        return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+
+    raise exceptions.InvalidParameterValue(
+        reason='Unsupported value in a query: %r' % (value,))
+
+
+class Condition(object):
+    """Condition of a query"""
+
+    #: precedence of the operator of the condition, higher binding tighter
+    precedence = 3
+
+    def render(self):
+        """Returns the text of the condition"""
+        raise NotImplementedError()
+
+    def _render_operand(self, precedence):
+        rendered = self.render()
+        if self.precedence < precedence:
+            return '(%s)' % rendered
+        return rendered
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def __eq__(self, other):
+        return (type(self) is type(other) and
+                self.render() == other.render())
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.render())
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__, self.render())
+
+
+class Raw(Condition):
+    """Condition given as text, rendered as is"""
+
+    precedence = 0
+
+    def __init__(self, text):
+        self.text = text
+
+    def render(self):
+        return self.text
+
+
+class Comparison(Condition):
+    """Comparison of a property with a value"""
+
+    def __init__(self, name, operator, value):
+        self.name = _check_identifier(name)
+        self.operator = operator
+        self.value = value
+
+    def render(self):
+        if self.value is None:
+            return '%s is %snull' % (self.name,
+                                     'not ' if self.operator == '!=' else '')
+
+        return '%s %s %s' % (self.name, self.operator, literal(self.value))
+
+
+class _Connective(Condition):
+
+    keyword = None
+
+    def __init__(self, *conditions):
+        operands = []
+        for condition in conditions:
+            if isinstance(condition, _STRING_TYPES):
+                condition = Raw(condition)
+            if type(condition) is type(self):
+                operands.extend(condition.operands)
+            else:
+                operands.append(condition)
+
+        if not operands:
+            raise exceptions.InvalidParameterValue(
+                reason='%s of no conditions' % type(self).__name__)
+        self.operands = tuple(operands)
+
+    def render(self):
+        if len(self.operands) == 1:
+            return self.operands[0].render()
+
+        return (' %s ' % self.keyword).join(
+            operand._render_operand(self.precedence)
+            for operand in self.operands)
+
+
+class And(_Connective):
+    """Conjunction of conditions"""
+
+    keyword = 'and'
+    precedence = 2
+
+
+class Or(_Connective):
+    """Disjunction of conditions"""
+
+    keyword = 'or'
+    precedence = 1
+
+
+class Not(Condition):
+    """Negation of a condition"""
+
+    def __init__(self, condition):
+        if isinstance(condition, _STRING_TYPES):
+            condition = Raw(condition)
+        self.condition = condition
+
+    def render(self):
+        return 'not %s' % self.condition._render_operand(self.precedence + 1)
+
+
+class Property(object):
+    """Property of the instances, compared to build conditions"""
+
+    def __init__(self, name):
+        self.name = _check_identifier(name)
+
+    def __eq__(self, value):
+        return Comparison(self.name, '=', value)
+
+    def __ne__(self, value):
+        return Comparison(self.name, '!=', value)
+
+    def __lt__(self, value):
+        return Comparison(self.name, '<', value)
+
+    def __le__(self, value):
+        return Comparison(self.name, '<=', value)
+
+    def __gt__(self, value):
+        return Comparison(self.name, '>', value)
+
+    def __ge__(self, value):
+        return Comparison(self.name, '>=', value)
+
+    __hash__ = object.__hash__
+
+    def in_(self, values):
+        """Returns the condition of the property having one of the values
+
+        Neither dialect has lists of values, so the condition is a
+        disjunction of equalities.
+        """
+        return Or(*[self == value for value in values])
+
+    def not_in(self, values):
+        """Returns the condition of the property having none of the values"""
+        return And(*[self != value for value in values])
+
+
+class Query(object):
+    """Query selecting properties of the instances of a class"""
+
+    def __init__(self, class_name, properties=None, where=None):
+        """Creates query object
+
+        :param class_name: name of the class of the instances, eg.
+                           'DCIM_LifecycleJob'
+        :param properties: names of the properties selected, all of them
+                           when None
+        :param where: Condition, or condition text, the instances must
+                      match, if any
+        """
+        self.class_name = _check_identifier(class_name)
+        self.properties = (None if properties is None else
+                           tuple(_check_identifier(name)
+                                 for name in properties))
+        if isinstance(where, _STRING_TYPES):
+            where = Raw(where) if where else None
+        self.condition = where
+
+    def select(self, *properties):
+        """Returns the query selecting the given properties"""
+        return Query(self.class_name, properties, self.condition)
+
+    def where(self, *conditions):
+        """Returns the query further restricted by the conditions"""
+        if self.condition is not None:
+            conditions = (self.condition,) + conditions
+        return Query(self.class_name, self.properties, And(*conditions))
+
+    def render(self):
+        """Returns the text of the query"""
+        query = 'select %s from %s' % (
+            '*' if self.properties is None else ', '.join(self.properties),
+            self.class_name)
+        if self.condition is not None:
+            query += ' where %s' % self.condition.render()
+
+        return query
+
+    def __eq__(self, other):
+        return isinstance(other, Query) and self.render() == other.render()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.render())
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return '<Query %s>' % self.render()
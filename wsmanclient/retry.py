@@ -0,0 +1,187 @@
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Retry policy and circuit breaker of the WSMan transport
+"""
+
+import logging
+import random
+import threading
+import time
+
+import requests.exceptions
+
+from wsmanclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+# status codes of BMCs being busy or restarting their web server
+RETRYABLE_STATUS_CODES = frozenset([502, 503, 504])
+
+# Errors after which the request certainly didn't reach the BMC, so that it
+# can be retried even if it isn't idempotent.
+_NOT_SENT_ERRORS = (requests.exceptions.ConnectTimeout,)
+
+# Errors which are likely to go away on their own, eg. a BMC rebooting.
+_TRANSIENT_ERRORS = (requests.exceptions.ConnectionError,
+                     requests.exceptions.Timeout,
+                     requests.exceptions.ChunkedEncodingError)
+
+
+class RetryPolicy(object):
+    """Exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=10.0):
+        """Creates retry policy object
+
+        :param max_attempts: maximum number of attempts of a single request,
+                             including the first one
+        :param backoff: number of seconds to wait before the first retry. It
+                        doubles with each retry.
+        :param max_backoff: maximum number of seconds to wait before a retry
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def is_retryable(self, error, idempotent):
+        """Classifies a request error
+
+        :param error: the requests exception raised, or the
+                      WSManInvalidResponse for the response received
+        :param idempotent: flag whether the request can be safely repeated
+        :returns: True if the request should be attempted again
+        """
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return True
+
+        if not idempotent:
+            return False
+
+        if isinstance(error, exceptions.WSManInvalidResponse):
+            return error.status_code in RETRYABLE_STATUS_CODES
+
+        return isinstance(error, _TRANSIENT_ERRORS)
+
+    def get_delay(self, attempt):
+        """Returns the number of seconds to wait before the next attempt
+
+        :param attempt: number of the attempt which failed, starting with 1
+        """
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+#: policy of clients which shouldn't retry requests
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class CircuitBreaker(object):
+    """Fails requests fast to an endpoint which keeps failing
+
+    After failure_threshold consecutive transient failures the circuit opens
+    and requests fail without being sent. Once reset_timeout seconds passed,
+    a single request is let through: the circuit closes if it succeeds and
+    opens again if it fails.
+    """
+
+    def __init__(self, endpoint, failure_threshold=5, reset_timeout=30.0):
+        """Creates circuit breaker object
+
+        :param endpoint: endpoint the breaker is guarding
+        :param failure_threshold: number of consecutive failures opening the
+                                  circuit
+        :param reset_timeout: number of seconds after which a request is let
+                              through an open circuit
+        """
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def before_request(self):
+        """Checks whether a request may be sent
+
+        :raises: WSManCircuitOpen if the circuit is open
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            retry_in = self._opened_at + self.reset_timeout - time.time()
+            if retry_in > 0 or self._probing:
+                raise exceptions.WSManCircuitOpen(endpoint=self.endpoint,
+                                                  retry_in=max(retry_in, 0))
+
+            # let a single probe through
+            self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                LOG.info('Closing circuit of %s', self.endpoint)
+
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_cancelled(self):
+        """Records a request which didn't tell anything about the endpoint
+
+        Eg. one which failed before being sent. If it was the probe of an open
+        circuit, the next request is let through instead.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    LOG.warning('Opening circuit of %(endpoint)s after '
+                                '%(failures)d failures',
+                                {'endpoint': self.endpoint,
+                                 'failures': self._failures})
+
+                self._opened_at = time.time()
+                self._probing = False
+
+
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(endpoint):
+    """Returns the circuit breaker of an endpoint
+
+    Clients of the same endpoint share the breaker.
+
+    :param endpoint: URL of the WS-Man endpoint
+    :returns: a CircuitBreaker object
+    """
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(endpoint)
+        if breaker is None:
+            breaker = _circuit_breakers[endpoint] = CircuitBreaker(endpoint)
+
+        return breaker
@@ -0,0 +1,417 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Declarative description of the resource views
+
+A View describes a resource once: its resource URI, the element of its
+instances and its fields, each mapping a property to an attribute of the
+model with the type and the map of its values. The parser, the model class
+and the projection query of the view are generated from the description::
+
+    VIRTUAL_DISK_VIEW = schema.View('VirtualDisk', uris.DCIM_VirtualDiskView, [
+        schema.Field('id', 'FQDD'),
+        schema.Field('size_mb', 'SizeInBytes', type=schema.megabytes),
+        schema.Field('state', 'PrimaryStatus', values=DISK_STATUS)])
+
+    doc = client.enumerate(VIRTUAL_DISK_VIEW.resource_uri)
+    disks = VIRTUAL_DISK_VIEW.parse_all(doc)
+
+A projection of a view on some of its fields only requests their
+properties, through the select list of the filter of the enumeration::
+
+    view = VIRTUAL_DISK_VIEW.project(['state'])
+    disks = view.parse_all(view.enumerate(client))
+
+Single instances are read by their selectors::
+
+    disk = VIRTUAL_DISK_VIEW.get(client, {'FQDD': 'Disk.Virtual.0'})
+"""
+
+import collections
+import logging
+
+from wsmanclient import exceptions, query, utils, wsman
+
+LOG = logging.getLogger(__name__)
+
+# status codes of the SOAP faults of rejected requests, which are retried in
+# another way, unlike the other failures
+_FAULT_STATUS_CODES = frozenset([400, 500])
+
+# fault subcodes of endpoints not supporting a request at all, as opposed to
+# eg. the one of an instance which doesn't exist
+_NOT_SUPPORTED_SUBCODES = frozenset(['ActionNotSupported',
+                                     'UnsupportedFeature'])
+
+
+def boolean(value):
+    """Converts a CIM boolean"""
+    return value.lower() == 'true'
+
+
+def megabytes(value):
+    """Converts a size in bytes to megabytes"""
+    return int(value) / 2 ** 20
+
+
+class Field(object):
+    """Field of a view, mapping a property to an attribute of the model"""
+
+    def __init__(self, name, property_name, type=None, values=None,
+                 optional=False, multiple=False):
+        """Creates field object
+
+        :param name: name of the attribute of the model
+        :param property_name: name of the property of the instances
+        :param type: callable converting the text of the property, eg. int
+        :param values: dictionary mapping the values of the property, once
+                       converted, to the ones of the attribute
+        :param optional: whether the property may be missing from the
+                         instances, the attribute being None then. Missing
+                         properties raise KeyError otherwise.
+        :param multiple: whether the property is multi-valued, the attribute
+                         being the list of its values then
+        """
+        self.name = name
+        self.property_name = property_name
+        self.type = type
+        self.values = values
+        self.optional = optional
+        self.multiple = multiple
+
+    def get_converter(self):
+        """Returns the function converting a value of the property
+
+        Nil values aren't converted, they map to None.
+        """
+        type_, values = self.type, self.values
+        if type_ is None and values is None:
+            return None
+
+        def convert(value):
+            if value is None:
+                return None
+            if type_ is not None:
+                value = type_(value)
+            if values is not None:
+                value = values[value]
+            return value
+
+        return convert
+
+
+class View(object):
+    """View of a resource, mapping its instances to model objects"""
+
+    def __init__(self, name, resource_uri, fields, element=None,
+                 namespace=None, model=None):
+        """Creates view object
+
+        :param name: name of the model class generated
+        :param resource_uri: URI of the resource
+        :param fields: list of Field objects
+        :param element: name of the elements of the instances, defaults to
+                        the last segment of the resource URI
+        :param namespace: namespace of the properties, defaults to the
+                          resource URI
+        :param model: callable creating the model objects from the
+                      attributes passed as keyword arguments, defaults to a
+                      namedtuple with the fields as attributes
+        """
+        self.name = name
+        self.resource_uri = resource_uri
+        self.fields = tuple(fields)
+        self.class_name = resource_uri.rsplit('/', 1)[-1]
+        self.element = element or self.class_name
+        self.namespace = namespace or resource_uri
+        self.model = model or collections.namedtuple(
+            name, [field.name for field in self.fields])
+
+        self.property_names = []
+        for field in self.fields:
+            if field.property_name not in self.property_names:
+                self.property_names.append(field.property_name)
+
+        self._names = frozenset(self.property_names)
+        self._lists = tuple(set(field.property_name for field in self.fields
+                                if field.multiple))
+        self._getters = tuple(self._get_getter(field)
+                              for field in self.fields)
+
+        # view this view is a projection of, if any
+        self.parent = None
+        self._projections = {}
+
+    def _get_getter(self, field):
+        convert = field.get_converter()
+        if field.multiple and convert is not None:
+            def convert_all(values):
+                return [convert(value) for value in values]
+
+            return (field.name, field.property_name, field.optional,
+                    convert_all)
+
+        return field.name, field.property_name, field.optional, convert
+
+    def parse(self, item):
+        """Parses an instance and creates the model object
+
+        :param item: the element of the instance
+        :returns: a model object
+        :raises: KeyError when a property isn't optional and is missing
+        """
+        return self.model(**self.parse_attrs(item))
+
+    def parse_attrs(self, item):
+        """Parses an instance without creating the model object
+
+        :param item: the element of the instance
+        :returns: a dictionary of the attributes of the model
+        :raises: KeyError when a property isn't optional and is missing
+        """
+        properties = utils.decode_item(item, self.namespace, self._names,
+                                       self._lists)
+        return self._convert(properties)
+
+    def _convert(self, properties):
+        attrs = {}
+        for name, property_name, optional, convert in self._getters:
+            if optional:
+                value = properties.get(property_name)
+            else:
+                value = properties[property_name]
+
+            if convert is not None:
+                value = convert(value)
+
+            attrs[name] = value
+
+        return attrs
+
+    def parse_all(self, doc):
+        """Parses all the instances of a document
+
+        :param doc: the element tree object, eg. returned by enumerate
+        :returns: a list of model objects
+        """
+        return [self.parse(item)
+                for item in utils.find_xml(doc, self.element, self.namespace,
+                                           find_all=True)]
+
+    def project(self, fields):
+        """Returns the projection of the view on some of its fields
+
+        The id field, if the view has one, is always part of the projection.
+        The model objects parsed by the projection have the other fields set
+        to None.
+
+        :param fields: names of the fields, None for all of them
+        :returns: a View object, the view itself when fields is None
+        :raises: InvalidParameterValue on unknown fields
+        """
+        if fields is None:
+            return self
+
+        key = frozenset(fields)
+        try:
+            return self._projections[key]
+        except KeyError:
+            pass
+
+        unknown = key.difference(field.name for field in self.fields)
+        if unknown:
+            raise exceptions.InvalidParameterValue(
+                reason='Unknown fields of %s: %s' % (
+                    self.name, ', '.join(sorted(unknown))))
+
+        view = View(self.name, self.resource_uri,
+                    [field for field in self.fields
+                     if field.name in key or field.name == 'id'],
+                    self.element, self.namespace, self.model)
+        view.parent = self
+
+        return self._projections.setdefault(key, view)
+
+    def enumerate(self, client, where=None):
+        """Enumerates the instances of the resource
+
+        Projections only request the properties of their fields. Endpoints
+        rejecting the select list get the whole instances requested instead,
+        and the client remembers not to send it again for the resource.
+
+        :param client: an instance of WSManClient
+        :param where: query.Condition, or condition text, the instances must
+                      match, if any
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+        if (self.parent is None or
+                self.resource_uri in client.unsupported_projections):
+            filter_query = None
+            if where is not None:
+                filter_query = query.Query(self.class_name,
+                                           where=where).render()
+            return client.enumerate(self.resource_uri,
+                                    filter_query=filter_query)
+
+        try:
+            return client.enumerate(self.resource_uri,
+                                    filter_query=self.query(where))
+        except exceptions.WSManInvalidResponse as exc:
+            if exc.status_code not in _FAULT_STATUS_CODES:
+                raise
+            LOG.warning('Projection of %(resource_uri)s failed, enumerating '
+                        'the whole instances: %(error)s',
+                        {'resource_uri': self.resource_uri, 'error': exc})
+
+        doc = self.parent.enumerate(client, where)
+        client.unsupported_projections.add(self.resource_uri)
+        return doc
+
+    def get(self, client, selectors):
+        """Reads the instance with the given selectors
+
+        Views needing a single property besides the selectors, eg. the
+        projection of the jobs on their state, read it with a fragment
+        transfer. The others read the instance with a Get, which returns the
+        whole instance even for projections.
+
+        Endpoints rejecting the fragment transfer or the Get of the resource
+        get the instance read the next way down, a Get or an enumeration
+        filtered on the selectors. The client remembers not to send the
+        rejected request again if the fault tells it isn't supported, or
+        else once the instance is found: a missing instance also fails them.
+
+        :param client: an instance of WSManClient
+        :param selectors: dict of the selectors identifying the instance
+        :returns: a model object, None when there is no such instance
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+        fragment = self._get_fragment(selectors)
+        if (fragment is None or
+                self.resource_uri in client.unsupported_fragments):
+            return self._get_instance(client, selectors)
+
+        try:
+            instance = self._parse_fragment(
+                client.get_fragment(self.resource_uri, selectors, fragment),
+                selectors, fragment)
+        except exceptions.WSManInvalidResponse as exc:
+            if exc.status_code not in _FAULT_STATUS_CODES:
+                raise
+            if exc.fault_subcode in _NOT_SUPPORTED_SUBCODES:
+                self._fragments_unsupported(client)
+                return self._get_instance(client, selectors)
+            LOG.debug('Fragment transfer of %(resource_uri)s failed, reading '
+                      'the instance: %(error)s',
+                      {'resource_uri': self.resource_uri, 'error': exc})
+            instance = None
+
+        if instance is not None:
+            return instance
+
+        instance = self._get_instance(client, selectors)
+        if instance is not None:
+            self._fragments_unsupported(client)
+
+        return instance
+
+    def _fragments_unsupported(self, client):
+        LOG.warning('Fragment transfer of %(resource_uri)s is not '
+                    'supported, reading the whole instances instead',
+                    {'resource_uri': self.resource_uri})
+        client.unsupported_fragments.add(self.resource_uri)
+
+    def _get_instance(self, client, selectors):
+        get_failed = False
+        if self.resource_uri not in client.unsupported_gets:
+            try:
+                return self._parse_first(client.get(self.resource_uri,
+                                                    selectors))
+            except exceptions.WSManInvalidResponse as exc:
+                if exc.status_code not in _FAULT_STATUS_CODES:
+                    raise
+                if exc.fault_subcode in _NOT_SUPPORTED_SUBCODES:
+                    self._gets_unsupported(client)
+                else:
+                    LOG.debug('Get of %(resource_uri)s failed, enumerating '
+                              'the instance: %(error)s',
+                              {'resource_uri': self.resource_uri,
+                               'error': exc})
+                    get_failed = True
+
+        # selectors are strings, even if given as numbers
+        where = query.And(*[query.Property(name) == '%s' % value
+                            for name, value in sorted(selectors.items())])
+        instance = self._parse_first(self.enumerate(client, where))
+        if get_failed and instance is not None:
+            self._gets_unsupported(client)
+
+        return instance
+
+    def _gets_unsupported(self, client):
+        LOG.warning('Get of %(resource_uri)s is not supported, enumerating '
+                    'the instances instead',
+                    {'resource_uri': self.resource_uri})
+        client.unsupported_gets.add(self.resource_uri)
+
+    def _get_fragment(self, selectors):
+        """Returns the only property needed besides the selectors, if any"""
+        properties = [name for name in self.property_names
+                      if name not in selectors]
+        if len(properties) != 1 or properties[0] in self._lists:
+            return None
+
+        return properties[0]
+
+    def _parse_fragment(self, doc, selectors, fragment):
+        """Parses the response of a fragment transfer
+
+        :returns: a model object, None when the response doesn't hold the
+                  fragment
+        """
+        fragment_elem = doc.find('.//{%s}XmlFragment' % wsman.NS_WSMAN)
+        if fragment_elem is None:
+            return None
+
+        properties = utils.decode_item(fragment_elem, self.namespace,
+                                       [fragment])
+        if fragment not in properties:
+            return None
+
+        for name, value in selectors.items():
+            if name in self._names:
+                properties[name] = '%s' % value
+
+        return self.model(**self._convert(properties))
+
+    def _parse_first(self, doc):
+        item = utils.find_xml(doc, self.element, self.namespace)
+        if item is None:
+            return None
+
+        return self.parse(item)
+
+    def query(self, where=None):
+        """Returns the projection query selecting the fields of the view
+
+        :param where: query.Condition, or condition text, the instances must
+                      match, if any
+        :returns: the query, in the syntax common to the CQL and WQL
+                  dialects
+        """
+        return query.Query(self.class_name, self.property_names,
+                           where).render()
@@ -0,0 +1,337 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Data served by the fake WS-Man server
+"""
+
+import glob
+import logging
+import os
+import re
+import uuid
+from xml.sax import saxutils
+
+from lxml import etree as ElementTree
+
+from wsmanclient import wsman
+
+LOG = logging.getLogger(__name__)
+
+MOCKS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                         'dracclient', 'tests', 'wsman_mocks')
+
+_ITEMS_TAGS = ['{%s}Items' % wsman.NS_WSMAN,
+               '{%s}Items' % wsman.NS_WSMAN_ENUM]
+_OUTPUT_SUFFIX = '_OUTPUT'
+
+_ENVELOPE = (
+    u'<s:Envelope xmlns:s="%(ns_soap_env)s" xmlns:wsa="%(ns_ws_addr)s" '
+    u'xmlns:wsen="%(ns_wsman_enum)s" xmlns:wsman="%(ns_wsman)s">'
+    u'<s:Header>'
+    u'<wsa:To>%(ns_ws_addr_anonym_role)s</wsa:To>'
+    u'<wsa:Action>%%(action)s</wsa:Action>'
+    u'<wsa:RelatesTo>%%(relates_to)s</wsa:RelatesTo>'
+    u'<wsa:MessageID>uuid:%%(message_id)s</wsa:MessageID>'
+    u'</s:Header>'
+    u'<s:Body>%%(body)s</s:Body>'
+    u'</s:Envelope>' % {
+        'ns_soap_env': wsman.NS_SOAP_ENV,
+        'ns_ws_addr': wsman.NS_WS_ADDR,
+        'ns_wsman_enum': wsman.NS_WSMAN_ENUM,
+        'ns_wsman': wsman.NS_WSMAN,
+        'ns_ws_addr_anonym_role': wsman.NS_WS_ADDR_ANONYM_ROLE})
+
+_CONDITION_RE = re.compile(r'^\s*(\w+)\s*(!=|=)\s*"([^"]*)"\s*$')
+_WHERE_RE = re.compile(r'\swhere\s(.*)$', re.IGNORECASE | re.DOTALL)
+_OR_RE = re.compile(r'\sor\s', re.IGNORECASE)
+_AND_RE = re.compile(r'\sand\s', re.IGNORECASE)
+
+
+class Item(object):
+    """Instance of a resource"""
+
+    __slots__ = ('xml', 'properties')
+
+    def __init__(self, xml, properties):
+        """Creates item object
+
+        :param xml: serialized element of the instance, declaring its
+                    namespaces
+        :param properties: dictionary of the property values used for
+                           filtering
+        """
+        self.xml = xml
+        self.properties = properties
+
+    @classmethod
+    def from_element(cls, elem):
+        properties = dict((ElementTree.QName(prop).localname, prop.text)
+                          for prop in elem
+                          if isinstance(prop.tag, str))
+        return cls(ElementTree.tostring(elem, with_tail=False), properties)
+
+
+class DataSet(object):
+    """Instances and method responses of the resources of a BMC"""
+
+    def __init__(self):
+        self._items = {}
+        self._invocations = {}
+
+    @property
+    def resource_uris(self):
+        return sorted(self._items)
+
+    def add_items(self, resource_uri, items):
+        """Adds instances of a resource
+
+        :param resource_uri: URI of the resource
+        :param items: list of Item objects or lxml.etree.Element objects
+        """
+        self._items.setdefault(resource_uri, []).extend(
+            item if isinstance(item, Item) else Item.from_element(item)
+            for item in items)
+
+    def set_items(self, resource_uri, items):
+        """Replaces the instances of a resource
+
+        :param resource_uri: URI of the resource
+        :param items: list of Item objects or lxml.etree.Element objects
+        """
+        self._items.pop(resource_uri, None)
+        self.add_items(resource_uri, items)
+
+    def add_invocation(self, resource_uri, method, response):
+        """Sets the response of a method
+
+        :param resource_uri: URI of the resource
+        :param method: name of the method
+        :param response: serialized SOAP envelope of the response
+        """
+        self._invocations[(resource_uri, method)] = response
+
+    def get_items(self, resource_uri, filter_query=None):
+        """Returns the instances of a resource
+
+        Filters of the form 'select ... where Prop = "value" and ...' are
+        applied, with the = and != operators combined by 'and' and 'or'.
+        Other filters are ignored.
+
+        :param resource_uri: URI of the resource
+        :param filter_query: CQL or WQL filter of the instances
+        :returns: a list of Item objects or None if the resource is unknown
+        """
+        items = self._items.get(resource_uri)
+        if items is None or filter_query is None:
+            return items
+
+        match = _parse_filter(filter_query)
+        if match is None:
+            LOG.debug('Ignoring unsupported filter: %s', filter_query)
+            return items
+
+        return [item for item in items if match(item.properties)]
+
+    def get_item(self, resource_uri, selectors):
+        """Returns the instance of a resource with the given selectors
+
+        :param resource_uri: URI of the resource
+        :param selectors: dictionary of the selectors, matched against the
+                          property values
+        :returns: an Item object or None if there is no such instance
+        """
+        for item in self._items.get(resource_uri, ()):
+            if all(item.properties.get(name) == value
+                   for (name, value) in selectors.items()):
+                return item
+
+    def get_fragment(self, resource_uri, selectors, name):
+        """Returns a property of the instance with the given selectors
+
+        :param resource_uri: URI of the resource
+        :param selectors: dictionary of the selectors
+        :param name: name of the property
+        :returns: the serialized element of the property or None if there is
+                  no such instance or property
+        """
+        item = self.get_item(resource_uri, selectors)
+        if item is None:
+            return None
+
+        prop = _find_property(ElementTree.fromstring(item.xml), name)
+        if prop is None:
+            return None
+
+        return ElementTree.tostring(prop, with_tail=False)
+
+    def set_fragment(self, resource_uri, selectors, name, value):
+        """Updates a property of the instance with the given selectors
+
+        :param resource_uri: URI of the resource
+        :param selectors: dictionary of the selectors
+        :param name: name of the property
+        :param value: new text of the property
+        :returns: the serialized element of the property or None if there is
+                  no such instance or property
+        """
+        items = self._items.get(resource_uri, [])
+        item = self.get_item(resource_uri, selectors)
+        if item is None:
+            return None
+
+        elem = ElementTree.fromstring(item.xml)
+        prop = _find_property(elem, name)
+        if prop is None:
+            return None
+
+        prop.text = value
+        items[items.index(item)] = Item.from_element(elem)
+        return ElementTree.tostring(prop, with_tail=False)
+
+    def get_invocation(self, resource_uri, method):
+        """Returns the response of a method
+
+        :param resource_uri: URI of the resource
+        :param method: name of the method
+        :returns: the serialized response or None if the method is unknown
+        """
+        return self._invocations.get((resource_uri, method))
+
+    def load_responses(self, directory=MOCKS_DIR):
+        """Loads the successful responses of a directory
+
+        Enumeration responses are expected in files named *-enum-ok.xml and
+        method responses in files named *-invoke-*-ok.xml, like the mocks of
+        the unit tests.
+
+        :param directory: path of the directory
+        :returns: the DataSet object itself
+        """
+        for path in sorted(glob.glob(os.path.join(directory,
+                                                  '*-enum-ok.xml'))):
+            doc = ElementTree.parse(path)
+            for tag in _ITEMS_TAGS:
+                for items_elem in doc.iter(tag):
+                    for item in items_elem:
+                        resource_uri = ElementTree.QName(item).namespace
+                        self.add_items(resource_uri, [item])
+
+        for path in sorted(glob.glob(os.path.join(directory,
+                                                  '*-invoke-*-ok.xml'))):
+            with open(path, 'rb') as f:
+                response = f.read()
+
+            body = ElementTree.fromstring(response).find(
+                '{%s}Body' % wsman.NS_SOAP_ENV)
+            for output in body:
+                name = ElementTree.QName(output)
+                if name.localname.endswith(_OUTPUT_SUFFIX):
+                    method = name.localname[:-len(_OUTPUT_SUFFIX)]
+                    self.add_invocation(name.namespace, method, response)
+
+        return self
+
+
+def _find_property(elem, name):
+    return elem.find('{%s}%s' % (ElementTree.QName(elem).namespace, name))
+
+
+def _parse_filter(filter_query):
+    where = _WHERE_RE.search(filter_query)
+    if where is None:
+        return lambda properties: True
+
+    alternatives = []
+    for alternative in _OR_RE.split(where.group(1)):
+        conditions = []
+        for condition in _AND_RE.split(alternative):
+            match = _CONDITION_RE.match(condition)
+            if match is None:
+                return None
+
+            conditions.append(match.groups())
+
+        alternatives.append(conditions)
+
+    def match(properties):
+        return any(all((properties.get(name) == value) == (operator == '=')
+                       for (name, operator, value) in conditions)
+                   for conditions in alternatives)
+
+    return match
+
+
+def envelope(action, body, relates_to=None):
+    """Returns a serialized SOAP envelope of a response
+
+    :param action: value of the Action header
+    :param body: serialized content of the body
+    :param relates_to: message ID of the request
+    :returns: the envelope as bytes
+    """
+    return (_ENVELOPE % {
+        'action': action,
+        'relates_to': saxutils.escape(relates_to or ''),
+        'message_id': uuid.uuid4(),
+        'body': body}).encode('utf-8')
+
+
+def enumeration_page(items, context, end_of_sequence, pull=False,
+                     relates_to=None):
+    """Returns a serialized page of an enumeration
+
+    :param items: list of Item objects of the page
+    :param context: enumeration context
+    :param end_of_sequence: whether this is the last page
+    :param pull: whether the page is the response to a pull, otherwise it's
+                 the response to an optimized enumerate
+    :param relates_to: message ID of the request
+    :returns: the envelope as bytes
+    """
+    items = u''.join(item.xml.decode('utf-8') for item in items)
+    context = (u'<wsen:EnumerationContext>%s</wsen:EnumerationContext>' %
+               (u'' if end_of_sequence else context))
+
+    if pull:
+        action = wsman.NS_WSMAN_ENUM + '/PullResponse'
+        body = (u'<wsen:PullResponse>%s<wsen:Items>%s</wsen:Items>%s'
+                u'</wsen:PullResponse>' % (
+                    context, items,
+                    u'<wsen:EndOfSequence/>' if end_of_sequence else u''))
+    else:
+        action = wsman.NS_WSMAN_ENUM + '/EnumerateResponse'
+        body = (u'<wsen:EnumerateResponse><wsman:Items>%s</wsman:Items>%s%s'
+                u'</wsen:EnumerateResponse>' % (
+                    items, context,
+                    u'<wsman:EndOfSequence/>' if end_of_sequence else u''))
+
+    return envelope(action, body, relates_to)
+
+
+def enumeration_responses(items, page_size=100, context='enum-context-uuid'):
+    """Returns the responses of an optimized enumeration and its pulls
+
+    Useful for mocking the transport, the first response is the one of the
+    enumerate request and the rest of the pulls following it.
+
+    :param items: list of Item objects
+    :param page_size: number of items per page
+    :param context: enumeration context
+    :returns: a list of envelopes as bytes
+    """
+    pages = [items[start:start + page_size]
+             for start in range(0, len(items), page_size)] or [[]]
+    return [enumeration_page(page, context, index == len(pages) - 1,
+                             pull=index > 0)
+            for (index, page) in enumerate(pages)]
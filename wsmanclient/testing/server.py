@@ -0,0 +1,538 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Fake WS-Man server for load testing
+
+A single asyncio event loop serves any number of virtual BMCs, the n-th one
+at /bmc/<n>/wsman, over plain HTTP with keep-alive connections. Enumerations
+are paged with real enumeration contexts, so that the clients go through the
+same enumerate, pull and release sequences as with a real BMC.
+
+The server can either run in a background thread of the tests::
+
+    with server.FakeWSManServer(endpoints=100, latency=0.05) as fake:
+        client = DRACClient(username='root', password='calvin',
+                            **fake.endpoint(42))
+        client.list_bios_settings()
+
+or as a separate process::
+
+    python -m wsmanclient.testing.server --port 8000 --endpoints 5000
+
+Requires Python 3.
+"""
+
+import argparse
+import asyncio
+import base64
+import collections
+import http
+import logging
+import random
+import re
+import threading
+import uuid
+from xml.sax import saxutils
+
+from lxml import etree as ElementTree
+
+from wsmanclient import wsman
+from wsmanclient.testing import data
+
+LOG = logging.getLogger(__name__)
+
+# maximum number of open enumeration contexts of a virtual BMC, the oldest
+# ones are dropped when the clients don't release them
+MAX_CONTEXTS = 64
+
+NS_WSMAN_FAULT = 'http://schemas.dmtf.org/wbem/wsman/1/wsman/fault'
+
+_PATH_RE = re.compile(r'^/bmc/(\d+)/wsman$')
+
+_ENUMERATE = wsman.NS_WSMAN_ENUM + '/Enumerate'
+_PULL = wsman.NS_WSMAN_ENUM + '/Pull'
+_RELEASE = wsman.NS_WSMAN_ENUM + '/Release'
+_GET = wsman.NS_WS_TRANSFER + '/Get'
+_PUT = wsman.NS_WS_TRANSFER + '/Put'
+
+_FAULT = ('<s:Fault><s:Code><s:Value>s:%(code)s</s:Value>'
+          '<s:Subcode><s:Value>%(subcode)s</s:Value></s:Subcode></s:Code>'
+          '<s:Reason><s:Text xml:lang="en">%(reason)s</s:Text></s:Reason>'
+          '</s:Fault>')
+
+
+class Faults(object):
+    """Failures injected into the responses of the fake server"""
+
+    def __init__(self, error_rate=0.0, busy_rate=0.0, disconnect_rate=0.0,
+                 seed=None):
+        """Creates faults object
+
+        :param error_rate: ratio of requests failing with a SOAP fault and
+                           status code 500
+        :param busy_rate: ratio of requests rejected with status code 503
+        :param disconnect_rate: ratio of requests after which the connection
+                                is closed without a response
+        :param seed: seed of the random choices, for repeatable runs
+        """
+        self.rates = (('error', error_rate), ('busy', busy_rate),
+                      ('disconnect', disconnect_rate))
+        self._random = random.Random(seed)
+
+    def pick(self):
+        """Returns the fault of the next request, or None"""
+        roll = self._random.random()
+        for (fault, rate) in self.rates:
+            if roll < rate:
+                return fault
+
+            roll -= rate
+
+
+class _Request(object):
+    """Parsed SOAP envelope of a request"""
+
+    def __init__(self, body):
+        envelope = ElementTree.fromstring(body)
+        header = envelope.find('{%s}Header' % wsman.NS_SOAP_ENV)
+        body = envelope.find('{%s}Body' % wsman.NS_SOAP_ENV)
+        if header is None or body is None:
+            raise ValueError('Not a SOAP envelope')
+
+        self.action = header.findtext('{%s}Action' % wsman.NS_WS_ADDR)
+        self.resource_uri = header.findtext(
+            '{%s}ResourceURI' % wsman.NS_WSMAN)
+        self.message_id = header.findtext('{%s}MessageID' % wsman.NS_WS_ADDR)
+        self.selectors = dict(
+            (selector.get('Name'), selector.text)
+            for selector in header.iter('{%s}Selector' % wsman.NS_WSMAN))
+        # the spec defaults to a single item per page
+        self.max_elems = int(
+            body.findtext('.//{%s}MaxElements' % wsman.NS_WSMAN) or 1)
+        self.optimization = body.find(
+            './/{%s}OptimizeEnumeration' % wsman.NS_WSMAN) is not None
+        self.context = body.findtext(
+            './/{%s}EnumerationContext' % wsman.NS_WSMAN_ENUM)
+        self.filter_query = body.findtext('.//{%s}Filter' % wsman.NS_WSMAN)
+        self.fragment = header.findtext(
+            '{%s}FragmentTransfer' % wsman.NS_WSMAN)
+        # text of the property of a fragment put
+        self.value = body.findtext('{%s}XmlFragment/*' % wsman.NS_WSMAN)
+
+
+class _Endpoint(object):
+    """State of a virtual BMC"""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.in_flight = 0
+        # enumeration context -> list of the items not pulled yet
+        self.contexts = collections.OrderedDict()
+
+    def open_context(self, items):
+        context = str(uuid.uuid4())
+        self.contexts[context] = items
+        if len(self.contexts) > MAX_CONTEXTS:
+            self.contexts.popitem(last=False)
+
+        return context
+
+    def take(self, context, max_elems):
+        """Returns the next page of an enumeration and whether it's the last
+
+        The context is dropped after the last page.
+        """
+        items = self.contexts[context]
+        page, rest = items[:max_elems], items[max_elems:]
+        if rest:
+            self.contexts[context] = rest
+        else:
+            del self.contexts[context]
+
+        return page, not rest
+
+
+class FakeWSManServer(object):
+    """asyncio server of many virtual BMCs"""
+
+    def __init__(self, dataset=None, endpoints=1, host='127.0.0.1', port=0,
+                 latency=0.0, item_latency=0.0, page_size=None,
+                 session_limit=None, faults=None, credentials=None):
+        """Creates server object
+
+        :param dataset: DataSet served by all the virtual BMCs, or a callable
+                        returning the DataSet of a BMC from its index.
+                        Defaults to the responses of the unit tests.
+        :param endpoints: number of virtual BMCs
+        :param host: address to listen on
+        :param port: port to listen on, 0 picks a free one
+        :param latency: number of seconds each response is delayed with
+        :param item_latency: number of additional seconds each enumerated
+                             item delays the response with
+        :param page_size: maximum number of items per page, regardless of
+                          the MaxElements of the requests
+        :param session_limit: maximum number of requests processed
+                              concurrently by a virtual BMC, the excess ones
+                              are rejected with status code 503
+        :param faults: Faults object of the failures to inject
+        :param credentials: tuple of the username and password accepted, or
+                            None to accept any
+        """
+        if dataset is None:
+            dataset = data.DataSet().load_responses()
+
+        self.dataset = dataset
+        self.endpoints = endpoints
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.item_latency = item_latency
+        self.page_size = page_size
+        self.session_limit = session_limit
+        self.faults = faults
+        self.credentials = credentials
+        self.stats = collections.Counter()
+
+        self._endpoints = {}
+        self._server = None
+        self._writers = set()
+        self._loop = None
+        self._thread = None
+
+    def endpoint(self, index):
+        """Returns the connection details of a virtual BMC
+
+        :param index: index of the virtual BMC
+        :returns: a dictionary of the host, port, path and protocol
+                  arguments of the clients
+        """
+        return {'host': self.host, 'port': self.port,
+                'path': '/bmc/%d/wsman' % index, 'protocol': 'http'}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Starts serving in a background thread"""
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self.start_serving())
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name='fake-wsman-server')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background thread started by start"""
+        asyncio.run_coroutine_threadsafe(self.stop_serving(),
+                                         self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
+
+    async def start_serving(self):
+        """Starts serving on the running event loop"""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        LOG.info('Serving %(endpoints)d BMCs at '
+                 'http://%(host)s:%(port)d/bmc/<n>/wsman',
+                 {'endpoints': self.endpoints, 'host': self.host,
+                  'port': self.port})
+
+    async def stop_serving(self):
+        """Stops serving and closes the open connections"""
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+
+        await self._server.wait_closed()
+
+    def _get_endpoint(self, index):
+        endpoint = self._endpoints.get(index)
+        if endpoint is None:
+            dataset = self.dataset
+            if callable(dataset):
+                dataset = dataset(index)
+
+            endpoint = self._endpoints[index] = _Endpoint(dataset)
+
+        return endpoint
+
+    async def _handle_connection(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(
+                    int(headers.get('content-length', 0)))
+                _, path, version = request_line.decode('latin-1').split()
+                keep_alive = (version == 'HTTP/1.1' and
+                              headers.get('connection', '').lower() !=
+                              'close')
+
+                status, body = await self._respond(path, headers, body)
+                if status is None:
+                    break
+
+                writer.write(_http_response(status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, path, headers, body):
+        """Returns the status code and body of the response to a request
+
+        The status code is None when the connection is to be dropped.
+        """
+        self.stats['requests'] += 1
+        status, body = await self._process(path, headers, body)
+        self.stats[status] += 1
+        return status, body
+
+    async def _process(self, path, headers, body):
+        match = _PATH_RE.match(path)
+        if match is None or int(match.group(1)) >= self.endpoints:
+            return 404, b''
+
+        if (self.credentials is not None and
+                not _authorized(headers, self.credentials)):
+            return 401, b''
+
+        fault = self.faults.pick() if self.faults is not None else None
+        if fault == 'disconnect':
+            return None, None
+
+        endpoint = self._get_endpoint(int(match.group(1)))
+        if fault == 'busy' or (self.session_limit is not None and
+                               endpoint.in_flight >= self.session_limit):
+            return 503, b''
+
+        endpoint.in_flight += 1
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            try:
+                request = _Request(body)
+            except (ElementTree.XMLSyntaxError, ValueError):
+                return 400, _fault(None, 'Sender', 'wsa:InvalidMessage',
+                                   'The request is not a SOAP envelope')
+
+            if fault == 'error':
+                return 500, _fault(request, 'Receiver', 'wsman:InternalError',
+                                   'Injected fault')
+
+            status, body, items = self._dispatch(endpoint, request)
+            if self.item_latency and items:
+                await asyncio.sleep(self.item_latency * items)
+
+            return status, body
+        finally:
+            endpoint.in_flight -= 1
+
+    def _dispatch(self, endpoint, request):
+        """Returns the status code, body and number of items of a response"""
+        if request.action in (_ENUMERATE, _PULL):
+            return self._enumerate(endpoint, request)
+
+        if request.fragment is not None and request.action in (_GET, _PUT):
+            return self._transfer_fragment(endpoint, request)
+
+        if request.action == _GET:
+            item = endpoint.dataset.get_item(request.resource_uri,
+                                             request.selectors)
+            if item is None:
+                return 400, _fault(
+                    request, 'Sender', 'wsa:DestinationUnreachable',
+                    'Unknown instance of %s' % request.resource_uri), 0
+
+            return 200, _envelope(request, _GET + 'Response',
+                                  item.xml.decode('utf-8')), 1
+
+        if request.action == _RELEASE:
+            endpoint.contexts.pop(request.context, None)
+            return 200, _envelope(request, _RELEASE + 'Response',
+                                  '<wsen:ReleaseResponse/>'), 0
+
+        method = None
+        if (request.resource_uri is not None and request.action is not None
+                and request.action.startswith(request.resource_uri + '/')):
+            method = request.action[len(request.resource_uri) + 1:]
+
+        response = endpoint.dataset.get_invocation(request.resource_uri,
+                                                   method)
+        if response is None:
+            return 400, _fault(request, 'Sender', 'wsa:ActionNotSupported',
+                               'Unknown action %s' % request.action), 0
+
+        return 200, response, 0
+
+    def _transfer_fragment(self, endpoint, request):
+        if request.action == _GET:
+            fragment = endpoint.dataset.get_fragment(
+                request.resource_uri, request.selectors, request.fragment)
+        else:
+            fragment = endpoint.dataset.set_fragment(
+                request.resource_uri, request.selectors, request.fragment,
+                request.value)
+        if fragment is None:
+            return 400, _fault(
+                request, 'Sender', 'wsa:DestinationUnreachable',
+                'Unknown fragment %s of %s' % (request.fragment,
+                                               request.resource_uri)), 0
+
+        return 200, _envelope(
+            request, request.action + 'Response',
+            '<wsman:XmlFragment>%s</wsman:XmlFragment>' %
+            fragment.decode('utf-8')), 1
+
+    def _enumerate(self, endpoint, request):
+        if request.action == _ENUMERATE:
+            items = endpoint.dataset.get_items(request.resource_uri,
+                                               request.filter_query)
+            if items is None:
+                return 400, _fault(
+                    request, 'Sender', 'wsa:DestinationUnreachable',
+                    'Unknown resource %s' % request.resource_uri), 0
+
+            context = endpoint.open_context(list(items))
+            if not request.optimization:
+                return 200, _envelope(
+                    request, _ENUMERATE + 'Response',
+                    '<wsen:EnumerateResponse><wsen:EnumerationContext>%s'
+                    '</wsen:EnumerationContext></wsen:EnumerateResponse>' %
+                    context), 0
+        else:
+            context = request.context
+            if context not in endpoint.contexts:
+                return 400, _fault(
+                    request, 'Sender', 'wsen:InvalidEnumerationContext',
+                    'Unknown enumeration context'), 0
+
+        max_elems = request.max_elems
+        if self.page_size is not None:
+            max_elems = min(max_elems, self.page_size)
+
+        page, end_of_sequence = endpoint.take(context, max_elems)
+        return 200, data.enumeration_page(
+            page, context, end_of_sequence, pull=request.action == _PULL,
+            relates_to=request.message_id), len(page)
+
+
+def _envelope(request, action, body):
+    return data.envelope(action, body, request and request.message_id)
+
+
+def _fault(request, code, subcode, reason):
+    return _envelope(request, NS_WSMAN_FAULT, _FAULT % {
+        'code': code, 'subcode': subcode, 'reason': saxutils.escape(reason)})
+
+
+def _authorized(headers, credentials):
+    scheme, _, token = headers.get('authorization', '').partition(' ')
+    if scheme.lower() != 'basic':
+        return False
+
+    try:
+        username, _, password = base64.b64decode(token).decode(
+            'utf-8').partition(':')
+    except ValueError:
+        return False
+
+    return (username, password) == tuple(credentials)
+
+
+def _http_response(status, body, keep_alive):
+    headers = ['HTTP/1.1 %d %s' % (status, http.HTTPStatus(status).phrase),
+               'Content-Type: application/soap+xml;charset=UTF-8',
+               'Content-Length: %d' % len(body)]
+    if status == 401:
+        headers.append('WWW-Authenticate: Basic realm="wsman"')
+    if not keep_alive:
+        headers.append('Connection: close')
+
+    return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Serves many virtual BMCs for load testing WS-Man '
+                    'clients')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address to listen on')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='port to listen on')
+    parser.add_argument('--endpoints', type=int, default=1000,
+                        help='number of virtual BMCs')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds each response is delayed with')
+    parser.add_argument('--item-latency', type=float, default=0.0,
+                        help='seconds each enumerated item adds to the delay')
+    parser.add_argument('--page-size', type=int,
+                        help='maximum number of items per page')
+    parser.add_argument('--session-limit', type=int,
+                        help='maximum number of concurrent requests per BMC')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='ratio of requests failing with a SOAP fault')
+    parser.add_argument('--busy-rate', type=float, default=0.0,
+                        help='ratio of requests rejected with 503')
+    parser.add_argument('--disconnect-rate', type=float, default=0.0,
+                        help='ratio of requests dropping the connection')
+    parser.add_argument('--seed', type=int,
+                        help='seed of the injected faults')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    fake = FakeWSManServer(
+        endpoints=args.endpoints, host=args.host, port=args.port,
+        latency=args.latency, item_latency=args.item_latency,
+        page_size=args.page_size, session_limit=args.session_limit,
+        faults=Faults(args.error_rate, args.busy_rate, args.disconnect_rate,
+                      args.seed))
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(fake.start_serving())
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(fake.stop_serving())
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
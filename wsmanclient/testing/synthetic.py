@@ -0,0 +1,459 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Synthetic WS-Man data at arbitrary scale
+
+Instances are generated for the DCIM classes of the iDRACs and the CIM
+classes of the ThinkServer BMCs, with the property sets of real responses.
+The classes with a mock response in the unit tests use its first instance as
+a template, varying the identifying properties from instance to instance.
+
+The instances can be rendered into the responses of a paged enumeration::
+
+    items = synthetic.generate('DCIM_LifecycleJob', 10000)
+    responses = data.enumeration_responses(items, page_size=100)
+
+or served by the fake server::
+
+    dataset = synthetic.dataset(scale=10)
+    fake = server.FakeWSManServer(dataset=dataset, endpoints=1000)
+"""
+
+import os
+import string
+from xml.sax import saxutils
+
+from lxml import etree as ElementTree
+
+from wsmanclient.testing import data
+
+NS_XSI = 'http://www.w3.org/2001/XMLSchema-instance'
+DCIM_SCHEMA = 'http://schemas.dell.com/wbem/wscim/1/cim-schema/2/'
+CIM_SCHEMA = 'http://schemas.dmtf.org/wbem/wscim/1/cim-schema/2/'
+
+# number of instances of a fully populated 2U server
+DEFAULT_COUNTS = {
+    'DCIM_LifecycleJob': 100,
+    'DCIM_BIOSEnumeration': 150,
+    'DCIM_BIOSString': 50,
+    'DCIM_BIOSInteger': 20,
+    'DCIM_PhysicalDiskView': 24,
+    'DCIM_VirtualDiskView': 4,
+    'DCIM_ControllerView': 2,
+    'DCIM_CPUView': 2,
+    'DCIM_MemoryView': 24,
+    'DCIM_PowerSupplyView': 2,
+    'DCIM_NICView': 8,
+    'DCIM_NICEnumeration': 200,
+    'DCIM_NICString': 60,
+    'DCIM_NICInteger': 30,
+    'CIM_HostComputerSystem': 1,
+    'CIM_Processor': 2,
+    'CIM_PhysicalMemory': 24,
+    'CIM_PowerSupply': 2,
+    'CIM_EthernetPort': 4,
+}
+
+_JOB_NAMES = ['ConfigBIOS:BIOS.Setup.1-1', 'ConfigRAID:RAID.Integrated.1-1',
+              'Firmware Update: BIOS', 'Export: Hardware Inventory']
+_JOB_STATUSES = ['Completed', 'Completed with Errors', 'Failed', 'Scheduled',
+                 'Running', 'Reboot Completed']
+_INVENTORY_TIME = '20160215025015.000000+000'
+
+
+class ResourceClass(object):
+    """Generator of the instances of a CIM class"""
+
+    def __init__(self, name, namespace, resource_uri, properties):
+        """Creates resource class object
+
+        :param name: name of the class, used as the tag of the instances
+        :param namespace: namespace of the instances
+        :param resource_uri: URI the instances are enumerated with. It
+                             differs from the namespace for the instances of
+                             subclasses, eg. CIM_EthernetPort instances of
+                             CIM_NetworkPort.
+        :param properties: callable returning the list of (name, value)
+                           tuples of an instance from its index. None values
+                           are rendered as nil, lists as repeated properties.
+        """
+        self.name = name
+        self.namespace = namespace
+        self.resource_uri = resource_uri
+        self.properties = properties
+
+    def item(self, index):
+        """Returns the index-th instance as a data.Item object"""
+        parts = [u'<n1:%s xmlns:n1="%s" xmlns:xsi="%s">' % (
+            self.name, self.namespace, NS_XSI)]
+        properties = {}
+        for (name, value) in self.properties(index):
+            values = value if isinstance(value, list) else [value]
+            for value in values:
+                if value is None:
+                    parts.append(u'<n1:%s xsi:nil="true"/>' % name)
+                else:
+                    parts.append(u'<n1:%(name)s>%(value)s</n1:%(name)s>' % {
+                        'name': name, 'value': saxutils.escape(u'%s' % value)})
+
+            properties.setdefault(name, values[0] if values else None)
+
+        parts.append(u'</n1:%s>' % self.name)
+        return data.Item(u''.join(parts).encode('utf-8'), properties)
+
+    def generate(self, count, start=0):
+        """Returns a list of instances
+
+        :param count: number of instances
+        :param start: index of the first instance
+        """
+        return [self.item(index) for index in range(start, start + count)]
+
+
+class _MockTemplate(object):
+    """Properties of the first instance of a mock response"""
+
+    def __init__(self, mock, name, overrides):
+        self.mock = mock
+        self.name = name
+        self.overrides = overrides
+        self._properties = None
+
+    def __call__(self, index):
+        if self._properties is None:
+            self._properties = self._load()
+
+        overrides = self.overrides(index)
+        return [(name, overrides.get(name, value))
+                for (name, value) in self._properties]
+
+    def _load(self):
+        doc = ElementTree.parse(os.path.join(data.MOCKS_DIR,
+                                             '%s.xml' % self.mock))
+        item = next(doc.iter('{%s%s}%s' % (DCIM_SCHEMA, self.name,
+                                           self.name)))
+
+        properties = []
+        for prop in item:
+            if not isinstance(prop.tag, str):
+                continue
+
+            name = ElementTree.QName(prop).localname
+            value = prop.text or u''
+            if prop.get('{%s}nil' % NS_XSI) == 'true':
+                value = None
+
+            if properties and properties[-1][0] == name:
+                previous = properties[-1][1]
+                if not isinstance(previous, list):
+                    previous = [previous]
+                properties[-1] = (name, previous + [value])
+            else:
+                properties.append((name, value))
+
+        return properties
+
+
+def _dcim_class(name, mock, overrides, template_name=None):
+    return ResourceClass(name, DCIM_SCHEMA + name, DCIM_SCHEMA + name,
+                         _MockTemplate(mock, template_name or name,
+                                       overrides))
+
+
+def _cim_class(name, properties, resource_uri=None):
+    return ResourceClass(name, CIM_SCHEMA + name,
+                         CIM_SCHEMA + (resource_uri or name), properties)
+
+
+def _mac(index, base=0x246e96000000):
+    address = '%012x' % (base + index)
+    return ':'.join(address[pos:pos + 2] for pos in range(0, 12, 2))
+
+
+def _job(index):
+    status = _JOB_STATUSES[index % len(_JOB_STATUSES)]
+    return {'InstanceID': 'JID_%012d' % index,
+            'Name': _JOB_NAMES[index % len(_JOB_NAMES)],
+            'JobStatus': status,
+            'JobStartTime': 'TIME_NOW',
+            'Message': 'Job %s.' % status.lower(),
+            'MessageID': 'SYS%03d' % (index % 1000),
+            'PercentComplete': '100' if status.startswith('Completed')
+                               else str(index % 100)}
+
+
+def _attribute(prefix, fqdd):
+    def overrides(index):
+        name = '%s%d' % (prefix, index)
+        return {'AttributeName': name,
+                'AttributeDisplayName': 'Synthetic attribute %d' % index,
+                'DisplayOrder': str(index),
+                'FQDD': fqdd,
+                'InstanceID': '%s:%s' % (fqdd, name)}
+
+    return overrides
+
+
+def _physical_disk(index):
+    fqdd = 'Disk.Bay.%d:Enclosure.Internal.0-1:RAID.Integrated.1-1' % index
+    return {'FQDD': fqdd,
+            'InstanceID': fqdd,
+            'Slot': str(index),
+            'DeviceDescription': ('Disk %d in Backplane 1 of Integrated RAID '
+                                  'Controller 1' % index),
+            'SerialNumber': 'SYN%08d' % index,
+            'SASAddress': '%016X' % (0x5000C50000000000 + index)}
+
+
+def _virtual_disk(index):
+    fqdd = 'Disk.Virtual.%d:RAID.Integrated.1-1' % index
+    return {'FQDD': fqdd,
+            'InstanceID': fqdd,
+            'Name': 'disk %d' % index,
+            'DeviceDescription': ('Virtual Disk %d on Integrated RAID '
+                                  'Controller 1' % index),
+            'VirtualDiskTargetID': str(index)}
+
+
+def _controller(index):
+    fqdd = 'RAID.Slot.%d-1' % (index + 1)
+    return {'FQDD': fqdd,
+            'InstanceID': fqdd,
+            'PCISlot': str(index + 1),
+            'DeviceDescription': 'RAID Controller in Slot %d' % (index + 1),
+            'SASAddress': '%016X' % (0x5B083FE0D2D0F200 + index)}
+
+
+def _cpu(index):
+    fqdd = 'CPU.Socket.%d' % (index + 1)
+    return {'FQDD': fqdd,
+            'InstanceID': fqdd,
+            'DeviceDescription': 'CPU %d' % (index + 1)}
+
+
+def _memory(index):
+    bank = string.ascii_uppercase[index // 12 % 26] * (index // 312 + 1)
+    fqdd = 'DIMM.Socket.%s%d' % (bank, index % 12 + 1)
+    return {'FQDD': fqdd,
+            'InstanceID': fqdd,
+            'BankLabel': bank,
+            'DeviceDescription': 'DIMM %s%d' % (bank, index % 12 + 1),
+            'SerialNumber': '%08X' % (0x39406867 + index)}
+
+
+def _power_supply(index):
+    fqdd = 'PSU.Slot.%d' % (index + 1)
+    return {'FQDD': fqdd,
+            'InstanceID': fqdd,
+            'DeviceDescription': 'Power Supply %d' % (index + 1),
+            'SerialNumber': 'SYN%012d' % index}
+
+
+def _nic_view(index):
+    port, partition = index // 4 + 1, index % 4 + 1
+    fqdd = 'NIC.Integrated.1-%d-%d' % (port, partition)
+    mac = _mac(index)
+    return [('AutoNegotiation', '2'),
+            ('BusNumber', '1'),
+            ('ControllerBIOSVersion', '1.39'),
+            ('CurrentMACAddress', mac),
+            ('DataBusWidth', '0002'),
+            ('DeviceDescription', 'Integrated NIC 1 Port %d Partition %d' %
+             (port, partition)),
+            ('DeviceNumber', '0'),
+            ('EFIVersion', '2.1.3'),
+            ('FCoEOffloadMode', '3'),
+            ('FQDD', fqdd),
+            ('FamilyVersion', '16.5.20'),
+            ('FunctionNumber', str(index % 8)),
+            ('InstanceID', fqdd),
+            ('LastSystemInventoryTime', _INVENTORY_TIME),
+            ('LastUpdateTime', _INVENTORY_TIME),
+            ('LinkDuplex', '1'),
+            ('LinkSpeed', '5'),
+            ('MaxBandwidth', '100'),
+            ('MediaType', 'SFP_PLUS'),
+            ('MinBandwidth', '0'),
+            ('NicMode', '3'),
+            ('PCIDeviceID', '168e'),
+            ('PCISubDeviceID', '1f5b'),
+            ('PCISubVendorID', '1028'),
+            ('PCIVendorID', '14e4'),
+            ('PermanentFCOEMACAddress', None),
+            ('PermanentMACAddress', mac),
+            ('PermanentiSCSIMACAddress', None),
+            ('ProductName', 'QLogic 57810 10 Gigabit Ethernet - %s' % mac),
+            ('Protocol', 'NIC'),
+            ('ReceiveFlowControl', '2'),
+            ('SlotLength', '0002'),
+            ('SlotType', '0002'),
+            ('TransmitFlowControl', '2'),
+            ('VendorName', 'QLogic'),
+            ('WWN', None),
+            ('WWPN', None),
+            ('iScsiOffloadMode', '3')]
+
+
+def _cim_managed_element(index, system_name='ThinkServer'):
+    return [('EnabledState', '2'),
+            ('HealthState', '5'),
+            ('OperationalStatus', '2'),
+            ('RequestedState', '12'),
+            ('SystemCreationClassName', 'CIM_ComputerSystem'),
+            ('SystemName', system_name)]
+
+
+def _host_computer_system(index):
+    return [('CreationClassName', 'CIM_ComputerSystem'),
+            ('Dedicated', '0'),
+            ('ElementName', 'ThinkServer %d' % index),
+            ('EnabledState', '2'),
+            ('HealthState', '5'),
+            ('IdentifyingDescriptions', 'CIM:GUID'),
+            ('Name', 'ThinkServer%d' % index),
+            ('NameFormat', 'Other'),
+            ('OperationalStatus', '2'),
+            ('OtherIdentifyingInfo', '%032x' % index),
+            ('RequestedState', '12')]
+
+
+def _processor(index):
+    return [('CPUStatus', '1'),
+            ('CreationClassName', 'CIM_Processor'),
+            ('CurrentClockSpeed', '2400'),
+            ('DeviceID', 'CPU%d' % index),
+            ('ElementName', 'CPU %d' % index),
+            ('Family', '179'),
+            ('MaxClockSpeed', '3600'),
+            ('NumberOfEnabledCores', '8'),
+            ('Role', 'Central Processor'),
+            ('Stepping', '2'),
+            ('UniqueID', '%016x' % (0x306F2 + index)),
+            ('UpgradeMethod', '43')] + _cim_managed_element(index)
+
+
+def _physical_memory(index):
+    return [('BankLabel', 'CPU%d' % (index // 12)),
+            ('Capacity', str(16 * 1024 ** 3)),
+            ('CreationClassName', 'CIM_PhysicalMemory'),
+            ('DataWidth', '64'),
+            ('ElementName', 'DIMM %d' % index),
+            ('FormFactor', '8'),
+            ('HealthState', '5'),
+            ('Manufacturer', 'Samsung'),
+            ('MemoryType', '26'),
+            ('OperationalStatus', '2'),
+            ('PartNumber', 'M393A2G40DB0-CPB'),
+            ('SerialNumber', '%08X' % (0x39406867 + index)),
+            ('Speed', '2133'),
+            ('Tag', 'DIMM%d' % index),
+            ('TotalWidth', '72')]
+
+
+def _cim_power_supply(index):
+    return [('CreationClassName', 'CIM_PowerSupply'),
+            ('DeviceID', 'PSU%d' % index),
+            ('ElementName', 'Power Supply %d' % index),
+            ('IsSwitchingSupply', 'true'),
+            ('TotalOutputPower', '750000')] + _cim_managed_element(index)
+
+
+def _ethernet_port(index):
+    mac = _mac(index, base=0x6cae8b000000)
+    return [('CreationClassName', 'CIM_EthernetPort'),
+            ('DeviceID', 'eth%d' % index),
+            ('ElementName', 'Ethernet Port %d' % index),
+            ('LinkTechnology', '2'),
+            ('MaxSpeed', '1000000000'),
+            ('NetworkAddresses', mac),
+            ('PermanentAddress', mac.replace(':', '').upper()),
+            ('PortNumber', str(index)),
+            ('PortType', '54'),
+            ('Speed', '1000000000'),
+            ('UsageRestriction', '4')] + _cim_managed_element(index)
+
+
+CLASSES = dict((resource_class.name, resource_class) for resource_class in [
+    _dcim_class('DCIM_LifecycleJob', 'lifecycle_job-enum-ok', _job),
+    _dcim_class('DCIM_BIOSEnumeration', 'bios_enumeration-enum-ok',
+                _attribute('SynEnum', 'BIOS.Setup.1-1')),
+    _dcim_class('DCIM_BIOSString', 'bios_string-enum-ok',
+                _attribute('SynString', 'BIOS.Setup.1-1')),
+    _dcim_class('DCIM_BIOSInteger', 'bios_integer-enum-ok',
+                _attribute('SynInteger', 'BIOS.Setup.1-1')),
+    _dcim_class('DCIM_PhysicalDiskView', 'physical_disk_view-enum-ok',
+                _physical_disk),
+    _dcim_class('DCIM_VirtualDiskView', 'virtual_disk_view-enum-ok',
+                _virtual_disk),
+    _dcim_class('DCIM_ControllerView', 'controller_view-enum-ok',
+                _controller),
+    _dcim_class('DCIM_CPUView', 'cpu-enumeration-enum-ok', _cpu),
+    _dcim_class('DCIM_MemoryView', 'memory-enumeration-enum-ok', _memory),
+    _dcim_class('DCIM_PowerSupplyView', 'power-supply-enumeration-enum-ok',
+                _power_supply),
+    ResourceClass('DCIM_NICView', DCIM_SCHEMA + 'DCIM_NICView',
+                  DCIM_SCHEMA + 'DCIM_NICView', _nic_view),
+    # NIC attributes have the same properties as the BIOS ones
+    _dcim_class('DCIM_NICEnumeration', 'bios_enumeration-enum-ok',
+                _attribute('SynEnum', 'NIC.Integrated.1-1-1'),
+                template_name='DCIM_BIOSEnumeration'),
+    _dcim_class('DCIM_NICString', 'bios_string-enum-ok',
+                _attribute('SynString', 'NIC.Integrated.1-1-1'),
+                template_name='DCIM_BIOSString'),
+    _dcim_class('DCIM_NICInteger', 'bios_integer-enum-ok',
+                _attribute('SynInteger', 'NIC.Integrated.1-1-1'),
+                template_name='DCIM_BIOSInteger'),
+    _cim_class('CIM_HostComputerSystem', _host_computer_system,
+               resource_uri='CIM_ComputerSystem'),
+    _cim_class('CIM_Processor', _processor),
+    _cim_class('CIM_PhysicalMemory', _physical_memory),
+    _cim_class('CIM_PowerSupply', _cim_power_supply),
+    _cim_class('CIM_EthernetPort', _ethernet_port,
+               resource_uri='CIM_NetworkPort'),
+])
+
+
+def generate(name, count, start=0):
+    """Returns synthetic instances of a class
+
+    :param name: name of the class, one of the keys of CLASSES
+    :param count: number of instances
+    :param start: index of the first instance
+    :returns: a list of data.Item objects
+    """
+    return CLASSES[name].generate(count, start)
+
+
+def dataset(counts=None, scale=1):
+    """Returns a DataSet of synthetic instances
+
+    The instances of the classes not generated and the method responses are
+    the ones of the unit tests.
+
+    :param counts: dictionary of the number of instances per class name.
+                   Defaults to DEFAULT_COUNTS.
+    :param scale: multiplier of the counts
+    :returns: a DataSet object
+    """
+    if counts is None:
+        counts = DEFAULT_COUNTS
+
+    result = data.DataSet().load_responses()
+    for (name, count) in counts.items():
+        resource_class = CLASSES[name]
+        result.set_items(resource_class.resource_uri,
+                         resource_class.generate(max(1,
+                                                     int(count * scale))))
+
+    return result
@@ -18,13 +18,15 @@ Wrapper for pywsman.Client
 import logging
 
 from wsmanclient import exceptions, utils, wsman
-from wsmanclient.base_client import BaseClient
+from wsmanclient.base_client import BaseClient, traced
 from wsmanclient.thinkserverclient.resources import (bios, inventory, job, nic,
                                                      uris)
 from wsmanclient.wsman import WSManClient
 
 LOG = logging.getLogger(__name__)
 
+
+@traced
 class ThinkServerClient(BaseClient):
     """Client for managing DRAC nodes"""
 
@@ -32,7 +34,7 @@ class ThinkServerClient(BaseClient):
     NIC_DEVICE_FQDD = 'NIC.Setup.1-1'
 
     def __init__(self, host, username, password, port=443, path='/wsman',
-                 protocol='https'):
+                 protocol='https', **kwargs):
         """Creates client object
 
         :param host: hostname or IP of the DRAC interface
@@ -41,10 +43,15 @@ class ThinkServerClient(BaseClient):
         :param port: port for accessing the DRAC interface
         :param path: path for accessing the DRAC interface
         :param protocol: protocol for accessing the DRAC interface
+        :param kwargs: additional arguments passed to the underlying
+                       WSManClient, eg. pool_maxsize or pool_idle_timeout
         """
 
-        self.client = WSManClient(host, username, password, port, path,
-                                  protocol)
+        self._set_client(WSManClient(host, username, password, port, path,
+                                     protocol, **kwargs))
+
+    def _set_client(self, client):
+        self.client = client
         self._job_mgmt = job.JobManagement(self.client)
         self._power_mgmt = bios.PowerManagement(self.client)
         self._boot_mgmt = bios.BootManagement(self.client)
@@ -67,27 +74,39 @@ class ThinkServerClient(BaseClient):
     def set_power_state(self, target_state):
         raise NotImplementedError
 
-    def list_power_supply_units(self):
+    def list_power_supply_units(self, fields=None, where=None):
         """Returns the list of PSUs
 
+        :param fields: names of the fields of the PSU objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching PSU objects are returned.
         :returns: list of BootMode objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._power_mgmt.list_power_supply_units()
+        return self._power_mgmt.list_power_supply_units(fields, where)
 
-    def list_boot_modes(self):
+    def list_boot_modes(self, fields=None, where=None):
         """Returns the list of boot modes
 
+        :param fields: names of the fields of the BootMode objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching BootMode objects are returned.
         :returns: list of BootMode objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._boot_mgmt.list_boot_modes()
+        return self._boot_mgmt.list_boot_modes(fields, where)
 
     def list_boot_devices(self):
         """Returns the list of boot devices
@@ -118,16 +137,22 @@ class ThinkServerClient(BaseClient):
         """
         return self._power_mgmt.get_health_state()
 
-    def list_nic_interfaces(self):
+    def list_nic_interfaces(self, fields=None, where=None):
         """Returns the list of nic interfaces
 
+        :param fields: names of the fields of the NICInterface objects needed,
+                       only their properties being requested. Defaults to all
+                       the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching NICInterface objects are returned.
         :returns: a list of NICinterfaces objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._nic_mgmt.list_nic_interfaces()
+        return self._nic_mgmt.list_nic_interfaces(fields, where)
 
     def list_nic_settings(self, interface):
         raise NotImplementedError
@@ -135,10 +160,10 @@ class ThinkServerClient(BaseClient):
     def set_nic_settings(self, interface, settings):
         raise NotImplementedError
 
-    def list_jobs(self, only_unfinished=False):
+    def list_jobs(self, only_unfinished=False, fields=None, where=None):
         raise NotImplementedError
 
-    def get_job(self, job_id):
+    def get_job(self, job_id, fields=None):
         raise NotImplementedError
         
     def create_config_job(self, resource_uri, cim_creation_class_name,
@@ -163,13 +188,13 @@ class ThinkServerClient(BaseClient):
     def get_lifecycle_controller_version(self):
         raise NotImplementedError
         
-    def list_raid_controllers(self):
+    def list_raid_controllers(self, fields=None, where=None):
         raise NotImplementedError
 
-    def list_virtual_disks(self):
+    def list_virtual_disks(self, fields=None, where=None):
         raise NotImplementedError
         
-    def list_physical_disks(self):
+    def list_physical_disks(self, fields=None, where=None):
         raise NotImplementedError
         
     def convert_physical_disks(self, raid_controller, physical_disks,
@@ -190,20 +215,32 @@ class ThinkServerClient(BaseClient):
     def abandon_pending_raid_changes(self, raid_controller):
         raise NotImplementedError
 
-    def list_cpus(self):
+    def list_cpus(self, fields=None, where=None):
         """Returns the list of CPUs
 
+        :param fields: names of the fields of the CPU objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching CPU objects are returned.
         :returns: a list of CPU objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
         """
-        return self._inventory_mgmt.list_cpus()
+        return self._inventory_mgmt.list_cpus(fields, where)
 
-    def list_memory(self):
+    def list_memory(self, fields=None, where=None):
         """Returns a list of memory modules
 
+        :param fields: names of the fields of the Memory objects needed, only
+                       their properties being requested. Defaults to all the
+                       fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching Memory objects are returned.
         :returns: a list of Memory objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -211,4 +248,4 @@ class ThinkServerClient(BaseClient):
                  interface
         """
 
-        return self._inventory_mgmt.list_memory()
+        return self._inventory_mgmt.list_memory(fields, where)
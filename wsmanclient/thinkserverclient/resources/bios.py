@@ -15,7 +15,7 @@ import collections
 import logging
 import re
 
-from wsmanclient import exceptions, utils, wsman
+from wsmanclient import exceptions, schema, utils, wsman
 from wsmanclient.model import PSU
 from wsmanclient.thinkserverclient import constants
 from wsmanclient.thinkserverclient.resources import uris
@@ -35,6 +35,12 @@ BOOT_MODE_IS_NEXT = {
 
 LC_CONTROLLER_VERSION_12G = (2, 0, 0)
 
+# TODO: Map the HealthState with constants._get_health_state
+PSU_VIEW = schema.View(
+    'PSU', uris.CIM_PowerSupply, [
+        schema.Field('id', 'DeviceID', optional=True)],
+    model=PSU)
+
 class PowerManagement(object):
 
     def __init__(self, client):
@@ -80,32 +86,28 @@ class PowerManagement(object):
     def set_power_state(self, target_state):
         raise NotImplementedError
 
-    def list_power_supply_units(self):
+    def list_power_supply_units(self, fields=None, where=None):
         """Returns the list of PSUs
 
+        :param fields: names of the fields of the PSU objects needed, eg.
+                       ['id']. Only their properties are requested, the other
+                       fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching PSU objects are returned.
         :returns: a list of PSU objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
         """
 
-        doc = self.client.enumerate(uris.CIM_PowerSupply)
+        view = PSU_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         psus = doc.find('.//s:Body/wsen:EnumerateResponse/wsman:Items',
                 wsman.NS_MAP)
 
-        return [self._parse_psus(psu) for psu in psus]
-
-    def _parse_psus(self, psu):
-        return PSU(
-            self._get_psu_attr(psu, 'DeviceID'),
-            None
-            #  constants._get_health_state(self._get_psu_attr(psu, 'HealthState'))
-        )
-
-    def _get_psu_attr(self, psu, attr_name):
-        return utils.get_wsman_wsinst_resource_attr(psu, uris.CIM_PowerSupply,
-                attr_name)
+        return [view.parse(psu) for psu in psus]
 
 class BootManagement(object):
 
@@ -129,6 +131,10 @@ class BootManagement(object):
 class BIOSAttribute(object):
     """Generic BIOS attribute class"""
 
+    # properties decoded by parse
+    _attr_names = ('AttributeName', 'CurrentValue', 'PendingValue',
+                   'IsReadOnly')
+
     def __init__(self, name, current_value, pending_value, read_only):
         """Creates BIOSAttribute object
 
@@ -150,16 +156,10 @@ class BIOSAttribute(object):
     def parse(cls, namespace, bios_attr_xml):
         """Parses XML and creates BIOSAttribute object"""
 
-        name = utils.get_wsman_resource_attr(
-            bios_attr_xml, namespace, 'AttributeName')
-        current_value = utils.get_wsman_resource_attr(
-            bios_attr_xml, namespace, 'CurrentValue', nullable=True)
-        pending_value = utils.get_wsman_resource_attr(
-            bios_attr_xml, namespace, 'PendingValue', nullable=True)
-        read_only = utils.get_wsman_resource_attr(
-            bios_attr_xml, namespace, 'IsReadOnly')
+        attrs = utils.decode_item(bios_attr_xml, namespace, cls._attr_names)
 
-        return cls(name, current_value, pending_value, (read_only == 'true'))
+        return cls(attrs['AttributeName'], attrs['CurrentValue'],
+                   attrs['PendingValue'], (attrs['IsReadOnly'] == 'true'))
 
 
 class BIOSEnumerableAttribute(BIOSAttribute):
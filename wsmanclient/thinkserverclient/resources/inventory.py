@@ -13,11 +13,23 @@
 
 import collections
 
-from wsmanclient import utils, wsman
+from wsmanclient import schema, wsman
 from wsmanclient.model import CPU, Memory
 from wsmanclient.thinkserverclient import constants
 from wsmanclient.thinkserverclient.resources import uris
 
+CPU_VIEW = schema.View('CPU', uris.CIM_Processor, [
+    schema.Field('id', 'DeviceID', optional=True),
+    schema.Field('status', 'HealthState', type=int,
+                 values=constants.HealthState, optional=True)],
+    model=CPU)
+
+# TODO: Map the HealthState with constants.HealthState
+MEMORY_VIEW = schema.View(
+    'Memory', uris.CIM_PhysicalMemory, [
+        schema.Field('id', 'ElementName', optional=True)],
+    model=Memory)
+
 
 class InventoryManagement(object):
 
@@ -28,49 +40,48 @@ class InventoryManagement(object):
         """
         self.client = client
 
-    def list_cpus(self):
+    def list_cpus(self, fields=None, where=None):
         """Returns the list of CPUs
 
+        :param fields: names of the fields of the CPU objects needed, eg.
+                       ['status']. Only their properties are requested, the
+                       other fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching CPU objects are returned.
         :returns: a list of CPU objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
         """
 
-        doc = self.client.enumerate(uris.CIM_Processor)
+        view = CPU_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         cpus = doc.find('.//s:Body/wsen:EnumerateResponse/wsman:Items',
                 wsman.NS_MAP)
 
-        return [self._parse_cpus(cpu) for cpu in cpus]
-
-    def _parse_cpus(self, cpu):
-        return CPU(self._get_cpu_attr(cpu, 'DeviceID'),
-                status=constants.HealthState[int(self._get_cpu_attr(cpu, 'HealthState'))])
+        return [view.parse(cpu) for cpu in cpus]
 
-    def _get_cpu_attr(self, cpu, attr_name):
-        return utils.get_wsman_wsinst_resource_attr(cpu, uris.CIM_Processor, attr_name)
-
-    def list_memory(self):
+    def list_memory(self, fields=None, where=None):
         """Returns the list of installed memory
 
+        :param fields: names of the fields of the Memory objects needed, eg.
+                       ['id']. Only their properties are requested, the other
+                       fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching Memory objects are returned.
         :returns: a list of Memory objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
         """
 
-        doc = self.client.enumerate(uris.CIM_PhysicalMemory)
+        view = MEMORY_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
 
         installed_memory = doc.find('.//s:Body/wsen:EnumerateResponse/wsman:Items',
                 wsman.NS_MAP)
 
-        return [self._parse_memory(memory) for memory in installed_memory]
-
-    def _parse_memory(self, memory):
-        return Memory(self._get_memory_attr(memory, 'ElementName'),
-                None)
-                #  constants.HealthState[self._get_memory_attr(memory, 'HealthState')])
-
-    def _get_memory_attr(self, memory, attr_name):
-        return utils.get_wsman_wsinst_resource_attr(memory, uris.CIM_PhysicalMemory, attr_name)
+        return [view.parse(memory) for memory in installed_memory]
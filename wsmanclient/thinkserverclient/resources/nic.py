@@ -2,7 +2,7 @@ import collections
 import logging
 import re
 
-from wsmanclient import exceptions, utils, wsman
+from wsmanclient import exceptions, schema, wsman
 from wsmanclient.model import NICInterface
 from wsmanclient.thinkserverclient import constants
 from wsmanclient.thinkserverclient.resources import uris
@@ -15,6 +15,14 @@ STATUS_MAP = {
     "3": "Disabled"
 }
 
+# TODO: Map the HealthState with constants.HealthState
+NIC_INTERFACE_VIEW = schema.View(
+    'NICInterface', uris.CIM_NetworkPort, [
+        schema.Field('id', 'DeviceID', optional=True),
+        schema.Field('status', 'HealthState', optional=True)],
+    element='CIM_EthernetPort', namespace=uris.CIM_EthernetPort,
+    model=NICInterface)
+
 class NICManagement(object):
 
     def __init__(self, client):
@@ -24,9 +32,15 @@ class NICManagement(object):
         """
         self.client = client
 
-    def list_nic_interfaces(self):
+    def list_nic_interfaces(self, fields=None, where=None):
         """Returns the list of NIC interfaces
 
+        :param fields: names of the fields of the NICInterface objects needed,
+                       eg. ['status']. Only their properties are requested, the
+                       other fields being None. Defaults to all the fields.
+        :param where: query.Condition, or condition text, on the properties of
+                      the instances, eg. query.Property('HealthState') != 5.
+                      Only the matching NICInterface objects are returned.
         :returns: a list of NIC inteface objects
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
@@ -34,22 +48,11 @@ class NICManagement(object):
                  interface
         """
 
-        doc = self.client.enumerate(uris.CIM_NetworkPort)
-        
+        view = NIC_INTERFACE_VIEW.project(fields)
+        doc = view.enumerate(self.client, where)
+
         nic_interfaces = doc.find(
             './/s:Body/wsen:EnumerateResponse/wsman:Items',
             wsman.NS_MAP)
 
-        return [self._parse_nic_interfaces(interface)
-                for interface in nic_interfaces]
-
-    def _parse_nic_interfaces(self, nic_interface):
-        return NICInterface(
-            self._get_nic_interface_attr(nic_interface, 'DeviceID'),
-            #  constants.HealthState[int(self._get_nic_interface_attr(nic_interface, 'HealthState'))],
-            self._get_nic_interface_attr(nic_interface, 'HealthState'),
-        )
-
-    def _get_nic_interface_attr(self, nic_interface, attr_name):
-        return utils.get_wsman_wsinst_resource_attr(
-            nic_interface, uris.CIM_EthernetPort, attr_name)
+        return [view.parse(interface) for interface in nic_interfaces]
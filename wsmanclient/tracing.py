@@ -0,0 +1,266 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Tracing of the client operations
+
+A span is opened for every call of the BaseClient methods, with a child span
+for every SOAP round-trip made by the call. Tracing does nothing until a
+tracer is installed::
+
+    tracer = tracing.RecordingTracer()
+    tracing.set_tracer(tracer)
+    client.list_boot_devices()
+    print(tracer.format())
+
+Tracers implement start_span of the Tracer class, returning objects with
+the methods of the Span class, eg. adapters of an OpenTelemetry tracer.
+Times are in seconds since the epoch, like the ones of time.time().
+"""
+
+import contextlib
+import functools
+import threading
+import time
+
+_local = threading.local()
+
+
+class Span(object):
+    """Span doing nothing, the interface of the spans of tracers"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exception):
+        pass
+
+    def end(self, end_time=None):
+        pass
+
+
+class Tracer(object):
+    """Tracer doing nothing, the default one"""
+
+    def start_span(self, name, parent=None, attributes=None,
+                   start_time=None):
+        """Starts a span
+
+        :param name: name of the span
+        :param parent: the span of the enclosing operation, if any
+        :param attributes: dictionary of the attributes of the span
+        :param start_time: start of the span, defaults to the current time
+        :returns: a Span object
+        """
+        return _NOOP_SPAN
+
+
+_NOOP_SPAN = Span()
+_NOOP_TRACER = Tracer()
+_tracer = _NOOP_TRACER
+
+
+def set_tracer(tracer):
+    """Installs a tracer for all the clients
+
+    :param tracer: a Tracer object, None restores the no-op default
+    """
+    global _tracer
+    _tracer = tracer or _NOOP_TRACER
+
+
+def get_tracer():
+    return _tracer
+
+
+def enabled():
+    """Returns whether spans are recorded in the current thread"""
+    return (_tracer is not _NOOP_TRACER and
+            not getattr(_local, 'suppressed', False))
+
+
+def _get_stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current_span():
+    """Returns the innermost span open in the current thread, if any"""
+    stack = _get_stack()
+    if stack:
+        return stack[-1]
+
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """Opens a child span of the current one for the block
+
+    Exceptions raised within the block are recorded on the span.
+
+    :param name: name of the span
+    :param attributes: attributes of the span
+    """
+    if not enabled():
+        yield _NOOP_SPAN
+        return
+
+    stack = _get_stack()
+    current = _tracer.start_span(name, current_span(), attributes)
+    stack.append(current)
+    try:
+        yield current
+    except Exception as e:
+        current.record_exception(e)
+        raise
+    finally:
+        stack.pop()
+        current.end()
+
+
+@contextlib.contextmanager
+def suppressed():
+    """Disables tracing in the current thread for the block"""
+    previous = getattr(_local, 'suppressed', False)
+    _local.suppressed = True
+    try:
+        yield
+    finally:
+        _local.suppressed = previous
+
+
+def wrap(func):
+    """Returns a function running func within the current span
+
+    Used for carrying the span of the caller over to a worker thread.
+    """
+    parent = current_span()
+    if parent is None:
+        return func
+
+    def wrapper(*args, **kwargs):
+        previous, _local.stack = _get_stack(), [parent]
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.stack = previous
+
+    return wrapper
+
+
+def traced(func):
+    """Decorator opening a span for the calls of a client method
+
+    The span is named after the class of the client and the method.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not enabled():
+            return func(self, *args, **kwargs)
+
+        with span('%s.%s' % (type(self).__name__, func.__name__),
+                  host=self.client.host):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def record_request(event):
+    """Records the span of a finished SOAP round-trip
+
+    :param event: the metrics.RequestEvent of the request
+    """
+    if not enabled():
+        return
+
+    request_span = _tracer.start_span(
+        'WSMan.%s' % event.operation, current_span(),
+        {'host': event.host,
+         'resource_uri': event.resource_uri,
+         'page': event.page,
+         'attempt': event.attempt,
+         'status_code': event.status_code,
+         'request_size': event.request_size,
+         'response_size': event.response_size,
+         'outcome': event.outcome},
+        start_time=event.start)
+    if event.error is not None:
+        request_span.record_exception(event.error)
+    request_span.end(event.start + event.duration)
+
+
+class RecordedSpan(Span):
+    """Span kept in memory by the RecordingTracer"""
+
+    def __init__(self, tracer, name, parent, attributes, start_time):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.start_time = start_time or time.time()
+        self.end_time = None
+        self.exception = None
+        self.children = []
+        self._tracer = tracer
+
+    @property
+    def duration(self):
+        if self.end_time is not None:
+            return self.end_time - self.start_time
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exception = exception
+
+    def end(self, end_time=None):
+        self.end_time = end_time or time.time()
+        self._tracer._record(self)
+
+
+class RecordingTracer(Tracer):
+    """Tracer keeping the spans in memory, eg. for tests or scripts"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def start_span(self, name, parent=None, attributes=None,
+                   start_time=None):
+        return RecordedSpan(self, name, parent, attributes, start_time)
+
+    def _record(self, span):
+        with self._lock:
+            if span.parent is None:
+                self.spans.append(span)
+            else:
+                span.parent.children.append(span)
+
+    def format(self):
+        """Returns the trees of the spans recorded as text"""
+        lines = []
+
+        def add(span, depth):
+            lines.append('%s%s %.1fms%s' % (
+                '  ' * depth, span.name, span.duration * 1000,
+                '' if span.exception is None
+                else ' (%s)' % type(span.exception).__name__))
+            for child in sorted(span.children,
+                                key=lambda child: child.start_time):
+                add(child, depth + 1)
+
+        for root in self.spans:
+            add(root, 0)
+
+        return '\n'.join(lines)
@@ -11,19 +11,23 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from dateutil import parser
-
 """
 Common functionalities shared between different DRAC modules.
 """
 
+import datetime
+
 NS_XMLSchema_Instance = 'http://www.w3.org/2001/XMLSchema-instance'
+_NIL_ATTR = '{%s}nil' % NS_XMLSchema_Instance
 
 # ReturnValue constants
 RET_SUCCESS = '0'
 RET_ERROR = '2'
 RET_CREATED = '4096'
 
+# number of CIM datetime values parsed and kept by parse_cim_datetime
+CIM_DATETIME_CACHE_SIZE = 1024
+
 
 def find_xml(doc, item, namespace, find_all=False):
     """Find the first or all elements in an ElementTree object.
@@ -73,6 +77,45 @@ def get_wsman_resource_attr(doc, resource_uri, attr_name, nullable=False):
             return item.text.strip()
 
 
+def decode_item(item, namespace, names=None, lists=()):
+    """Decode the properties of a resource item in a single pass.
+
+    Unlike get_wsman_resource_attr, which searches the item once per
+    property, the children of the item are walked once.
+
+    :param item: the element of the resource item.
+    :param namespace: the namespace of the properties.
+    :param names: names of the properties to decode, defaults to all of them.
+    :param lists: names of the multi-valued properties, whose values are
+                  collected into lists.
+    :returns: a dictionary of the stripped text of the properties by name,
+              None for the ones with an XMLSchema-instance nil attribute
+              that has a value of true. Missing properties are left out,
+              unless they are multi-valued, mapped to an empty list then.
+    """
+    if names is not None and not isinstance(names, frozenset):
+        names = frozenset(names)
+
+    properties = dict((name, []) for name in lists)
+    offset = len(namespace) + 2
+    for child in item.iterchildren('{%s}*' % namespace):
+        name = child.tag[offset:]
+        if names is not None and name not in names:
+            continue
+
+        if child.get(_NIL_ATTR) == 'true':
+            value = None
+        else:
+            value = (child.text or '').strip()
+
+        if name in lists:
+            properties[name].append(value)
+        elif name not in properties:
+            properties[name] = value
+
+    return properties
+
+
 def is_reboot_required(doc, resource_uri):
     """Check the response document if reboot is requested.
 
@@ -102,8 +145,122 @@ def validate_integer_value(value, attr_name, error_msgs):
         error_msgs.append("'%s' is not an integer value" % attr_name)
 
 
+class FixedOffset(datetime.tzinfo):
+    """Time zone with a fixed offset from UTC, as found in CIM datetimes"""
+
+    def __init__(self, minutes):
+        """Creates time zone object
+
+        :param minutes: offset from UTC in minutes, east of UTC being
+                        positive
+        """
+        self.minutes = minutes
+        self._offset = datetime.timedelta(minutes=minutes)
+
+    def utcoffset(self, dt):
+        return self._offset
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+    def tzname(self, dt):
+        if not self.minutes:
+            return 'UTC'
+
+        sign = '-' if self.minutes < 0 else '+'
+        return '%s%02d:%02d' % ((sign,) + divmod(abs(self.minutes), 60))
+
+    def __getinitargs__(self):
+        return (self.minutes,)
+
+    def __repr__(self):
+        return 'FixedOffset(%d)' % self.minutes
+
+
+_timezones = {}
+_cim_datetimes = {}
+
+
+def _get_timezone(minutes):
+    try:
+        return _timezones[minutes]
+    except KeyError:
+        return _timezones.setdefault(minutes, FixedOffset(minutes))
+
+
+def _parse_cim_datetime(value):
+    if (len(value) != 25 or value[14] != '.' or not value[:14].isdigit() or
+            not value[15:21].isdigit() or not value[22:].isdigit()):
+        raise ValueError('Invalid CIM datetime: %r' % value)
+
+    sign = value[21]
+    if sign == ':':
+        if value[22:] != '000':
+            raise ValueError('Invalid CIM interval: %r' % value)
+
+        return datetime.timedelta(days=int(value[:8]),
+                                  hours=int(value[8:10]),
+                                  minutes=int(value[10:12]),
+                                  seconds=int(value[12:14]),
+                                  microseconds=int(value[15:21]))
+
+    if sign == '+':
+        offset = int(value[22:])
+    elif sign == '-':
+        offset = -int(value[22:])
+    else:
+        raise ValueError('Invalid CIM datetime: %r' % value)
+
+    return datetime.datetime(int(value[:4]), int(value[4:6]),
+                             int(value[6:8]), int(value[8:10]),
+                             int(value[10:12]), int(value[12:14]),
+                             int(value[15:21]), _get_timezone(offset))
+
+
+def parse_cim_datetime(value):
+    """Parses a CIM datetime value
+
+    Timestamps have the 'yyyymmddHHMMSS.mmmmmmsUUU' format, where sUUU is
+    the offset from UTC in minutes, and intervals the
+    'ddddddddHHMMSS.mmmmmm:000' one. The last values parsed are cached, as
+    the same timestamps are repeated across the instances and the nodes.
+
+    :param value: the CIM datetime value
+    :returns: a datetime object for timestamps, with a FixedOffset time zone,
+              or a timedelta object for intervals
+    :raises: ValueError when the value isn't a valid CIM datetime
+    """
+    try:
+        return _cim_datetimes[value]
+    except KeyError:
+        pass
+
+    result = _parse_cim_datetime(value)
+    if len(_cim_datetimes) >= CIM_DATETIME_CACHE_SIZE:
+        _cim_datetimes.clear()
+    _cim_datetimes[value] = result
+
+    return result
+
+
+def format_cim_datetime(value):
+    """Formats a datetime as a CIM datetime value
+
+    :param value: a datetime object, naive ones being taken as UTC
+    :returns: the CIM datetime value, eg. '20160714202232.000000+000'
+    """
+    offset = value.utcoffset()
+    minutes = 0 if offset is None else int(offset.total_seconds()) // 60
+
+    return '%s%s%03d' % (value.strftime('%Y%m%d%H%M%S.%f'),
+                         '-' if minutes < 0 else '+', abs(minutes))
+
+
 def parse_idrac_time(time_string):
-    # Convert "20150331192816.000000+000" to "20150331192816 +0000" so that dateutil.parser
-    # would accept it
-    converted_time_string = time_string[:14] + ' +0' + time_string[-3:]
-    return parser.parse(converted_time_string)
+    """Parses a timestamp reported by the iDRAC
+
+    :param time_string: the timestamp, eg. '20150331192816.000000+000'
+    :returns: a datetime object
+    :raises: ValueError when the value isn't a valid CIM datetime
+    """
+    return parse_cim_datetime(time_string)
@@ -11,14 +11,27 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import exceptions
+import collections
+import contextlib
+import copy
+import functools
 import logging
+import re
+import threading
+import time
 import uuid
 
+from concurrent import futures
 import requests
+import requests.adapters
 import requests.exceptions
+from requests.packages.urllib3 import connection as http_connection
+from requests.packages.urllib3 import connectionpool
 from lxml import etree as ElementTree
 
+from wsmanclient import (exceptions, metrics, paging, query, retry, tracing,
+                         utils)
+
 LOG = logging.getLogger(__name__)
 
 NS_SOAP_ENV = 'http://www.w3.org/2003/05/soap-envelope'
@@ -27,6 +40,7 @@ NS_WS_ADDR_ANONYM_ROLE = ('http://schemas.xmlsoap.org/ws/2004/08/addressing/'
                           'role/anonymous')
 NS_WSMAN = 'http://schemas.dmtf.org/wbem/wsman/1/wsman.xsd'
 NS_WSMAN_ENUM = 'http://schemas.xmlsoap.org/ws/2004/09/enumeration'
+NS_WS_TRANSFER = 'http://schemas.xmlsoap.org/ws/2004/09/transfer'
 NS_WSMB = 'http://schemas.dmtf.org/wbem/wsman/1/cimbinding.xsd'
 
 NS_MAP = {'s': NS_SOAP_ENV,
@@ -43,12 +57,71 @@ NS_MAP_COMPUTER_SYSTEM = {'s': NS_SOAP_ENV,
 FILTER_DIALECT_MAP = {'cql': 'http://schemas.dmtf.org/wbem/cql/1/dsp0202.pdf',
                       'wql': 'http://schemas.microsoft.com/wbem/wsman/1/WQL'}
 
+# dialect of the fragment expressions, naming a property of the instance
+FRAGMENT_DIALECT_XPATH = 'http://www.w3.org/TR/1999/REC-xpath-19991116'
+
+# Most BMCs only handle a handful of parallel sessions, so there is no point in
+# keeping more connections than that around.
+DEFAULT_POOL_MAXSIZE = 2
+# Seconds a pooled connection may stay unused before it is dropped. BMCs tend
+# to close idle keep-alive connections on their side, and reusing such a
+# connection results in a failed request.
+DEFAULT_POOL_IDLE_TIMEOUT = 30
+# Size of the chunks response bodies are read in. Responses are parsed while
+# they are still arriving, instead of being buffered first.
+RESPONSE_CHUNK_SIZE = 16 * 1024
+# Seconds to wait for establishing a connection and for the next bytes of a
+# response. Both are cut short by the deadline of the operation, if any.
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 120
+# Maximum number of rendered payload templates kept around
+PAYLOAD_TEMPLATE_CACHE_SIZE = 512
+
 
 class Client(object):
     """Simple client for talking over WSMan protocol."""
 
     def __init__(self, host, username, password, port=443, path='/wsman',
-                 protocol='https'):
+                 protocol='https', pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT, prefetch=False,
+                 adaptive_max_elems=False, retry_policy=None,
+                 circuit_breaker=True, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, transport=None,
+                 hooks=None):
+        """Creates client object
+
+        :param host: hostname or IP of the WS-Man endpoint
+        :param username: username for accessing the endpoint
+        :param password: password for accessing the endpoint
+        :param port: port for accessing the endpoint
+        :param path: path for accessing the endpoint
+        :param protocol: protocol for accessing the endpoint
+        :param pool_maxsize: maximum number of keep-alive connections kept
+                             open to the endpoint
+        :param pool_idle_timeout: number of seconds after which unused pooled
+                                  connections are dropped. None disables the
+                                  eviction.
+        :param prefetch: default of the prefetch flag of enumerate
+        :param adaptive_max_elems: flag to learn the page size of enumerations
+                                   per resource from the timing and size of
+                                   the pages received. Used when max_elems
+                                   isn't passed explicitly.
+        :param retry_policy: RetryPolicy of failed requests. Defaults to a
+                             few attempts with exponential backoff, pass
+                             retry.NO_RETRY to disable retrying.
+        :param circuit_breaker: flag to fail requests fast while the
+                                endpoint keeps failing
+        :param connect_timeout: number of seconds to wait for establishing a
+                                connection
+        :param read_timeout: number of seconds to wait for the next bytes of
+                             a response
+        :param transport: object sending the requests instead of the HTTP
+                          session, eg. a capture.Recorder or
+                          capture.Replayer
+        :param hooks: list of callables called with a metrics.RequestEvent
+                      for every request sent, eg. a
+                      metrics.MetricsCollector
+        """
         self.host = host
         self.username = username
         self.password = password
@@ -60,42 +133,293 @@ class Client(object):
             'host': self.host,
             'port': self.port,
             'path': self.path})
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.prefetch = prefetch
+        self.adaptive_max_elems = adaptive_max_elems
+        self._page_sizers = {}
+        # resources whose projection queries were rejected by the endpoint,
+        # see schema.View.enumerate
+        self.unsupported_projections = set()
+        # resources whose instances can't be read with a Get, see
+        # schema.View.get
+        self.unsupported_gets = set()
+        # resources whose properties can't be read with a fragment transfer
+        self.unsupported_fragments = set()
+        self.retry_policy = retry_policy or retry.RetryPolicy()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.transport = transport
+        self.hooks = list(hooks or [])
+        self._circuit_breaker = None
+        if circuit_breaker:
+            self._circuit_breaker = retry.get_circuit_breaker(self.endpoint)
+
+        self._session = None
+        self._session_last_used = None
+        self._session_lock = threading.Lock()
+        self._prefetch_executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the pooled connections to the endpoint
+
+        The client remains usable, the next request opens a new connection.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
-    def _do_request(self, payload):
-        payload = payload.build()
-        LOG.debug('Sending request to %(endpoint)s: %(payload)s',
-                  {'endpoint': self.endpoint, 'payload': payload})
-        try:
-            resp = requests.post(
-                self.endpoint,
-                auth=requests.auth.HTTPBasicAuth(self.username, self.password),
-                data=payload,
-                # TODO(ifarkas): enable cert verification
-                verify=False)
+            executor, self._prefetch_executor = self._prefetch_executor, None
 
-        except Exception as e:
-            # This is a hack for handling 'No route to host' ConnectionError,
-            # so that the Traceback would not be shown
-            if e.__class__ == 'requests.exceptions.ConnectionError':
-                LOG.exception('Request failed (ConnectionError)')
-                raise exceptions.WSManRequestFailure()
-            if e.__class__ == 'requests.exceptions.RequestException':
-                LOG.exception('Request failed')
-                raise exceptions.WSManRequestFailure()
-            else:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def deadline(timeout):
+        """Bounds the time taken by all requests sent within the block
+
+        See the deadline function of the module.
+        """
+        return deadline(timeout)
+
+    def _get_prefetch_executor(self):
+        with self._session_lock:
+            # a single worker, pulls of an enumeration depend on each other
+            if self._prefetch_executor is None:
+                self._prefetch_executor = futures.ThreadPoolExecutor(1)
+
+            return self._prefetch_executor
+
+    def _get_session(self):
+        with self._session_lock:
+            now = time.time()
+            if (self._session is not None and
+                    self.pool_idle_timeout is not None and
+                    now - self._session_last_used > self.pool_idle_timeout):
+                LOG.debug('Dropping idle connections to %s', self.endpoint)
+                self._session.close()
+                self._session = None
+
+            if self._session is None:
+                self._session = self._create_session()
+
+            self._session_last_used = now
+            return self._session
+
+    def _create_session(self):
+        session = requests.Session()
+        session.auth = requests.auth.HTTPBasicAuth(self.username,
+                                                   self.password)
+        # TODO(ifarkas): enable cert verification
+        session.verify = False
+
+        adapter = _InstrumentedAdapter(pool_connections=1,
+                                       pool_maxsize=self.pool_maxsize)
+        session.mount('%s://' % self.protocol, adapter)
+
+        return session
+
+    def _do_request(self, payload, stream=False):
+        """Sends the request, retrying it according to the retry policy
+
+        :param payload: a _Payload object of the request
+        :param stream: flag to return the body unread. Otherwise the body is
+                       received and parsed before returning, so that failing
+                       to receive it is retried like any other failure.
+        :returns: a _ResponseBody object of the response, holding the parsed
+                  document in its xml attribute unless streamed
+        """
+        data = payload.build()
+
+        attempt = 1
+        while True:
+            # running out of time before sending tells nothing about the
+            # endpoint, so it's checked before taking the probe of the breaker
+            timeout = self._get_timeout()
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.before_request()
+
+            payload.attempts = attempt
+            try:
+                body = self._send(payload, data, timeout, attempt)
+                if stream:
+                    # settled once the body is received
+                    body.circuit_breaker = self._circuit_breaker
+                    return body
+
+                body.xml = _parse_body(body)
+                error = None
+            except (requests.exceptions.RequestException,
+                    exceptions.WSManInvalidResponse) as e:
+                error = e
+            except _ReceiveFailure as e:
+                error = e.error
+            except BaseException as e:
+                # eg. running out of time while receiving the response, the
+                # breaker mustn't be left waiting for the outcome of a probe
+                _settle_circuit(self._circuit_breaker, e)
                 raise
 
-        LOG.debug('Received response from %(endpoint)s: %(payload)s',
-                  {'endpoint': self.endpoint, 'payload': resp.content})
+            _settle_circuit(self._circuit_breaker, error)
+            if error is None:
+                return body
+
+            if _deadline_passed():
+                LOG.error('Request to %(endpoint)s failed: %(error)s',
+                          {'endpoint': self.endpoint, 'error': error})
+                raise exceptions.WSManDeadlineExceeded(
+                    endpoint=self.endpoint)
+
+            retryable = self.retry_policy.is_retryable(error,
+                                                       payload.idempotent)
+            if not retryable or attempt >= self.retry_policy.max_attempts:
+                if isinstance(error, exceptions.WSManInvalidResponse):
+                    raise error
+
+                # no traceback, eg. 'No route to host' is expected to happen
+                LOG.error('Request to %(endpoint)s failed: %(error)s',
+                          {'endpoint': self.endpoint, 'error': error})
+                raise exceptions.WSManRequestFailure()
+
+            delay = self.retry_policy.get_delay(attempt)
+            if _deadline_passed(delay):
+                LOG.error('Request to %(endpoint)s failed, no time left for '
+                          'retrying: %(error)s',
+                          {'endpoint': self.endpoint, 'error': error})
+                raise exceptions.WSManDeadlineExceeded(
+                    endpoint=self.endpoint)
+
+            LOG.warning('Request to %(endpoint)s failed, retrying in '
+                        '%(delay).2f seconds: %(error)s',
+                        {'endpoint': self.endpoint, 'delay': delay,
+                         'error': error})
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_timeout(self):
+        remaining = _time_remaining()
+        if remaining is None:
+            return (self.connect_timeout, self.read_timeout)
+
+        if remaining <= 0:
+            raise exceptions.WSManDeadlineExceeded(endpoint=self.endpoint)
+
+        return (min(self.connect_timeout, remaining),
+                min(self.read_timeout, remaining))
+
+    def _send(self, payload, data, timeout, attempt=1):
+        event = None
+        if self.hooks or tracing.enabled():
+            event = metrics.RequestEvent(self.host, payload.action,
+                                         payload.resource_uri, len(data),
+                                         payload.page, attempt)
+
+        LOG.debug('Sending request to %(endpoint)s: %(payload)s',
+                  {'endpoint': self.endpoint, 'payload': data})
+        try:
+            with _timings(event):
+                if self.transport is not None:
+                    resp = self.transport.post(self, payload, data, timeout)
+                else:
+                    resp = self._get_session().post(self.endpoint, data=data,
+                                                    stream=True,
+                                                    timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            self._emit(event, e)
+            raise
+
+        LOG.debug('Received response from %(endpoint)s: %(status_code)s',
+                  {'endpoint': self.endpoint,
+                   'status_code': resp.status_code})
+        if event is not None:
+            event.status_code = resp.status_code
+
         if not resp.ok:
-            raise exceptions.WSManInvalidResponse(
+            fault_subcode = None
+            if resp.status_code in _FAULT_STATUS_CODES:
+                try:
+                    fault_subcode = _fault_subcode(
+                        b''.join(resp.iter_content(RESPONSE_CHUNK_SIZE)))
+                except requests.exceptions.RequestException:
+                    pass  # the status code is enough to go on
+
+            resp.close()
+            error = exceptions.WSManInvalidResponse(
                 status_code=resp.status_code,
-                reason=resp.reason)
-        else:
-            return resp
+                reason=resp.reason,
+                fault_subcode=fault_subcode)
+            self._emit(event, error)
+            raise error
+
+        return _ResponseBody(resp, self.endpoint, event, self._emit)
+
+    def _emit(self, event, error=None):
+        """Calls the hooks with the event of a finished request"""
+        if event is None:
+            return
+
+        event.finish(error)
+        tracing.record_request(event)
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                LOG.exception('Request hook %r failed', hook)
+
+    def get_max_elems(self, resource_uri):
+        """Returns the page size used for enumerating a resource
 
-    def enumerate(self, resource_uri, optimization=True, max_elems=100,
-                  auto_pull=True, filter_query=None, filter_dialect='cql'):
+        :param resource_uri: URI of the resource
+        :returns: the learned page size if adaptive_max_elems is enabled,
+                  the default one otherwise
+        """
+        if not self.adaptive_max_elems:
+            return paging.DEFAULT_MAX_ELEMS
+
+        return self._get_page_sizer(resource_uri).max_elems
+
+    def _get_page_sizer(self, resource_uri):
+        sizer = self._page_sizers.get(resource_uri)
+        if sizer is None:
+            sizer = self._page_sizers.setdefault(resource_uri,
+                                                 paging.PageSizer())
+        return sizer
+
+    def _request_page(self, resource_uri, payload):
+        if not self.adaptive_max_elems:
+            return self._do_request(payload).xml
+
+        sizer = self._get_page_sizer(resource_uri)
+        start = time.time()
+        try:
+            body = self._do_request(payload)
+            resp_xml = body.xml
+        except (exceptions.WSManCircuitOpen, exceptions.WSManCaptureMiss):
+            raise
+        except exceptions.WSManRequestFailure:
+            # the page is only blamed if it was sent, unlike when running
+            # out of time before
+            if payload.attempts:
+                sizer.record_failure(payload.max_elems)
+            raise
+
+        items_xml = _enum_items(resp_xml)
+        sizer.record(payload.max_elems,
+                     0 if items_xml is None else len(items_xml),
+                     time.time() - start, body.size)
+
+        return resp_xml
+
+    def enumerate(self, resource_uri, optimization=True, max_elems=None,
+                  auto_pull=True, filter_query=None, filter_dialect='cql',
+                  prefetch=None, timeout=None):
         """Executes enumerate operation over WSMan.
 
         :param resource_uri: URI of resource to enumerate.
@@ -103,102 +427,750 @@ class Client(object):
                              disabled, the enumeration returns only an
                              enumeration context.
         :param max_elems: maximum number of elements returned by the operation.
+                          If not set, the page size of the client is used.
         :param auto_pull: flag to enable automatic pull on the enumeration
                           context, merging the items returned.
-        :param filter_query: filter query string.
+        :param filter_query: filter query string, or query.Query object.
         :param filter_dialect: filter dialect. Valid options are: 'cql' and
                                'wql'.
+        :param prefetch: flag to issue the pull of the next page on a
+                         background worker while the items of the current
+                         page are merged. Only used with auto_pull. If not
+                         set, the default of the client is used.
+        :param timeout: number of seconds the whole operation, including all
+                        the pulls, may take
         :returns: an lxml.etree.Element object of the response received.
         :raises: WSManRequestFailure on request failures
+        :raises: WSManDeadlineExceeded when running out of time
         :raises: WSManInvalidResponse when receiving invalid response
         """
+        with deadline(timeout):
+            return self._enumerate(resource_uri, optimization, max_elems,
+                                   auto_pull, filter_query, filter_dialect,
+                                   prefetch)
 
+    def _enumerate(self, resource_uri, optimization, max_elems, auto_pull,
+                   filter_query, filter_dialect, prefetch):
         payload = _EnumeratePayload(self.endpoint, resource_uri,
-                                    optimization, max_elems,
+                                    optimization,
+                                    max_elems or self.get_max_elems(
+                                        resource_uri),
                                     filter_query, filter_dialect)
+        payload.page = page = 1
 
-        resp = self._do_request(payload)
-        resp_xml = ElementTree.fromstring(resp.content)
+        resp_xml = self._request_page(resource_uri, payload)
 
         if auto_pull:
-            find_items_query = './/{%s}Items' % NS_WSMAN_ENUM
+            if prefetch is None:
+                prefetch = self.prefetch
+
             full_resp_xml = resp_xml
+            next_page = None
 
-            context = self._enum_context(full_resp_xml)
+            context = _enum_context(full_resp_xml)
             while context is not None:
-                resp_xml = self.pull(resource_uri, context, max_elems)
-                context = self._enum_context(resp_xml)
-
-                items_xml = full_resp_xml.find(find_items_query)
-                if items_xml is not None:
-                    # merge enumeration items
-                    for item in resp_xml.find(find_items_query):
-                        items_xml.append(item)
+                page += 1
+                if next_page is not None:
+                    resp_xml = next_page.result()
                 else:
-                    full_resp_xml = resp_xml
+                    resp_xml = self._pull_page(page, resource_uri, context,
+                                               max_elems)
+                context = _enum_context(resp_xml)
+
+                if prefetch and context is not None:
+                    next_page = self._get_prefetch_executor().submit(
+                        tracing.wrap(functools.partial(_run_with_deadline,
+                                                       _get_deadline())),
+                        self._pull_page, page + 1, resource_uri, context,
+                        max_elems)
+
+                full_resp_xml = _merge_enum_items(full_resp_xml, resp_xml)
 
             # remove enumeration context because items are already merged
-            enum_context_elem = full_resp_xml.find('.//{%s}EnumerationContext'
-                                                   % NS_WSMAN_ENUM)
-            if enum_context_elem is not None:
-                enum_context_elem.getparent().remove(enum_context_elem)
+            _remove_enum_context(full_resp_xml)
 
             return full_resp_xml
         else:
             return resp_xml
 
-    def pull(self, resource_uri, context, max_elems=100):
+    def pull(self, resource_uri, context, max_elems=None):
         """Executes pull operation over WSMan.
 
         :param resource_uri: URI of resource to pull
         :param context: enumeration context
-        :param max_elems: maximum number of elements returned by the operation
+        :param max_elems: maximum number of elements returned by the
+                          operation. If not set, the page size of the client
+                          is used.
         :returns: an lxml.etree.Element object of the response received
         :raises: WSManRequestFailure on request failures
         :raises: WSManInvalidResponse when receiving invalid response
         """
 
         payload = _PullPayload(self.endpoint, resource_uri, context,
-                               max_elems)
-        resp = self._do_request(payload)
-        resp_xml = ElementTree.fromstring(resp.content)
+                               max_elems or self.get_max_elems(resource_uri))
+        payload.page = getattr(_local, 'page', None)
+        return self._request_page(resource_uri, payload)
 
-        return resp_xml
+    def _pull_page(self, page, resource_uri, context, max_elems):
+        # the number of the page is passed on to the event of the pull
+        _local.page = page
+        try:
+            return self.pull(resource_uri, context, max_elems)
+        finally:
+            _local.page = None
+
+    def iter_enumerate(self, resource_uri, optimization=True, max_elems=None,
+                       filter_query=None, filter_dialect='cql'):
+        """Executes enumerate over WSMan, yielding items page by page.
+
+        Unlike enumerate with auto_pull, the items are not merged into a
+        single document. Items are handed out as soon as they are parsed,
+        while the rest of the page is still arriving, and each page is pulled
+        only after the items of the previous page were consumed. If the
+        generator is closed before the end of the sequence, the enumeration
+        context is released.
+
+        Items are cleared once the next one is requested, so consumers
+        should extract the values they need instead of holding on to the
+        elements.
+
+        :param resource_uri: URI of resource to enumerate.
+        :param optimization: flag to enable enumeration optimization. If
+                             disabled, the enumeration returns only an
+                             enumeration context.
+        :param max_elems: maximum number of elements returned by a single
+                          operation. If not set, the page size of the client
+                          is used.
+        :param filter_query: filter query string, or query.Query object.
+        :param filter_dialect: filter dialect. Valid options are: 'cql' and
+                               'wql'.
+        :returns: a generator of lxml.etree.Element objects, one for each
+                  item received.
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
 
-    def invoke(self, resource_uri, method, selectors, properties):
+        payload = _EnumeratePayload(self.endpoint, resource_uri,
+                                    optimization,
+                                    max_elems or self.get_max_elems(
+                                        resource_uri),
+                                    filter_query, filter_dialect)
+        payload.page = page_number = 1
+
+        page = _StreamedResponse(self._do_request(payload, stream=True))
+        items = page.items()
+
+        context = None
+        try:
+            while True:
+                for item in items:
+                    context = page.context
+                    yield item
+
+                context = page.context
+                if page.end_of_sequence:
+                    context = None
+                page.close()
+
+                if context is None:
+                    break
+
+                payload = _PullPayload(self.endpoint, resource_uri, context,
+                                       max_elems or self.get_max_elems(
+                                           resource_uri))
+                payload.page = page_number = page_number + 1
+                page = _StreamedResponse(
+                    self._do_request(payload, stream=True))
+                items = page.items()
+        finally:
+            if context is None:
+                # optimized enumerations send the context after the items,
+                # so the rest of the page is needed for releasing it
+                context = page.drain(items)
+            page.close()
+            if context is not None:
+                self._release_quietly(resource_uri, context)
+
+    def release(self, resource_uri, context):
+        """Executes release operation over WSMan.
+
+        Frees an enumeration context which won't be pulled until the end of
+        the sequence.
+
+        :param resource_uri: URI of resource
+        :param context: enumeration context
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = _ReleasePayload(self.endpoint, resource_uri, context)
+        return self._do_request(payload).xml
+
+    def _release_quietly(self, resource_uri, context):
+        try:
+            self.release(resource_uri, context)
+        except (exceptions.WSManRequestFailure,
+                exceptions.WSManInvalidResponse):
+            LOG.warning('Failed to release enumeration context %(context)s '
+                        'of %(resource_uri)s',
+                        {'context': context, 'resource_uri': resource_uri})
+
+    def get(self, resource_uri, selectors):
+        """Executes get operation over WSMan.
+
+        Reads a single instance, identified by its selectors, without the
+        round trips and the filter evaluation of an enumeration.
+
+        :param resource_uri: URI of the resource
+        :param selectors: dict of the selectors identifying the instance
+        :returns: an lxml.etree.Element object of the response received, the
+                  body holding the instance
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response, eg.
+                 the fault of an instance which doesn't exist
+        """
+
+        payload = _GetPayload(self.endpoint, resource_uri, selectors)
+        return self._do_request(payload).xml
+
+    def get_fragment(self, resource_uri, selectors, fragment):
+        """Executes get operation over WSMan on a fragment of an instance.
+
+        Only the fragment is returned, within a wsman:XmlFragment element,
+        instead of the whole instance.
+
+        :param resource_uri: URI of the resource
+        :param selectors: dict of the selectors identifying the instance
+        :param fragment: name of the property read, eg. 'EnabledState'
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response, eg.
+                 the fault of an endpoint not supporting fragment transfer
+        """
+
+        payload = _GetFragmentPayload(self.endpoint, resource_uri, selectors,
+                                      fragment)
+        return self._do_request(payload).xml
+
+    def put_fragment(self, resource_uri, selectors, fragment, value):
+        """Executes put operation over WSMan on a fragment of an instance.
+
+        :param resource_uri: URI of the resource
+        :param selectors: dict of the selectors identifying the instance
+        :param fragment: name of the property updated
+        :param value: new value of the property
+        :returns: an lxml.etree.Element object of the response received
+        :raises: WSManRequestFailure on request failures
+        :raises: WSManInvalidResponse when receiving invalid response
+        """
+
+        payload = _PutFragmentPayload(self.endpoint, resource_uri, selectors,
+                                      fragment, value)
+        return self._do_request(payload).xml
+
+    def invoke(self, resource_uri, method, selectors, properties,
+               timeout=None):
         """Executes invoke operation over WSMan.
 
         :param resource_uri: URI of resource to invoke
         :param method: name of the method to invoke
         :param selector: dict of selectors
         :param properties: dict of properties
+        :param timeout: number of seconds the operation may take
         :returns: an lxml.etree.Element object of the response received.
         :raises: WSManRequestFailure on request failures
+        :raises: WSManDeadlineExceeded when running out of time
         :raises: WSManInvalidResponse when receiving invalid response
         """
 
         payload = _InvokePayload(self.endpoint, resource_uri, method,
                                  selectors, properties)
-        resp = self._do_request(payload)
-        resp_xml = ElementTree.fromstring(resp.content)
+        with deadline(timeout):
+            return self._do_request(payload).xml
+
+
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def deadline(timeout):
+    """Bounds the time taken by all requests sent within the block
+
+    The deadline covers every request of the thread, so that multi-page
+    operations like enumerate or list_bios_settings finish within the budget
+    or fail early with WSManDeadlineExceeded. Nested deadlines can only
+    shorten the time available.
+
+    :param timeout: number of seconds the block may take. None leaves the
+                    current deadline in effect.
+    """
+    if timeout is None:
+        yield
+        return
+
+    previous = _get_deadline()
+    expires = time.time() + timeout
+    if previous is not None:
+        expires = min(previous, expires)
+
+    _local.deadline = expires
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def _get_deadline():
+    return getattr(_local, 'deadline', None)
+
+
+def _time_remaining():
+    expires = _get_deadline()
+    if expires is not None:
+        return expires - time.time()
+
+
+def _deadline_passed(delay=0):
+    remaining = _time_remaining()
+    return remaining is not None and remaining <= delay
+
+
+def _run_with_deadline(expires, func, *args, **kwargs):
+    # carries the deadline of the caller over to a worker thread
+    _local.deadline = expires
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _local.deadline = None
+
+
+@contextlib.contextmanager
+def _timings(event):
+    """Collects the connection timings of the requests sent within the block
+
+    The connection phases are recorded by the connection classes, the rest
+    of the time until the response headers arrived is the one of the server.
+    """
+    if event is None:
+        yield
+        return
+
+    _local.timings = event.timings
+    start = time.time()
+    try:
+        yield
+    finally:
+        _local.timings = None
+        connection = sum(event.timings.values())
+        event.timings['server'] = max(0.0, time.time() - start - connection)
+
+
+def _get_timings():
+    return getattr(_local, 'timings', None)
+
+
+class _TimedConnectionMixin(object):
+    """Records the connection phases of the instrumented requests"""
+
+    def _new_conn(self):
+        timings = _get_timings()
+        if timings is None:
+            return super(_TimedConnectionMixin, self)._new_conn()
+
+        # urllib3 doesn't separate resolving the hostname from connecting,
+        # so both are timed together
+        start = time.time()
+        conn = super(_TimedConnectionMixin, self)._new_conn()
+        timings['connect'] = time.time() - start
+        return conn
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin,
+                           http_connection.HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin,
+                            http_connection.HTTPSConnection):
+
+    def connect(self):
+        start = time.time()
+        super(_TimedHTTPSConnection, self).connect()
+
+        timings = _get_timings()
+        if timings is not None:
+            timings['tls'] = max(0.0, time.time() - start -
+                                 timings.get('connect', 0))
+
+
+class _TimedHTTPConnectionPool(connectionpool.HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(connectionpool.HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _InstrumentedAdapter(requests.adapters.HTTPAdapter):
+    """HTTP adapter recording the connection phases of the requests"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(_InstrumentedAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool}
+
+
+class _ReceiveFailure(exceptions.WSManRequestFailure):
+    """Receiving the body of a response failed"""
+
+    msg_fmt = 'Receiving response from %(endpoint)s failed: %(error)s'
+
+    def __init__(self, **kwargs):
+        super(_ReceiveFailure, self).__init__(**kwargs)
+        self.error = kwargs['error']
+
+
+class _ResponseBody(object):
+    """Body of a streamed response, counting the bytes received
+
+    Once closed, the event of the request is finished and emitted.
+    """
+
+    def __init__(self, resp, endpoint, event=None, emit=None):
+        self.resp = resp
+        self.endpoint = endpoint
+        self.size = 0
+        self.deadline = _get_deadline()
+        self.event = event
+        self.xml = None
+        self.circuit_breaker = None
+        self._emit = emit
+        self._received = time.time()
+
+    def __iter__(self):
+        chunks = self.resp.iter_content(RESPONSE_CHUNK_SIZE)
+        while True:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                break
+            except requests.exceptions.RequestException as e:
+                raise _ReceiveFailure(endpoint=self.endpoint, error=e)
+
+            if self.deadline is not None and time.time() > self.deadline:
+                raise exceptions.WSManDeadlineExceeded(endpoint=self.endpoint)
+
+            self.size += len(chunk)
+            yield chunk
+
+        LOG.debug('Received %(size)d bytes from %(endpoint)s',
+                  {'size': self.size, 'endpoint': self.endpoint})
+
+    def close(self, error=None):
+        """Closes the response
+
+        :param error: the exception receiving or parsing the body failed
+                      with, if any
+        """
+        self.resp.close()
+
+        _settle_circuit(self.circuit_breaker, error)
+        self.circuit_breaker = None
+
+        if self.event is not None and self.event.outcome is None:
+            self.event.response_size = self.size
+            self.event.timings['parse'] = time.time() - self._received
+            self._emit(self.event, error)
+
 
+# status codes of the responses carrying a SOAP fault
+_FAULT_STATUS_CODES = frozenset([400, 500])
+
+
+def _fault_subcode(content):
+    """Returns the local name of the subcode of a SOAP fault, if any"""
+    try:
+        fault = ElementTree.fromstring(content)
+    except ElementTree.XMLSyntaxError:
+        return None
+
+    value = fault.find('.//{%(ns)s}Subcode/{%(ns)s}Value' %
+                       {'ns': NS_SOAP_ENV})
+    if value is None or not value.text:
+        return None
+
+    # the value is a qualified name, eg. wsa:ActionNotSupported
+    return value.text.strip().rpartition(':')[2]
+
+
+def _settle_circuit(breaker, error=None):
+    """Records the outcome of a request in the circuit breaker
+
+    :param breaker: the CircuitBreaker object of the endpoint, or None
+    :param error: the exception the request failed with, if any
+    """
+    if breaker is None:
+        return
+
+    if error is None:
+        breaker.record_success()
+    elif isinstance(error, exceptions.WSManInvalidResponse):
+        if error.status_code in retry.RETRYABLE_STATUS_CODES:
+            breaker.record_failure()
+        else:
+            # the endpoint is up, just didn't like the request
+            breaker.record_success()
+    elif isinstance(error, (requests.exceptions.RequestException,
+                            _ReceiveFailure,
+                            exceptions.WSManDeadlineExceeded)):
+        breaker.record_failure()
+    else:
+        breaker.record_cancelled()
+
+
+def _parse_body(body):
+    parser = ElementTree.XMLParser()
+    error = None
+    try:
+        for chunk in body:
+            parser.feed(chunk)
+        return parser.close()
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        body.close(error)
+
+
+_ITEMS_TAGS = frozenset(['{%s}Items' % NS_WSMAN_ENUM,
+                         '{%s}Items' % NS_WSMAN])
+_END_OF_SEQUENCE_TAGS = frozenset(['{%s}EndOfSequence' % NS_WSMAN_ENUM,
+                                   '{%s}EndOfSequence' % NS_WSMAN])
+_ENUM_CONTEXT_TAG = '{%s}EnumerationContext' % NS_WSMAN_ENUM
+
+
+class _StreamedResponse(object):
+    """Enumeration response parsed incrementally as it arrives"""
+
+    def __init__(self, body):
+        """Creates streamed response object
+
+        :param body: a _ResponseBody object of the response
+        """
+        self._body = body
+        self.context = None
+        self.end_of_sequence = False
+
+    def close(self):
+        self._body.close()
+
+    def items(self):
+        """Yields the items as soon as they are parsed
+
+        An item is cleared once the next one is requested.
+        """
+        parser = ElementTree.XMLPullParser(events=('end',))
+        error = None
+        try:
+            for chunk in self._body:
+                parser.feed(chunk)
+                for _, elem in parser.read_events():
+                    parent = elem.getparent()
+                    if parent is not None and parent.tag in _ITEMS_TAGS:
+                        yield elem
+                        elem.clear()
+                        parent.remove(elem)
+                    elif elem.tag == _ENUM_CONTEXT_TAG:
+                        self.context = elem.text
+                    elif elem.tag in _END_OF_SEQUENCE_TAGS:
+                        self.end_of_sequence = True
+
+            parser.close()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._body.close(error)
+
+    def drain(self, items):
+        """Consumes the remaining items of the page
+
+        :param items: the generator returned by items
+        :returns: the enumeration context, or None at the end of the sequence
+                  or if the rest of the page couldn't be received
+        """
+        try:
+            for _ in items:
+                pass
+        except (exceptions.BaseClientException, ElementTree.XMLSyntaxError):
+            return None
+
+        if not self.end_of_sequence:
+            return self.context
+
+
+def _enum_context(resp):
+    context_elem = resp.find('.//{%s}EnumerationContext' % NS_WSMAN_ENUM)
+    if context_elem is not None:
+        return context_elem.text
+
+
+def _enum_items(resp):
+    # optimized enumerations return the items in the wsman namespace, pulls
+    # in the enumeration one
+    items_elem = resp.find('.//{%s}Items' % NS_WSMAN_ENUM)
+    if items_elem is None:
+        items_elem = resp.find('.//{%s}Items' % NS_WSMAN)
+    return items_elem
+
+
+def _end_of_sequence(resp):
+    for namespace in (NS_WSMAN_ENUM, NS_WSMAN):
+        if resp.find('.//{%s}EndOfSequence' % namespace) is not None:
+            return True
+    return False
+
+
+def _merge_enum_items(full_resp_xml, resp_xml):
+    """Merges the items of a pull response into the enumeration response.
+
+    :returns: the document holding the merged items
+    """
+    items_xml = _enum_items(full_resp_xml)
+    if items_xml is None:
         return resp_xml
 
-    def _enum_context(self, resp):
-        context_elem = resp.find('.//{%s}EnumerationContext' % NS_WSMAN_ENUM)
-        if context_elem is not None:
-            return context_elem.text
+    for item in _enum_items(resp_xml):
+        items_xml.append(item)
+    return full_resp_xml
+
+
+def _remove_enum_context(resp_xml):
+    enum_context_elem = resp_xml.find('.//{%s}EnumerationContext'
+                                      % NS_WSMAN_ENUM)
+    if enum_context_elem is not None:
+        enum_context_elem.getparent().remove(enum_context_elem)
+
+
+def _check_return_value(resp, resource_uri, expected_return_value=None):
+    """Checks the return value of an invoke response
+
+    :raises: DRACOperationFailed on error reported back by the DRAC
+             interface
+    :raises: DRACUnexpectedReturnValue on return value mismatch
+    """
+    return_value = utils.find_xml(resp, 'ReturnValue', resource_uri).text
+    if return_value == utils.RET_ERROR:
+        message_elems = utils.find_xml(resp, 'Message', resource_uri, True)
+        messages = [message_elem.text for message_elem in message_elems]
+        raise exceptions.DRACOperationFailed(drac_messages=messages)
+
+    if (expected_return_value is not None and
+            return_value != expected_return_value):
+        raise exceptions.DRACUnexpectedReturnValue(
+            expected_return_value=expected_return_value,
+            actual_return_value=return_value)
+
+
+_TEMPLATE_MARKER = '@@wsmanclient-template-%d@@'
+_TEMPLATE_MARKER_RE = re.compile(b'@@wsmanclient-template-(\\d+)@@')
+
+_payload_templates = {}
+
+
+def _escape_text(value):
+    if value is None:
+        return b''
+    if not isinstance(value, (str, type(u''))):
+        value = str(value)
+
+    # same escaping as lxml applies to text content
+    value = (value.replace('&', '&amp;').replace('<', '&lt;')
+             .replace('>', '&gt;').replace('\r', '&#13;'))
+    return value.encode('ascii', 'xmlcharrefreplace')
+
+
+class _PayloadTemplate(object):
+    """Serialized payload with the variable text values cut out
+
+    Rendering a template only needs the values to be escaped and spliced in,
+    which is a lot cheaper than building and serializing an lxml tree.
+    """
+
+    def __init__(self, payload, names):
+        markers = dict((name, _TEMPLATE_MARKER % index)
+                       for index, name in enumerate(names))
+        request = payload._with_template_values(markers)._build_tree()
+
+        parts = _TEMPLATE_MARKER_RE.split(ElementTree.tostring(request))
+        self._fragments = parts[0::2]
+        self._names = [names[int(index)] for index in parts[1::2]]
+
+    def render(self, values):
+        chunks = [self._fragments[0]]
+        for name, fragment in zip(self._names, self._fragments[1:]):
+            chunks.append(_escape_text(values[name]))
+            chunks.append(fragment)
+
+        return b''.join(chunks)
 
 
 class _Payload(object):
     """Payload generation for WSMan requests."""
 
+    # attributes holding text values which are spliced into the template
+    _template_attrs = ('endpoint', 'message_id')
+    # value of the Action header, identifying the operation
+    action = None
+    # number of the page within an enumeration, if part of one
+    page = None
+    # whether the request can be repeated safely after a failure
+    idempotent = True
+    # number of times the request was sent
+    attempts = 0
+
     def build(self):
+        self.message_id = 'uuid:%s' % uuid.uuid4()
+
+        values = self._get_template_values()
+        key = (self.__class__, tuple(NS_MAP.items()), self.resource_uri,
+               self._get_template_key())
+        template = _payload_templates.get(key)
+        if template is None:
+            if len(_payload_templates) >= PAYLOAD_TEMPLATE_CACHE_SIZE:
+                _payload_templates.clear()
+
+            template = _PayloadTemplate(self, sorted(values, key=repr))
+            _payload_templates[key] = template
+
+        return template.render(values)
+
+    def _build_tree(self):
         request = self._create_envelope()
         self._add_header(request)
         self._add_body(request)
 
-        return ElementTree.tostring(request)
+        return request
+
+    def _get_template_key(self):
+        """Returns the parameters affecting the structure of the payload"""
+        return ()
+
+    def _get_template_values(self):
+        # unset optional values are part of the structure instead
+        return dict((name, getattr(self, name))
+                    for name in self._template_attrs
+                    if getattr(self, name) is not None)
+
+    def _with_template_values(self, values):
+        payload = copy.copy(self)
+        for name in self._template_attrs:
+            if name in values:
+                setattr(payload, name, values[name])
+
+        return payload
 
     def _create_envelope(self):
         return ElementTree.Element('{%s}Envelope' % NS_SOAP_ENV, nsmap=NS_MAP)
@@ -220,7 +1192,7 @@ class _Payload(object):
         msg_id_elem = ElementTree.SubElement(header,
                                              '{%s}MessageID' % NS_WS_ADDR)
         msg_id_elem.set(qn_must_understand, 'true')
-        msg_id_elem.text = 'uuid:%s' % uuid.uuid4()
+        msg_id_elem.text = self.message_id
 
         reply_to_elem = ElementTree.SubElement(header,
                                                '{%s}ReplyTo' % NS_WS_ADDR)
@@ -237,6 +1209,10 @@ class _Payload(object):
 class _EnumeratePayload(_Payload):
     """Payload generation for WSMan enumerate operation."""
 
+    action = NS_WSMAN_ENUM + '/Enumerate'
+
+    _template_attrs = _Payload._template_attrs + ('max_elems', 'filter_query')
+
     def __init__(self, endpoint, resource_uri, optimization=True,
                  max_elems=100, filter_query=None, filter_dialect=None):
         self.endpoint = endpoint
@@ -254,14 +1230,20 @@ class _EnumeratePayload(_Payload):
                 raise exceptions.WSManInvalidFilterDialect(
                     invalid_filter=filter_dialect, supported=valid_opts)
 
+            if isinstance(filter_query, query.Query):
+                filter_query = filter_query.render()
             self.filter_query = filter_query
 
+    def _get_template_key(self):
+        return (self.optimization, self.filter_query is not None,
+                self.filter_dialect)
+
     def _add_header(self, envelope):
         header = super(_EnumeratePayload, self)._add_header(envelope)
 
         action_elem = ElementTree.SubElement(header, '{%s}Action' % NS_WS_ADDR)
         action_elem.set('{%s}mustUnderstand' % NS_SOAP_ENV, 'true')
-        action_elem.text = NS_WSMAN_ENUM + '/Enumerate'
+        action_elem.text = self.action
 
         return header
 
@@ -298,6 +1280,10 @@ class _EnumeratePayload(_Payload):
 class _PullPayload(_Payload):
     """Payload generation for WSMan pull operation."""
 
+    action = NS_WSMAN_ENUM + '/Pull'
+
+    _template_attrs = _Payload._template_attrs + ('context', 'max_elems')
+
     def __init__(self, endpoint, resource_uri, context, max_elems=100):
         self.endpoint = endpoint
         self.resource_uri = resource_uri
@@ -309,7 +1295,7 @@ class _PullPayload(_Payload):
 
         action_elem = ElementTree.SubElement(header, '{%s}Action' % NS_WS_ADDR)
         action_elem.set('{%s}mustUnderstand' % NS_SOAP_ENV, 'true')
-        action_elem.text = NS_WSMAN_ENUM + '/Pull'
+        action_elem.text = self.action
 
         return header
 
@@ -334,36 +1320,79 @@ class _PullPayload(_Payload):
         max_elem_elem.text = str(self.max_elems)
 
 
-class _InvokePayload(_Payload):
-    """Payload generation for WSMan invoke operation."""
+class _ReleasePayload(_Payload):
+    """Payload generation for WSMan release operation."""
 
-    def __init__(self, endpoint, resource_uri, method, selectors=None,
-                 properties=None):
+    action = NS_WSMAN_ENUM + '/Release'
+
+    _template_attrs = _Payload._template_attrs + ('context',)
+
+    def __init__(self, endpoint, resource_uri, context):
         self.endpoint = endpoint
         self.resource_uri = resource_uri
-        self.method = method
-        self.selectors = selectors
-        self.properties = properties
+        self.context = context
 
     def _add_header(self, envelope):
-        header = super(_InvokePayload, self)._add_header(envelope)
+        header = super(_ReleasePayload, self)._add_header(envelope)
 
         action_elem = ElementTree.SubElement(header, '{%s}Action' % NS_WS_ADDR)
         action_elem.set('{%s}mustUnderstand' % NS_SOAP_ENV, 'true')
-        action_elem.text = ('%(resource_uri)s/%(method)s' %
-                            {'resource_uri': self.resource_uri,
-                             'method': self.method})
-
-        self._add_selectors(header)
+        action_elem.text = self.action
 
         return header
 
     def _add_body(self, envelope):
-        body = super(_InvokePayload, self)._add_body(envelope)
-        self._add_properties(body)
+        body = super(_ReleasePayload, self)._add_body(envelope)
+
+        release_elem = ElementTree.SubElement(body,
+                                              '{%s}Release' % NS_WSMAN_ENUM,
+                                              nsmap={'wsen': NS_WSMAN_ENUM})
+
+        enum_context_elem = ElementTree.SubElement(
+            release_elem, '{%s}EnumerationContext' % NS_WSMAN_ENUM)
+        enum_context_elem.text = self.context
 
         return body
 
+
+class _SelectorsPayload(_Payload):
+    """Payload generation for WSMan operations on a single instance."""
+
+    def __init__(self, endpoint, resource_uri, selectors=None):
+        self.endpoint = endpoint
+        self.resource_uri = resource_uri
+        self.selectors = selectors
+
+    def _get_template_key(self):
+        return (tuple(self.selectors),)
+
+    def _get_template_values(self):
+        values = super(_SelectorsPayload, self)._get_template_values()
+
+        for (name, value) in self.selectors.items():
+            values[('selector', name)] = value
+
+        return values
+
+    def _with_template_values(self, values):
+        payload = super(_SelectorsPayload, self)._with_template_values(values)
+
+        payload.selectors = collections.OrderedDict(
+            (name, values[('selector', name)]) for name in self.selectors)
+
+        return payload
+
+    def _add_header(self, envelope):
+        header = super(_SelectorsPayload, self)._add_header(envelope)
+
+        action_elem = ElementTree.SubElement(header, '{%s}Action' % NS_WS_ADDR)
+        action_elem.set('{%s}mustUnderstand' % NS_SOAP_ENV, 'true')
+        action_elem.text = self.action
+
+        self._add_selectors(header)
+
+        return header
+
     def _add_selectors(self, header):
         selector_set_elem = ElementTree.SubElement(
             header, '{%s}SelectorSet' % NS_WSMAN)
@@ -374,6 +1403,119 @@ class _InvokePayload(_Payload):
             selector_elem.set('Name', name)
             selector_elem.text = value
 
+
+class _GetPayload(_SelectorsPayload):
+    """Payload generation for WSMan get operation."""
+
+    action = NS_WS_TRANSFER + '/Get'
+
+
+class _GetFragmentPayload(_GetPayload):
+    """Payload generation for WSMan get operation on a fragment."""
+
+    def __init__(self, endpoint, resource_uri, selectors, fragment):
+        super(_GetFragmentPayload, self).__init__(endpoint, resource_uri,
+                                                  selectors)
+        self.fragment = fragment
+
+    def _get_template_key(self):
+        return super(_GetFragmentPayload, self)._get_template_key() + (
+            self.fragment,)
+
+    def _add_header(self, envelope):
+        header = super(_GetFragmentPayload, self)._add_header(envelope)
+
+        fragment_elem = ElementTree.SubElement(
+            header, '{%s}FragmentTransfer' % NS_WSMAN)
+        fragment_elem.set('{%s}mustUnderstand' % NS_SOAP_ENV, 'true')
+        fragment_elem.set('Dialect', FRAGMENT_DIALECT_XPATH)
+        fragment_elem.text = self.fragment
+
+        return header
+
+
+class _PutFragmentPayload(_GetFragmentPayload):
+    """Payload generation for WSMan put operation on a fragment."""
+
+    action = NS_WS_TRANSFER + '/Put'
+
+    _template_attrs = _GetFragmentPayload._template_attrs + ('value',)
+
+    def __init__(self, endpoint, resource_uri, selectors, fragment, value):
+        super(_PutFragmentPayload, self).__init__(endpoint, resource_uri,
+                                                  selectors, fragment)
+        self.value = value
+
+    def _add_body(self, envelope):
+        body = super(_PutFragmentPayload, self)._add_body(envelope)
+
+        fragment_elem = ElementTree.SubElement(body,
+                                               '{%s}XmlFragment' % NS_WSMAN)
+        property_elem = ElementTree.SubElement(
+            fragment_elem, '{%s}%s' % (self.resource_uri, self.fragment))
+        property_elem.text = self.value
+
+        return body
+
+
+class _InvokePayload(_SelectorsPayload):
+    """Payload generation for WSMan invoke operation."""
+
+    idempotent = False
+
+    def __init__(self, endpoint, resource_uri, method, selectors=None,
+                 properties=None):
+        super(_InvokePayload, self).__init__(endpoint, resource_uri,
+                                             selectors)
+        self.method = method
+        self.properties = properties
+
+    @property
+    def action(self):
+        return '%(resource_uri)s/%(method)s' % {
+            'resource_uri': self.resource_uri, 'method': self.method}
+
+    def _get_template_key(self):
+        # lists are told apart from single values, even when empty
+        properties = tuple(
+            (name, ('list', len(value)) if isinstance(value, list)
+             else 'scalar')
+            for (name, value) in self.properties.items())
+        return (self.method, tuple(self.selectors), properties)
+
+    def _get_template_values(self):
+        values = super(_InvokePayload, self)._get_template_values()
+
+        for (name, value) in self.properties.items():
+            if not isinstance(value, list):
+                values[('property', name)] = value
+                continue
+
+            for (index, item) in enumerate(value):
+                values[('property', name, index)] = item
+
+        return values
+
+    def _with_template_values(self, values):
+        payload = super(_InvokePayload, self)._with_template_values(values)
+
+        payload.properties = collections.OrderedDict()
+        for (name, value) in self.properties.items():
+            if isinstance(value, list):
+                payload.properties[name] = [
+                    values[('property', name, index)]
+                    for index in range(len(value))]
+            else:
+                payload.properties[name] = values[('property', name)]
+
+        return payload
+
+    def _add_body(self, envelope):
+        body = super(_InvokePayload, self)._add_body(envelope)
+        self._add_properties(body)
+
+        return body
+
     def _add_properties(self, body):
         method_elem = ElementTree.SubElement(
             body,
@@ -398,7 +1540,7 @@ class WSManClient(Client):
     """Wrapper for Client with return value checking"""
 
     def invoke(self, resource_uri, method, selectors=None, properties=None,
-               expected_return_value=None):
+               expected_return_value=None, timeout=None):
         """Invokes a remote WS-Man method
 
         :param resource_uri: URI of the resource
@@ -409,8 +1551,10 @@ class WSManClient(Client):
             the DRAC card. For return value codes check the profile
             documentation of the resource used in the method call. If not set,
             return value checking is skipped.
+        :param timeout: number of seconds the operation may take
         :returns: an lxml.etree.Element object of the response received
         :raises: WSManRequestFailure on request failures
+        :raises: WSManDeadlineExceeded when running out of time
         :raises: WSManInvalidResponse when receiving invalid response
         :raises: DRACOperationFailed on error reported back by the DRAC
                  interface
@@ -423,18 +1567,7 @@ class WSManClient(Client):
             properties = {}
 
         resp = super(WSManClient, self).invoke(resource_uri, method, selectors,
-                                               properties)
-
-        return_value = utils.find_xml(resp, 'ReturnValue', resource_uri).text
-        if return_value == utils.RET_ERROR:
-            message_elems = utils.find_xml(resp, 'Message', resource_uri, True)
-            messages = [message_elem.text for message_elem in message_elems]
-            raise exceptions.DRACOperationFailed(drac_messages=messages)
-
-        if (expected_return_value is not None and
-                return_value != expected_return_value):
-            raise exceptions.DRACUnexpectedReturnValue(
-                expected_return_value=expected_return_value,
-                actual_return_value=return_value)
+                                               properties, timeout)
+        _check_return_value(resp, resource_uri, expected_return_value)
 
         return resp